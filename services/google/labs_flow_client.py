@@ -585,6 +585,8 @@ class LabsFlowClient:
         if not self.tokens: raise ValueError("No Labs tokens provided")
         self._idx=0; self.timeout=timeout; self.on_event=on_event
         self._invalid_tokens=set()  # Track tokens that returned 401
+        # Persistent session: keep-alive reuses the TCP/TLS connection across status polls
+        self._session=requests.Session()
 
     def _tok(self)->str:
         """Get next token using round-robin rotation for load balancing"""
@@ -639,11 +641,11 @@ class LabsFlowClient:
                     # Content-Type is text/plain → stringify payload
                     # This matches Google Labs Flow API requirements
                     data_to_send = json.dumps(payload, ensure_ascii=False)
-                    r = requests.post(url, headers=headers, data=data_to_send, timeout=self.timeout)
+                    r = self._session.post(url, headers=headers, data=data_to_send, timeout=self.timeout)
                 else:
                     # Content-Type is application/json → use json= parameter
                     # (backward compatibility)
-                    r = requests.post(url, headers=headers, json=payload, timeout=self.timeout)
+                    r = self._session.post(url, headers=headers, json=payload, timeout=self.timeout)
 
                 if r.status_code==200:
                     self._emit("http_ok", code=200)
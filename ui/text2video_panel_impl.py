@@ -1,11 +1,16 @@
 
+import asyncio
 import json
 import os
+import queue
 import re
 import shutil
 import subprocess
 import datetime
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from xml.sax.saxutils import escape as xml_escape
 
 from PyQt5.QtCore import QObject, pyqtSignal
@@ -15,6 +20,8 @@ from services.utils.video_downloader import VideoDownloader
 from services.account_manager import get_account_manager
 from utils import config as cfg
 from utils.filename_sanitizer import sanitize_project_name, sanitize_filename
+from utils.json_utils import json_dumpb
+from utils.performance import TokenBucket
 
 # Backward compatibility
 LabsClient = LabsFlowClient
@@ -171,6 +178,74 @@ STYLE_TAG_MAP = {
     }
 }
 
+# Hardware H.264 encoders tried for 4K upscale, in order of preference
+# VAAPI is not listed: it needs a device handle and a hwupload filter chain
+_HW_H264_ENCODERS = ("h264_nvenc", "h264_qsv")
+
+# Consumer NVIDIA drivers cap concurrent NVENC sessions (3 on older drivers)
+_NVENC_MAX_SESSIONS = 3
+
+# Long side to 3840: a portrait source stays under the 4096 px frame limit of
+# h264_nvenc/h264_qsv (scale=3840:-2 would make a 9:16 video 3840x6827)
+_UPSCALE_4K_SCALE = "scale='if(gt(iw,ih),3840,-2)':'if(gt(iw,ih),-2,3840)'"
+
+# Audio is already AAC in the downloaded MP4s: both upscale paths copy it as is
+_UPSCALE_AUDIO_ARGS = ["-c:a", "copy"]
+
+
+@lru_cache(maxsize=1)
+def _detect_h264_encoder():
+    """
+    Pick the fastest working H.264 encoder in the local ffmpeg build.
+
+    An encoder listed by `ffmpeg -encoders` may still be unusable (e.g. NVENC
+    compiled in but no NVIDIA GPU, or a build without the p1-p7 presets), so each
+    candidate is verified with a tiny test encode using the exact arguments of
+    _h264_codec_args(). Cached for the lifetime of the process.
+    """
+    try:
+        probe = subprocess.run(
+            ["ffmpeg", "-hide_banner", "-encoders"],
+            capture_output=True, timeout=10
+        ).stdout.decode("utf-8", "replace")
+    except Exception:
+        return "libx264"
+
+    for encoder in _HW_H264_ENCODERS:
+        if encoder not in probe:
+            continue
+        test_cmd = (["ffmpeg", "-hide_banner", "-loglevel", "error", "-f", "lavfi",
+                     "-i", "color=black:s=256x256:d=0.1", "-frames:v", "1"]
+                    + _h264_codec_args(encoder) + ["-f", "null", "-"])
+        try:
+            if subprocess.run(test_cmd, capture_output=True, timeout=15).returncode == 0:
+                return encoder
+        except Exception:
+            continue
+    return "libx264"
+
+
+def _h264_codec_args(encoder):
+    """ffmpeg video codec arguments for `encoder`"""
+    if encoder == "h264_nvenc":
+        return ["-c:v", encoder, "-preset", "p4", "-tune", "hq"]
+    return ["-c:v", encoder, "-preset", "fast"]
+
+
+def _h264_encoder_args(hw_encode=True):
+    """ffmpeg video codec arguments for 4K upscale (hardware encoder when available)"""
+    return _h264_codec_args(_detect_h264_encoder() if hw_encode else "libx264")
+
+
+def _dig(d, *keys):
+    """Walk nested dicts by key path; returns None as soon as a level is missing"""
+    for k in keys:
+        if not isinstance(d, dict):
+            return None
+        d = d.get(k)
+    return d
+
+
 def get_model_key_from_display(display_name):
     """Convert display name back to API key"""
     for key, display in _MODEL_DISPLAY_NAMES.items():
@@ -993,6 +1068,15 @@ class _Worker(QObject):
         self.payload = payload
         self.should_stop = False  # PR#4: Add stop flag
         self.video_downloader = VideoDownloader(log_callback=lambda msg: self.log.emit(msg))
+        # Thumbnail extraction (ffmpeg) runs off the polling thread
+        self._thumb_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="Text2Video-thumb")
+        # Downloads run alongside polling instead of stalling it
+        self._dl_executor = ThreadPoolExecutor(max_workers=MAX_PARALLEL_DOWNLOADS, thread_name_prefix="Text2Video-dl")
+
+    def _log(self, fmt, *args):
+        """Emit a %-style log line, formatting it only if something listens to `log`"""
+        if self.receivers(self.log) > 0:
+            self.log.emit(fmt % args if args else fmt)
 
     def _handle_labs_event(self, event, log_func):
         """
@@ -1063,6 +1147,9 @@ class _Worker(QObject):
             self.log.emit(f"[ERR] Worker error: {e}")
             self.log.emit(f"[DEBUG] {error_details}")
         finally:
+            # Let pending downloads/thumbnails land before the UI treats the run as finished
+            self._dl_executor.shutdown(wait=True)
+            self._thumb_executor.shutdown(wait=True)
             # BUG FIX: Emit finished signal for both script and video tasks
             # This ensures UI buttons are re-enabled and thread is cleaned up
             self.job_finished.emit()
@@ -1146,20 +1233,20 @@ class _Worker(QObject):
                 f.write(safe_str(data.get("screenplay_tgt","")))
             with open(os.path.join(dir_script, "outline_vi.txt"), "w", encoding="utf-8") as f:
                 f.write(safe_str(data.get("outline_vi","")))
-            with open(os.path.join(dir_script, "character_bible.json"), "w", encoding="utf-8") as f:
-                json.dump(data.get("character_bible",[]), f, ensure_ascii=False, indent=2)
+            with open(os.path.join(dir_script, "character_bible.json"), "wb") as f:
+                f.write(json_dumpb(data.get("character_bible",[]), indent=True))
             # Save voice config and domain/topic if present
             if data.get("voice_config"):
-                with open(os.path.join(dir_script, "voice_config.json"), "w", encoding="utf-8") as f:
-                    json.dump(data["voice_config"], f, ensure_ascii=False, indent=2)
+                with open(os.path.join(dir_script, "voice_config.json"), "wb") as f:
+                    f.write(json_dumpb(data["voice_config"], indent=True))
             if p.get("domain") and p.get("topic"):
                 domain_info = {
                     "domain": p["domain"],
                     "topic": p["topic"],
                     "language": p["out_lang_code"]
                 }
-                with open(os.path.join(dir_script, "domain_topic.json"), "w", encoding="utf-8") as f:
-                    json.dump(domain_info, f, ensure_ascii=False, indent=2)
+                with open(os.path.join(dir_script, "domain_topic.json"), "wb") as f:
+                    f.write(json_dumpb(domain_info, indent=True))
             
             # Issue #3: Export scene dialogues to SRT file
             scenes = data.get("scenes", [])
@@ -1222,6 +1309,128 @@ class _Worker(QObject):
             self.log.emit(f"[WARN] Tạo thumbnail lỗi: {e}")
         return ""
 
+    def _submit_thumb(self, card, video_path, out_dir, scene, copy):
+        """Create the thumbnail in the background and re-emit the card once it exists"""
+        def _on_thumb_done(future):
+            thumb = future.result()
+            if thumb:
+                card["thumb"] = thumb
+                # A snapshot: the worker thread may still be updating the card
+                self.job_card.emit(dict(card))
+
+        self._thumb_executor.submit(self._make_thumb, video_path, out_dir, scene, copy).add_done_callback(_on_thumb_done)
+
+    def _upscale_4k(self, completed_jobs):
+        """
+        Upscale downloaded videos to 4K.
+
+        Videos are upscaled in chunks of at most `limit`, one ffmpeg process per
+        chunk, so encoder start-up is paid once per chunk while the number of
+        encoders running at the same time stays bounded. Videos of a chunk that
+        fails each get their own ffmpeg process, driven from a single asyncio
+        event loop; the OS schedules the encoders concurrently and a semaphore
+        caps how many run at once; a hardware encode that fails there is retried
+        with libx264.
+
+        Args:
+            completed_jobs: Job infos whose card has a downloaded "path"
+        """
+        cards = [job_info['card'] for job_info in completed_jobs if job_info['card'].get("path")]
+        if not cards:
+            return
+
+        self.log.emit(f"[INFO] Starting 4K upscale for {len(cards)} videos...")
+        encoder_args = _h264_encoder_args(self.payload.get("hw_encode", True))
+        if encoder_args[1] != "libx264":
+            self.log.emit(f"[4K] Using hardware encoder: {encoder_args[1]}")
+
+        limit = max(1, (os.cpu_count() or 2) // 2)
+        if encoder_args[1] == "h264_nvenc":
+            limit = min(limit, _NVENC_MAX_SESSIONS)
+
+        pending = []  # Cards of failed chunks, upscaled one process each
+        for start in range(0, len(cards), limit):
+            chunk = cards[start:start + limit]
+            if len(chunk) == 1 or not self._upscale_4k_batch(chunk, encoder_args):
+                pending.extend(chunk)
+        if not pending:
+            return
+
+        async def _encode(src, dst, video_args):
+            cmd = (["ffmpeg", "-y", "-i", src, "-vf", _UPSCALE_4K_SCALE]
+                   + video_args + _UPSCALE_AUDIO_ARGS + [dst])
+            proc = await asyncio.create_subprocess_exec(
+                *cmd, stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE
+            )
+            # communicate() drains stderr so a chatty ffmpeg cannot block on a full pipe
+            _, stderr = await proc.communicate()
+            return proc.returncode, stderr
+
+        async def _run_one(card, semaphore):
+            src = card["path"]
+            dst = src.replace(".mp4", "_4k.mp4")
+            async with semaphore:
+                self.log.emit(f"[4K] Upscaling scene {card['scene']} copy {card['copy']}...")
+                try:
+                    returncode, stderr = await _encode(src, dst, encoder_args)
+                    if returncode != 0 and encoder_args[1] != "libx264":
+                        self.log.emit(f"[WARN] {encoder_args[1]} failed for scene {card['scene']} "
+                                      f"copy {card['copy']}, retrying with libx264")
+                        returncode, stderr = await _encode(src, dst, _h264_encoder_args(False))
+                except Exception as e:
+                    self.log.emit(f"[ERR] 4K upscale failed for scene {card['scene']} copy {card['copy']}: {e}")
+                    return
+            if returncode == 0:
+                card["path"] = dst
+                card["status"] = "UPSCALED_4K"
+                self.job_card.emit(card)
+                self.log.emit(f"[4K] ✓ Scene {card['scene']} copy {card['copy']}: Upscaled to 4K")
+            else:
+                detail = stderr.decode("utf-8", "replace").strip().splitlines()[-1:] or [f"exit code {returncode}"]
+                self.log.emit(f"[ERR] 4K upscale failed for scene {card['scene']} copy {card['copy']}: {detail[0]}")
+
+        async def _gather_bounded():
+            semaphore = asyncio.Semaphore(limit)
+            await asyncio.gather(*(_run_one(card, semaphore) for card in pending))
+
+        asyncio.run(_gather_bounded())
+
+    def _upscale_4k_batch(self, cards, encoder_args):
+        """
+        Upscale a chunk of videos with a single ffmpeg invocation (one filter graph, N outputs).
+
+        Args:
+            cards: Job cards with a downloaded "path"
+            encoder_args: Video codec arguments from _h264_encoder_args()
+
+        Returns:
+            True if every output was written, False if the caller should fall back
+            to one process per video
+        """
+        inputs, filter_parts, outputs, dsts = [], [], [], []
+        for idx, card in enumerate(cards):
+            dst = card["path"].replace(".mp4", "_4k.mp4")
+            inputs += ["-i", card["path"]]
+            filter_parts.append(f"[{idx}:v]{_UPSCALE_4K_SCALE}[o{idx}]")
+            outputs += (["-map", f"[o{idx}]", "-map", f"{idx}:a?"]
+                        + encoder_args + _UPSCALE_AUDIO_ARGS + [dst])
+            dsts.append(dst)
+        cmd = ["ffmpeg", "-y"] + inputs + ["-filter_complex", ";".join(filter_parts)] + outputs
+
+        self.log.emit(f"[4K] Upscaling {len(cards)} videos in one ffmpeg pass...")
+        try:
+            subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        except Exception as e:
+            self.log.emit(f"[WARN] Batch 4K upscale failed ({e}), falling back to per-video upscale")
+            return False
+
+        for card, dst in zip(cards, dsts):
+            card["path"] = dst
+            card["status"] = "UPSCALED_4K"
+            self.job_card.emit(card)
+            self.log.emit(f"[4K] ✓ Scene {card['scene']} copy {card['copy']}: Upscaled to 4K")
+        return True
+
     def _run_video(self):
         p = self.payload
         st = cfg.load()
@@ -1326,11 +1535,16 @@ class _Worker(QObject):
                 break
 
             # Extract all operation names from all jobs
+            # Copies of a scene share one body, so de-duplicate its operation names
+            seen = set()
             names = []
             metadata = {}
             for job_info in jobs:
                 job_dict = job_info['body']
-                names.extend(job_dict.get("operation_names", []))
+                for n in job_dict.get("operation_names", []):
+                    if n not in seen:
+                        seen.add(n)
+                        names.append(n)
                 # Collect metadata for batch check
                 op_meta = job_dict.get("operation_metadata", {})
                 if op_meta:
@@ -1341,7 +1555,6 @@ class _Worker(QObject):
                 rs = client.batch_check_operations(names, metadata)
             except Exception as e:
                 self.log.emit(f"[WARN] Lỗi kiểm tra trạng thái (vòng {poll_round + 1}): {e}")
-                import time
                 time.sleep(10)  # Wait longer on error before retry
                 continue
 
@@ -1393,15 +1606,13 @@ class _Worker(QObject):
 
                 if status == 'MEDIA_GENERATION_STATUS_SUCCESSFUL':
                     # Extract video URL from correct path
-                    op_metadata = raw_response.get('operation', {}).get('metadata', {})
-                    video_info = op_metadata.get('video', {})
-                    video_url = video_info.get('fifeUrl', '')
+                    video_url = _dig(raw_response, 'operation', 'metadata', 'video', 'fifeUrl') or ''
 
                     if video_url:
                         card["status"] = "READY"
                         card["url"] = video_url
 
-                        self.log.emit(f"[SUCCESS] Scene {scene} Copy {copy_num}: Video ready!")
+                        self._log("[SUCCESS] Scene %s Copy %s: Video ready!", scene, copy_num)
 
                         # Download logic - Always download videos
                         # Sanitize filename to handle Vietnamese characters and special characters
@@ -1418,9 +1629,7 @@ class _Worker(QObject):
                             if self._download(video_url, fp, bearer_token=bearer_token):
                                 card["status"] = "DOWNLOADED"
                                 card["path"] = fp
-
-                                thumb = self._make_thumb(fp, thumbs_dir, scene, copy_num)
-                                card["thumb"] = thumb
+                                self._submit_thumb(card, fp, thumbs_dir, scene, copy_num)
 
                                 self.log.emit(f"[SUCCESS] ✓ Downloaded: {os.path.basename(fp)}")
                                 # Add to completed jobs for 4K upscale
@@ -1472,8 +1681,7 @@ class _Worker(QObject):
 
                 elif status == 'MEDIA_GENERATION_STATUS_FAILED':
                     # Try to extract error details from API response
-                    error_info = raw_response.get('operation', {}).get('error', {})
-                    error_message = error_info.get('message', '')
+                    error_message = _dig(raw_response, 'operation', 'error', 'message') or ''
 
                     # Categorize the error
                     if 'quota' in error_message.lower() or 'limit' in error_message.lower():
@@ -1489,26 +1697,26 @@ class _Worker(QObject):
 
                     card["status"] = "FAILED"
                     card["error_reason"] = error_reason
-                    self.log.emit(f"[ERR] Scene {scene} Copy {copy_num} FAILED: {error_reason}")
+                    self._log("[ERR] Scene %s Copy %s FAILED: %s", scene, copy_num, error_reason)
                     self.job_card.emit(card)
 
                 else:
                     # Still processing (PENDING, ACTIVE, or other states)
-                    card["status"] = "PROCESSING"
-                    self.job_card.emit(card)
+                    # Only notify the UI when the status actually changes
+                    if card.get("status") != "PROCESSING":
+                        card["status"] = "PROCESSING"
+                        self.job_card.emit(card)
                     new_jobs.append(job_info)
 
             jobs=new_jobs
 
             if jobs:
-                poll_info = f"vòng {poll_round + 1}/120"
                 # Warn if approaching timeout
                 if poll_round >= 100:
-                    self.log.emit(f"[WARN] Đang chờ {len(jobs)} video ({poll_info}) - sắp hết thời gian chờ!")
+                    self._log("[WARN] Đang chờ %d video (vòng %d/120) - sắp hết thời gian chờ!", len(jobs), poll_round + 1)
                 else:
-                    self.log.emit(f"[INFO] Đang chờ {len(jobs)} video ({poll_info})...")
+                    self._log("[INFO] Đang chờ %d video (vòng %d/120)...", len(jobs), poll_round + 1)
                 try:
-                    import time
                     time.sleep(5)
                 except Exception:
                     pass
@@ -1530,31 +1738,13 @@ class _Worker(QObject):
             if not has_ffmpeg:
                 self.log.emit("[WARN] Không tìm thấy ffmpeg trong PATH — bỏ qua upscale 4K.")
             else:
-                self.log.emit(f"[INFO] Starting 4K upscale for {len(completed_jobs)} videos...")
-                for job_info in completed_jobs:
-                    card = job_info['card']
-                    if card.get("path"):
-                        src=card["path"]
-                        dst=src.replace(".mp4","_4k.mp4")
-                        self.log.emit(f"[4K] Upscaling scene {card['scene']} copy {card['copy']}...")
-                        cmd=["ffmpeg","-y","-i",src,"-vf","scale=3840:-2","-c:v","libx264","-preset","fast",dst]
-                        try:
-                            subprocess.run(cmd, check=True)
-                            card["path"]=dst
-                            card["status"]="UPSCALED_4K"
-                            self.job_card.emit(card)
-                            self.log.emit(f"[4K] ✓ Scene {card['scene']} copy {card['copy']}: Upscaled to 4K")
-                        except Exception as e:
-                            self.log.emit(f"[ERR] 4K upscale fail for scene {card['scene']} copy {card['copy']}: {e}")
+                self._upscale_4k(completed_jobs)
 
     def _run_video_parallel(self, p, account_mgr):
         """
         Parallel video generation using multiple accounts
         Distributes scenes across accounts using round-robin for faster processing
         """
-        import threading
-        from queue import Queue
-
         st = cfg.load()
         copies = p["copies"]
         title = p["title"]
@@ -1567,6 +1757,9 @@ class _Worker(QObject):
         accounts = account_mgr.get_enabled_accounts()
         num_accounts = len(accounts)
 
+        # Per-account rate limit: threads only block when their own account bursts past it
+        self._account_buckets = {account.name: TokenBucket(rate=2, capacity=4) for account in accounts}
+
         self.log.emit(f"[INFO] 🚀 Parallel mode: {num_accounts} accounts, {len(p['scenes'])} scenes")
 
         # Distribute scenes across accounts using round-robin
@@ -1576,7 +1769,7 @@ class _Worker(QObject):
             batches[account_idx].append((scene_idx, scene))
 
         # Results queue for thread-safe communication
-        results_queue = Queue()
+        results_queue = queue.Queue()
         all_jobs = []  # Jobs storage protected by jobs_lock for thread-safety
         jobs_lock = threading.Lock()
 
@@ -1607,7 +1800,6 @@ class _Worker(QObject):
 
             try:
                 # Wait for results from any thread
-                import queue
                 msg_type, data = results_queue.get(timeout=1.0)
 
                 if msg_type == "scene_started":
@@ -1709,6 +1901,8 @@ class _Worker(QObject):
                     
                     results_queue.put(("log", f"{thread_name}: Starting scene {actual_scene_num} ({copies} copies)"))
 
+                    # Respect this account's API rate limit
+                    self._account_buckets[account.name].acquire()
                     rc = client.start_one(body, model_key, ratio, scene["prompt"], copies=copies, project_id=account.project_id)
 
                     if rc > 0:
@@ -1717,19 +1911,19 @@ class _Worker(QObject):
                         if actual_count < copies:
                             results_queue.put(("log", f"{thread_name}: Scene {actual_scene_num} returned {actual_count}/{copies} operations"))
 
-                        # Create job cards
+                        # Create job cards (each copy gets its own dict built from one template)
+                        card_template = {
+                            "scene": actual_scene_num,
+                            "status": "PROCESSING",
+                            "json": scene["prompt"],
+                            "url": "",
+                            "path": "",
+                            "thumb": "",
+                            "dir": dir_videos
+                        }
                         job_infos = []
                         for copy_idx in range(1, actual_count + 1):
-                            card = {
-                                "scene": actual_scene_num,
-                                "copy": copy_idx,
-                                "status": "PROCESSING",
-                                "json": scene["prompt"],
-                                "url": "",
-                                "path": "",
-                                "thumb": "",
-                                "dir": dir_videos
-                            }
+                            card = {**card_template, "copy": copy_idx}
                             results_queue.put(("card", card))
 
                             job_info = {
@@ -1756,47 +1950,41 @@ class _Worker(QObject):
                             "Failed to start video generation (API returned 0 operations). "
                             "Check: account credentials, API quota, and content policy compliance."
                         )
+                        card_template = {
+                            "scene": actual_scene_num,
+                            "status": "FAILED_START",
+                            "error_reason": error_reason,
+                            "json": scene["prompt"],
+                            "url": "",
+                            "path": "",
+                            "thumb": "",
+                            "dir": dir_videos
+                        }
                         for copy_idx in range(1, copies + 1):
-                            card = {
-                                "scene": actual_scene_num,
-                                "copy": copy_idx,
-                                "status": "FAILED_START",
-                                "error_reason": error_reason,
-                                "json": scene["prompt"],
-                                "url": "",
-                                "path": "",
-                                "thumb": "",
-                                "dir": dir_videos
-                            }
-                            results_queue.put(("card", card))
+                            results_queue.put(("card", {**card_template, "copy": copy_idx}))
 
                         results_queue.put(("scene_started", (actual_scene_num, [])))
                         results_queue.put(
                             ("log", f"{thread_name}: Scene {actual_scene_num} failed to start - {error_reason}")
                         )
 
-                    # Small delay between scenes to respect API rate limits
-                    # TODO: Make this configurable per account rate limits
-                    time.sleep(0.5)
-
                 except Exception as e:
                     # Exception during scene start - create failure cards
                     error_msg = f"Exception during start: {str(e)[:_MAX_ERROR_MESSAGE_LENGTH]}"
                     results_queue.put(("log", f"{thread_name}: Error on scene {actual_scene_num}: {e}"))
 
+                    card_template = {
+                        "scene": actual_scene_num,
+                        "status": "FAILED_START",
+                        "error_reason": error_msg,
+                        "json": scene.get("prompt", ""),
+                        "url": "",
+                        "path": "",
+                        "thumb": "",
+                        "dir": dir_videos
+                    }
                     for copy_idx in range(1, copies + 1):
-                        card = {
-                            "scene": actual_scene_num,
-                            "copy": copy_idx,
-                            "status": "FAILED_START",
-                            "error_reason": error_msg,
-                            "json": scene.get("prompt", ""),
-                            "url": "",
-                            "path": "",
-                            "thumb": "",
-                            "dir": dir_videos
-                        }
-                        results_queue.put(("card", card))
+                        results_queue.put(("card", {**card_template, "copy": copy_idx}))
 
                     results_queue.put(("scene_started", (actual_scene_num, [])))
 
@@ -1821,184 +2009,199 @@ class _Worker(QObject):
 
         retry_count = {}
         download_retry_count = {}
-        completed_jobs = []  # Track successfully downloaded jobs for 4K upscale
         max_retries = 3
         max_download_retries = 5
         
-        # OPTIMIZATION: Queue for parallel downloads
-        ready_to_download = []  # Videos ready for download (not yet started)
+        # OPTIMIZATION: Downloads start as soon as a video is ready and run while polling continues
+        download_futures = []
+
+        # OPTIMIZATION: Clients (accounts) are independent, so their status checks run
+        # concurrently and a round takes max(per-client latency) instead of the sum
+        poll_concurrency = self.payload.get("poll_concurrency") or len(client_jobs)
+        poll_executor = ThreadPoolExecutor(
+            max_workers=max(1, poll_concurrency), thread_name_prefix="Text2Video-poll"
+        )
 
-        for poll_round in range(120):
-            if self.should_stop:
-                self.log.emit("[INFO] Polling stopped by user")
-                break
+        # The poll threads are released even if a round raises
+        try:
+            for poll_round in range(120):
+                if self.should_stop:
+                    self.log.emit("[INFO] Polling stopped by user")
+                    break
 
-            if not jobs:
-                self.log.emit("[INFO] All videos completed or failed")
-                break
+                if not jobs:
+                    self.log.emit("[INFO] All videos completed or failed")
+                    break
 
-            # Poll each client's jobs
-            for client, client_job_list in list(client_jobs.items()):
-                if not client_job_list:
-                    continue
+                # Start one batch check per client
+                poll_futures = {}
+                for client, client_job_list in client_jobs.items():
+                    if not client_job_list:
+                        continue
 
-                # Extract all operation names for this client
-                names = []
-                metadata = {}
-                # Issue #2 FIX: Get project_id from first job (all jobs for same client have same project_id)
-                project_id = None
-                for job_info in client_job_list:
-                    job_dict = job_info['body']
-                    names.extend(job_dict.get("operation_names", []))
-                    # Collect metadata for batch check
-                    op_meta = job_dict.get("operation_metadata", {})
-                    if op_meta:
-                        metadata.update(op_meta)
-                    # Get project_id from first job
-                    if project_id is None:
-                        project_id = job_info.get('project_id')
-
-                if not names:
-                    continue
+                    # Extract all operation names for this client
+                    # Copies of a scene share one body, so de-duplicate its operation names
+                    seen = set()
+                    names = []
+                    metadata = {}
+                    # Issue #2 FIX: Get project_id from first job (all jobs for same client have same project_id)
+                    project_id = None
+                    for job_info in client_job_list:
+                        job_dict = job_info['body']
+                        for n in job_dict.get("operation_names", []):
+                            if n not in seen:
+                                seen.add(n)
+                                names.append(n)
+                        # Collect metadata for batch check
+                        op_meta = job_dict.get("operation_metadata", {})
+                        if op_meta:
+                            metadata.update(op_meta)
+                        # Get project_id from first job
+                        if project_id is None:
+                            project_id = job_info.get('project_id')
+
+                    if not names:
+                        continue
 
-                # Batch check - Issue #2 FIX: Pass project_id for multi-account support
-                try:
-                    rs = client.batch_check_operations(names, metadata, project_id=project_id)
-                except Exception as e:
-                    self.log.emit(f"[WARN] Poll error (round {poll_round + 1}): {e}")
-                    time.sleep(10)
-                    continue
+                    # Batch check - Issue #2 FIX: Pass project_id for multi-account support
+                    poll_futures[client] = poll_executor.submit(
+                        client.batch_check_operations, names, metadata, project_id=project_id
+                    )
 
-                # Process results (same logic as original sequential)
-                new_jobs = []
-                for job_info in client_job_list:
-                    card = job_info['card']
-                    job_dict = job_info['body']
-                    copy_idx = job_info['copy']
-
-                    op_names = job_dict.get("operation_names", [])
-                    if not op_names:
-                        if 'no_op_count' not in job_info:
-                            job_info['no_op_count'] = 0
-                        job_info['no_op_count'] += 1
-
-                        if job_info['no_op_count'] > 3:
-                            self.log.emit(f"[WARN] Scene {card['scene']} copy {card['copy']}: no operation name")
-                        else:
-                            new_jobs.append(job_info)
+                # Process each client's results
+                poll_failed = False
+                updates = {}  # Applied after the loop: no snapshot of client_jobs needed
+                for client, client_job_list in client_jobs.items():
+                    if client not in poll_futures:
                         continue
 
-                    op_index = copy_idx - 1
-                    if op_index >= len(op_names):
-                        self.log.emit(f"[ERR] Scene {card['scene']} copy {card['copy']}: operation index out of bounds")
-                        card["status"] = "FAILED"
-                        card["error_reason"] = "Operation index out of bounds"
-                        self.job_card.emit(card)
+                    try:
+                        rs = poll_futures[client].result()
+                    except Exception as e:
+                        self.log.emit(f"[WARN] Poll error (round {poll_round + 1}): {e}")
+                        poll_failed = True
                         continue
 
-                    op_name = op_names[op_index]
-                    op_result = rs.get(op_name) or {}
-                    raw_response = op_result.get('raw', {})
-                    status = raw_response.get('status', '')
-
-                    scene = card["scene"]
-                    copy_num = card["copy"]
-
-                    if status == 'MEDIA_GENERATION_STATUS_SUCCESSFUL':
-                        op_metadata = raw_response.get('operation', {}).get('metadata', {})
-                        video_info = op_metadata.get('video', {})
-                        video_url = video_info.get('fifeUrl', '')
-
-                        if video_url:
-                            card["status"] = "READY"
-                            card["url"] = video_url
-                            self.log.emit(f"[SUCCESS] Scene {scene} Copy {copy_num}: Video ready!")
-
-                            # OPTIMIZATION: Queue for parallel download instead of downloading immediately
-                            if auto_download:
-                                out_name = f"scene_{scene:03d}_copy_{copy_num:02d}.mp4"
-                                dst_path = os.path.join(dir_videos, out_name)
-                                bearer_token = job_dict.get("bearer_token")
-                                
-                                # Add to download queue
-                                ready_to_download.append({
-                                    'job_info': job_info,
-                                    'card': card,
-                                    'video_url': video_url,
-                                    'dst_path': dst_path,
-                                    'bearer_token': bearer_token,
-                                    'scene': scene,
-                                    'copy_num': copy_num,
-                                    'thumbs_dir': thumbs_dir
-                                })
+                    # Process results (same logic as original sequential)
+                    new_jobs = []
+                    for job_info in client_job_list:
+                        card = job_info['card']
+                        job_dict = job_info['body']
+                        copy_idx = job_info['copy']
+
+                        op_names = job_dict.get("operation_names", [])
+                        if not op_names:
+                            if 'no_op_count' not in job_info:
+                                job_info['no_op_count'] = 0
+                            job_info['no_op_count'] += 1
+
+                            if job_info['no_op_count'] > 3:
+                                self.log.emit(f"[WARN] Scene {card['scene']} copy {card['copy']}: no operation name")
+                            else:
+                                new_jobs.append(job_info)
+                            continue
 
+                        op_index = copy_idx - 1
+                        if op_index >= len(op_names):
+                            self.log.emit(f"[ERR] Scene {card['scene']} copy {card['copy']}: operation index out of bounds")
+                            card["status"] = "FAILED"
+                            card["error_reason"] = "Operation index out of bounds"
                             self.job_card.emit(card)
-                        else:
-                            # Video marked successful but no URL - error state
-                            self.log.emit(f"[ERR] Scene {scene} Copy {copy_num}: Không có URL video trong phản hồi")
-                            card["status"] = "DONE_NO_URL"
-                            card["error_reason"] = "Không có URL video"
+                            continue
+
+                        op_name = op_names[op_index]
+                        op_result = rs.get(op_name) or {}
+                        raw_response = op_result.get('raw', {})
+                        status = raw_response.get('status', '')
+
+                        scene = card["scene"]
+                        copy_num = card["copy"]
+
+                        if status == 'MEDIA_GENERATION_STATUS_SUCCESSFUL':
+                            video_url = _dig(raw_response, 'operation', 'metadata', 'video', 'fifeUrl') or ''
+
+                            if video_url:
+                                card["status"] = "READY"
+                                card["url"] = video_url
+                                self._log("[SUCCESS] Scene %s Copy %s: Video ready!", scene, copy_num)
+
+                                self.job_card.emit(card)
+
+                                # OPTIMIZATION: Download in the background; the job leaves the poll list now
+                                if auto_download:
+                                    out_name = f"scene_{scene:03d}_copy_{copy_num:02d}.mp4"
+                                    dst_path = os.path.join(dir_videos, out_name)
+                                    bearer_token = job_dict.get("bearer_token")
+                                    download_futures.append(self._dl_executor.submit(
+                                        self._do_download_and_thumb,
+                                        job_info, video_url, dst_path, bearer_token, thumbs_dir
+                                    ))
+                            else:
+                                # Video marked successful but no URL - error state
+                                self.log.emit(f"[ERR] Scene {scene} Copy {copy_num}: Không có URL video trong phản hồi")
+                                card["status"] = "DONE_NO_URL"
+                                card["error_reason"] = "Không có URL video"
+                                self.job_card.emit(card)
+
+                        elif status in ['MEDIA_GENERATION_STATUS_FAILED', 'MEDIA_GENERATION_STATUS_BLOCKED']:
+                            # Extract detailed error information from API response
+                            error_message = _dig(raw_response, 'operation', 'error', 'message') or ''
+
+                            # Categorize the error for better user understanding
+                            if 'quota' in error_message.lower() or 'limit' in error_message.lower():
+                                error_reason = "Vượt quota API"
+                            elif 'policy' in error_message.lower() or 'content' in error_message.lower() or 'safety' in error_message.lower():
+                                error_reason = "Nội dung không phù hợp (vi phạm chính sách)"
+                            elif 'timeout' in error_message.lower():
+                                error_reason = "Timeout - quá thời gian chờ"
+                            elif status == 'MEDIA_GENERATION_STATUS_BLOCKED':
+                                error_reason = "Bị chặn (nội dung vi phạm)"
+                            elif error_message:
+                                error_reason = error_message[:80]
+                            else:
+                                error_reason = "Tạo video thất bại"
+
+                            card["status"] = "FAILED"
+                            card["error_reason"] = error_reason
+                            self._log("[FAILED] Scene %s Copy %s: %s", scene, copy_num, error_reason)
                             self.job_card.emit(card)
 
-                    elif status in ['MEDIA_GENERATION_STATUS_FAILED', 'MEDIA_GENERATION_STATUS_BLOCKED']:
-                        # Extract detailed error information from API response
-                        error_info = raw_response.get('operation', {}).get('error', {})
-                        error_message = error_info.get('message', '')
-
-                        # Categorize the error for better user understanding
-                        if 'quota' in error_message.lower() or 'limit' in error_message.lower():
-                            error_reason = "Vượt quota API"
-                        elif 'policy' in error_message.lower() or 'content' in error_message.lower() or 'safety' in error_message.lower():
-                            error_reason = "Nội dung không phù hợp (vi phạm chính sách)"
-                        elif 'timeout' in error_message.lower():
-                            error_reason = "Timeout - quá thời gian chờ"
-                        elif status == 'MEDIA_GENERATION_STATUS_BLOCKED':
-                            error_reason = "Bị chặn (nội dung vi phạm)"
-                        elif error_message:
-                            error_reason = error_message[:80]
                         else:
-                            error_reason = "Tạo video thất bại"
+                            # Still processing - only notify the UI when the status actually changes
+                            if card.get("status") != "PROCESSING":
+                                card["status"] = "PROCESSING"
+                                self.job_card.emit(card)
+                            new_jobs.append(job_info)
 
-                        card["status"] = "FAILED"
-                        card["error_reason"] = error_reason
-                        self.log.emit(f"[FAILED] Scene {scene} Copy {copy_num}: {error_reason}")
-                        self.job_card.emit(card)
+                    updates[client] = new_jobs
 
-                    else:
-                        # Still processing
-                        card["status"] = "PROCESSING"
-                        self.job_card.emit(card)
-                        new_jobs.append(job_info)
+                client_jobs.update(updates)
 
-                client_jobs[client] = new_jobs
+                # Update main jobs list
+                jobs = [job for job_list in client_jobs.values() for job in job_list]
 
-            # Update main jobs list
-            jobs = [job for job_list in client_jobs.values() for job in job_list]
+                if poll_failed:
+                    time.sleep(10)  # Wait longer on error before retry
 
-            # OPTIMIZATION: Process ready downloads in parallel batches
-            if ready_to_download:
-                self._process_parallel_downloads(
-                    ready_to_download, 
-                    completed_jobs,
-                    thumbs_dir
-                )
-                ready_to_download.clear()
-            
-            if jobs:
-                # Warn if approaching timeout
-                if poll_round >= 100:
-                    self.log.emit(f"[WARN] Waiting for {len(jobs)} videos (round {poll_round + 1}/120) - approaching timeout!")
-                else:
-                    self.log.emit(f"[INFO] Waiting for {len(jobs)} videos (round {poll_round + 1}/120)...")
-                time.sleep(5)
-
-        # Process any remaining downloads
-        if ready_to_download:
-            self._process_parallel_downloads(
-                ready_to_download, 
-                completed_jobs,
-                thumbs_dir
-            )
+                if jobs:
+                    # Warn if approaching timeout
+                    if poll_round >= 100:
+                        self._log("[WARN] Waiting for %d videos (round %d/120) - approaching timeout!", len(jobs), poll_round + 1)
+                    else:
+                        self._log("[INFO] Waiting for %d videos (round %d/120)...", len(jobs), poll_round + 1)
+                    time.sleep(5)
+        finally:
+            poll_executor.shutdown(wait=False)
+
+        # Wait for in-flight downloads (needed before 4K upscale)
+        completed_jobs = []  # Successfully downloaded jobs for 4K upscale
+        if download_futures:
+            completed_jobs = [job_info for job_info in (f.result() for f in download_futures) if job_info]
+            failed_count = len(download_futures) - len(completed_jobs)
+            if failed_count > 0:
+                self.log.emit(f"[DOWNLOAD] Completed: {len(completed_jobs)} succeeded, {failed_count} failed")
+            else:
+                self.log.emit(f"[DOWNLOAD] ✓ All {len(completed_jobs)} videos downloaded successfully")
 
         # If we exit the loop with remaining jobs, they timed out
         if jobs:
@@ -2012,114 +2215,42 @@ class _Worker(QObject):
 
         # 4K upscale if requested
         if up4k and shutil.which("ffmpeg"):
-            self.log.emit(f"[INFO] Starting 4K upscale for {len(completed_jobs)} videos...")
-            for job_info in completed_jobs:
-                card = job_info['card']
-                if card.get("path"):
-                    src = card["path"]
-                    dst = src.replace(".mp4", "_4k.mp4")
-                    self.log.emit(f"[4K] Upscaling scene {card['scene']} copy {card['copy']}...")
-                    cmd = ["ffmpeg", "-y", "-i", src, "-vf", "scale=3840:-2", "-c:v", "libx264", "-preset", "fast", dst]
-                    try:
-                        subprocess.run(cmd, check=True)
-                        card["path"] = dst
-                        card["status"] = "UPSCALED_4K"
-                        self.job_card.emit(card)
-                        self.log.emit(f"[4K] ✓ Scene {card['scene']} copy {card['copy']}: Upscaled to 4K")
-                    except Exception as e:
-                        self.log.emit(f"[ERR] 4K upscale failed for scene {card['scene']} copy {card['copy']}: {e}")
+            self._upscale_4k(completed_jobs)
     
-    def _process_parallel_downloads(self, download_queue, completed_jobs, thumbs_dir):
+    def _do_download_and_thumb(self, job_info, video_url, dst_path, bearer_token, thumbs_dir):
         """
-        Download multiple videos in parallel using ThreadPoolExecutor
-        
+        Download one video and queue its thumbnail (runs on the download executor)
+
         Args:
-            download_queue: List of download tasks
-            completed_jobs: List to append successfully downloaded jobs
+            job_info: Job whose card is updated and re-emitted
+            video_url: Video URL to download
+            dst_path: Destination path for downloaded file
+            bearer_token: Optional bearer token for authentication
             thumbs_dir: Directory for thumbnails
-        """
-        if not download_queue:
-            return
-        
-        import concurrent.futures
-        
-        batch_size = min(len(download_queue), MAX_PARALLEL_DOWNLOADS)
-        self.log.emit(f"[DOWNLOAD] Starting parallel download of {len(download_queue)} videos ({batch_size} at a time)...")
-        
-        def download_one(download_task):
-            """Download a single video with error handling"""
-            try:
-                job_info = download_task['job_info']
-                card = download_task['card']
-                video_url = download_task['video_url']
-                dst_path = download_task['dst_path']
-                bearer_token = download_task['bearer_token']
-                scene = download_task['scene']
-                copy_num = download_task['copy_num']
-                
-                # Attempt download
-                if self._download(video_url, dst_path, bearer_token=bearer_token):
-                    card["path"] = dst_path
-                    card["status"] = "DOWNLOADED"
-                    
-                    # Generate thumbnail
-                    thumb = self._make_thumb(dst_path, thumbs_dir, scene, copy_num)
-                    if thumb:
-                        card["thumb"] = thumb
-                    
-                    return {
-                        'success': True,
-                        'job_info': job_info,
-                        'card': card,
-                        'scene': scene,
-                        'copy_num': copy_num
-                    }
-                else:
-                    card["status"] = "DOWNLOAD_FAILED"
-                    card["error_reason"] = "Tải video thất bại"
-                    return {
-                        'success': False,
-                        'card': card,
-                        'scene': scene,
-                        'copy_num': copy_num,
-                        'error': "Download failed"
-                    }
-            except Exception as e:
-                card["status"] = "DOWNLOAD_FAILED"
-                card["error_reason"] = f"Lỗi tải video: {str(e)[:50]}"
-                return {
-                    'success': False,
-                    'card': card,
-                    'scene': download_task['scene'],
-                    'copy_num': download_task['copy_num'],
-                    'error': str(e)
-                }
-        
-        # Process downloads in parallel batches
-        downloaded_count = 0
-        failed_count = 0
-        
-        with concurrent.futures.ThreadPoolExecutor(max_workers=batch_size) as executor:
-            # Submit all downloads
-            futures = [executor.submit(download_one, task) for task in download_queue]
-            
-            # Process results as they complete
-            for future in concurrent.futures.as_completed(futures):
-                result = future.result()
-                
-                if result['success']:
-                    downloaded_count += 1
-                    completed_jobs.append(result['job_info'])
-                    self.log.emit(f"[DOWNLOAD] ✓ Scene {result['scene']} Copy {result['copy_num']}: Downloaded ({downloaded_count}/{len(download_queue)})")
-                    self.job_card.emit(result['card'])
-                else:
-                    failed_count += 1
-                    self.log.emit(f"[DOWNLOAD] ✗ Scene {result['scene']} Copy {result['copy_num']}: Failed - {result.get('error', 'Unknown error')}")
-                    self.job_card.emit(result['card'])
-        
-        # Summary
-        if failed_count > 0:
-            self.log.emit(f"[DOWNLOAD] Completed: {downloaded_count} succeeded, {failed_count} failed")
-        else:
-            self.log.emit(f"[DOWNLOAD] ✓ All {downloaded_count} videos downloaded successfully")
 
+        Returns:
+            job_info if the download succeeded, None otherwise
+        """
+        card = job_info['card']
+        scene = card["scene"]
+        copy_num = card["copy"]
+        try:
+            if self._download(video_url, dst_path, bearer_token=bearer_token):
+                card["path"] = dst_path
+                card["status"] = "DOWNLOADED"
+                self._log("[DOWNLOAD] ✓ Scene %s Copy %s: Downloaded", scene, copy_num)
+                # Snapshots: the worker thread keeps updating the card (e.g. 4K upscale)
+                self.job_card.emit(dict(card))
+                # Thumbnail follows in a second card update when ready
+                self._submit_thumb(card, dst_path, thumbs_dir, scene, copy_num)
+                return job_info
+            card["status"] = "DOWNLOAD_FAILED"
+            card["error_reason"] = "Tải video thất bại"
+            error = "Download failed"
+        except Exception as e:
+            card["status"] = "DOWNLOAD_FAILED"
+            card["error_reason"] = f"Lỗi tải video: {str(e)[:50]}"
+            error = str(e)
+        self.log.emit(f"[DOWNLOAD] ✗ Scene {scene} Copy {copy_num}: Failed - {error}")
+        self.job_card.emit(dict(card))
+        return None
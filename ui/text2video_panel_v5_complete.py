@@ -14,19 +14,48 @@ Date: 2025-01-05
 import datetime
 import json
 import os
+import random
 import re
-
-from PyQt5.QtCore import QLocale, QSize, Qt, QThread, QUrl, pyqtSignal  # THÊM pyqtSignal
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache, partial
+from typing import Optional
+
+from PyQt5.QtCore import (  # THÊM pyqtSignal
+    QEvent,
+    QLocale,
+    QMetaObject,
+    QObject,
+    QRect,
+    QRunnable,
+    Qt,
+    QThread,
+    QThreadPool,
+    QTimer,
+    QUrl,
+    Q_ARG,
+    pyqtSignal,
+    pyqtSlot,
+)  # THÊM pyqtSignal
 from PyQt5.QtGui import (  # THÊM QPixmap
     QColor,
     QDesktopServices,
     QFont,
+    QFontMetrics,
     QIcon,
+    QImage,
     QKeySequence,
+    QPainter,
     QPixmap,
+    QPixmapCache,
+    QStandardItem,
+    QStandardItemModel,
 )
 from PyQt5.QtWidgets import (
     QApplication,
+    QButtonGroup,
     QCheckBox,
     QComboBox,
     QFileDialog,
@@ -36,9 +65,8 @@ from PyQt5.QtWidgets import (
     QHBoxLayout,
     QLabel,
     QLineEdit,
-    QListWidget,
-    QListWidgetItem,
     QMessageBox,
+    QPlainTextEdit,
     QProgressBar,
     QPushButton,
     QScrollArea,
@@ -47,6 +75,9 @@ from PyQt5.QtWidgets import (
     QSlider,
     QSpinBox,
     QStackedWidget,
+    QStyle,
+    QStyledItemDelegate,
+    QStyleOptionButton,
     QTableWidget,
     QTableWidgetItem,
     QTabWidget,
@@ -55,6 +86,8 @@ from PyQt5.QtWidgets import (
     QWidget,
 )
 
+from utils.json_utils import json_dumpb, json_dumps, json_loads
+
 # Original imports
 try:
     from services.domain_prompts import get_all_domains, get_topics_for_domain
@@ -75,7 +108,7 @@ try:
         extract_location_context,
         get_model_key_from_display,
     )
-    from ui.widgets.scene_result_card import SceneResultCard
+    from ui.widgets.scene_result_card import SCENE_CARD_QSS, SceneResultCard
     from ui.workers.video_worker import VideoGenerationWorker  # PR#7: Background video worker
     from ui.widgets.history_widget import HistoryWidget  # History tab widget
     from utils import config as cfg
@@ -88,16 +121,683 @@ except ImportError as e:
     _LANGS = [("Tiếng Việt", "vi"), ("English", "en")]
     _ASPECT_MAP = {"16:9": "VIDEO_ASPECT_RATIO_LANDSCAPE"}
     SceneResultCard = None
+    SCENE_CARD_QSS = ""
     VideoGenerationWorker = None  # PR#7: Fallback for missing worker
     HistoryWidget = None  # Fallback for missing history widget
 
+try:
+    from services.labs_flow_service import _build_complete_prompt_text  # scene_XX.txt formatter
+except ImportError:
+    _build_complete_prompt_text = None
+
 # V5 STYLING
 FONT_H2 = QFont("Segoe UI", 15, QFont.Bold)  # +2px, bold
 FONT_BODY = QFont("Segoe UI", 13)
+# Storyboard card fonts, shared by every card
+FONT_CARD_DESC = QFont("Segoe UI", 10)
+FONT_CARD_STATUS = QFont("Segoe UI", 10, QFont.Bold)
+# Social media version cards
+FONT_SOCIAL_TITLE = QFont("Segoe UI", 14, QFont.Bold)
+FONT_SOCIAL_PLATFORM = QFont("Segoe UI", 12, QFont.Bold)
+FONT_SOCIAL_SECTION = QFont("Segoe UI", 11, QFont.Bold)
 
 # Warning dialog separator
 WARNING_SEPARATOR = "\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n\n"
 
+# Storyboard thumbnail size and shared pixmap cache budget (KB)
+STORYBOARD_THUMB_SIZE = (242, 136)
+PIXMAP_CACHE_LIMIT_KB = 51200  # 50 MB
+
+# Shared by all storyboard cards: flexible width, fixed height
+_CARD_SIZE_POLICY = QSizePolicy(QSizePolicy.Preferred, QSizePolicy.Fixed)
+
+# Card description is elided to about two wrapped lines of the 224px-wide label
+_DESC_ELIDE_WIDTH = 2 * 220
+_desc_metrics = None  # QFontMetrics(FONT_CARD_DESC), created on first use (needs QApplication)
+
+# Console scrollback in lines; the log buffer is capped the same way since older
+# lines would be dropped by the console anyway
+_LOG_MAX_LINES = 500
+
+# Script/video runs executing at once (e.g. several scene retries); more are queued
+_MAX_CONCURRENT_WORKERS = 8
+
+# Google TTS pitch setting in semitones, e.g. "+2st"
+_PITCH_RE = re.compile(r'([+-]?\d+)st')
+
+# Video statuses counted on storyboard cards (and retried by _retry_failed_scene)
+_COMPLETED_STATUSES = frozenset({'DOWNLOADED', 'COMPLETED', 'UPSCALED_4K'})
+_FAILED_STATUSES = frozenset({'FAILED', 'ERROR', 'FAILED_START', 'DONE_NO_URL', 'DOWNLOAD_FAILED'})
+
+
+# Storyboard card styles, parsed once on the grid container instead of once per card widget.
+# "#sceneCard QFrame" keeps the card frame style cascading to its labels (QLabel is a QFrame),
+# as the old per-card "QFrame { ... }" sheet did; other selectors outrank it via the extra id.
+_STORYBOARD_QSS = """
+    QWidget { background: white; }
+    QFrame#sceneCard, QFrame#sceneCard QFrame {
+        background: white;
+        border: 2px solid #E0E0E0;
+        border-radius: 8px;
+    }
+    QFrame#sceneCard:hover, QFrame#sceneCard QFrame:hover {
+        border: 2px solid #1E88E5;
+        background: #F8FCFF;
+    }
+    QFrame#sceneCard QLabel#sceneThumb {
+        background: #F5F5F5; 
+        border: 1px solid #E0E0E0;
+        border-radius: 6px;
+        color: #9E9E9E;
+        font-size: 11px;
+    }
+    QFrame#sceneCard QLabel#sceneThumb:hover {
+        border: 2px solid #1E88E5;
+        background: #E3F2FD;
+    }
+    QFrame#sceneCard QLabel#sceneDesc { color: #757575; }
+    QFrame#sceneCard QLabel#sceneStatusFailed { color: #E53935; font-weight: bold; }
+    QFrame#sceneCard QLabel#sceneStatusOk { color: #4CAF50; font-weight: bold; }
+    QPushButton#sceneRetryBtn, QPushButton#sceneRegenBtn, QPushButton#sceneGenBtn {
+        color: white;
+        border: none;
+        border-radius: 4px;
+        font-weight: bold;
+        font-size: 11px;
+        padding: 4px 8px;
+    }
+    QPushButton#sceneRetryBtn { background: #FF9800; }
+    QPushButton#sceneRetryBtn:hover { background: #F57C00; }
+    QPushButton#sceneRegenBtn { background: #2196F3; }
+    QPushButton#sceneRegenBtn:hover { background: #1976D2; }
+    QPushButton#sceneGenBtn { background: #4CAF50; }
+    QPushButton#sceneGenBtn:hover { background: #388E3C; }
+"""
+
+
+@lru_cache(maxsize=None)
+def _emoji_icon(emoji, size=16):
+    """Rasterize an emoji to a QIcon once; buttons then blit it instead of shaping emoji text.
+
+    Built on first use rather than at import because QPixmap needs a QApplication.
+    """
+    pm = QPixmap(size, size)
+    pm.fill(Qt.transparent)
+    painter = QPainter(pm)
+    font = QFont("Segoe UI Emoji")
+    font.setPixelSize(size - 3)
+    painter.setFont(font)
+    painter.drawText(pm.rect(), Qt.AlignCenter, emoji)
+    painter.end()
+    return QIcon(pm)
+
+
+# Card/Storyboard view toggle buttons; set on their parent widget and inherited
+_TOGGLE_BTN_QSS = """
+    QPushButton {
+        background: white;
+        border: 2px solid #BDBDBD;
+        border-radius: 6px;
+        font-size: 13px;
+        font-weight: 600;
+        color: #424242;
+    }
+    QPushButton:checked {
+        background: #1E88E5;
+        border: 2px solid #1E88E5;
+        color: white;
+        font-weight: 700;
+    }
+    QPushButton:hover { 
+        border: 2px solid #1E88E5;
+        color: #1E88E5;
+    }
+"""
+
+
+# Panel widget styles, keyed by object name and set once on the panel in _apply_styles
+# instead of one setStyleSheet (and one CSS parse) per widget in _build_ui
+_PANEL_QSS = """
+    QGroupBox {
+        font-weight: bold;
+        font-size: 13px;
+        border: 1px solid #d0d0d0;
+        border-radius: 5px;
+        margin-top: 10px;
+        padding-top: 10px;
+    }
+    QGroupBox::title {
+        subcontrol-origin: margin;
+        subcontrol-position: top left;
+        padding: 4px 10px;
+        left: 10px;
+        top: 0px;
+    }
+    QLineEdit#projectEdit {
+        background: white;
+        border: 2px solid #BDBDBD;
+        border-radius: 6px;
+        padding: 8px 12px;
+        font-size: 13px;
+    }
+    QLineEdit#projectEdit:focus { border: 2px solid #1E88E5; }
+    QTextEdit#ideaEdit {
+        background: white;
+        border: 2px solid #BDBDBD;
+        border-radius: 6px;
+        padding: 10px;
+        font-size: 13px;
+    }
+    QTextEdit#ideaEdit:focus { border: 2px solid #1E88E5; }
+    QScrollArea#charRefScroll {
+        border: 1px solid #ccc;
+        border-radius: 4px;
+        background: #f9f9f9;
+    }
+    QPushButton#btnAuto {
+        background: #FF6B35;
+        color: white;
+        border: none;
+        border-radius: 24px;
+        font-weight: 700;
+        font-size: 15px;
+    }
+    QPushButton#btnAuto:hover { background: #FF8555; }
+    QPushButton#btnStop {
+        background: #E0E0E0;
+        color: #616161;
+        border: none;
+        border-radius: 24px;
+        font-weight: 700;
+    }
+    QPushButton#btnStop:disabled { background: #F5F5F5; color: #BDBDBD; }
+    QPushButton#btnOpenFolder {
+        background: #1E88E5;
+        color: white;
+        border: none;
+        border-radius: 20px;
+        font-weight: 700;
+    }
+    QPushButton#btnOpenFolder:hover { background: #2196F3; }
+    QPushButton#btnClearProject {
+        background: #E0E0E0;
+        color: #616161;
+        border: none;
+        border-radius: 20px;
+        font-weight: 700;
+    }
+    QPushButton#btnClearProject:hover { background: #EEEEEE; }
+    QPushButton#btnClearProject:disabled { background: #F5F5F5; color: #BDBDBD; }
+    QPushButton#btnCancelVideo {
+        background: #E0E0E0;
+        color: #616161;
+        border: none;
+        border-radius: 16px;
+        font-weight: 700;
+        font-size: 12px;
+    }
+    QPushButton#btnCancelVideo:hover { background: #BDBDBD; }
+    QProgressBar#progressBar {
+        border: 2px solid #4CAF50;
+        border-radius: 5px;
+        text-align: center;
+        background-color: #E8F5E9;
+        font-weight: bold;
+        font-size: 12px;
+    }
+    QProgressBar#progressBar::chunk {
+        background-color: #4CAF50;
+        border-radius: 3px;
+    }
+    QPushButton#btnGenerateBible {
+        background: #1E88E5;
+        color: white;
+        border: none;
+        border-radius: 18px;
+        font-weight: 700;
+    }
+    QPushButton#btnGenerateBible:hover { background: #2196F3; }
+    QPushButton#btnGenerateBible:disabled { background: #CCCCCC; }
+    #resultTabs QTabBar::tab {
+        min-width: 140px;
+        padding: 12px 18px;
+        font-weight: 700;
+        border-top-left-radius: 8px;
+        border-top-right-radius: 8px;
+        margin-right: 3px;
+    }
+    #resultTabs QTabBar::tab:selected {
+        background: #00ACC1;
+        color: white;
+        border-bottom: 4px solid #00838F;
+    }
+    #resultTabs QTabBar::tab:!selected {
+        background: #F5F5F5;
+        color: #616161;
+    }
+    #resultTabs QTabBar::tab:hover {
+        background: #B2EBF2;
+    }
+    QPlainTextEdit#console {
+        background: #C8E6C9;
+        color: #1B5E20;
+        border: 2px solid #4CAF50;
+        border-radius: 6px;
+        padding: 8px;
+    }
+    QLabel#styleDescription { font-size: 11px; color: #666; }
+    QLabel#charRefThumb { border: 1px solid #ddd; border-radius: 4px; }
+    QLabel#charRefMore { border: 1px solid #ddd; border-radius: 4px; font-weight: bold; }
+    QLabel#tabPlaceholder { color: #999; font-size: 13px; }
+    QLabel#socialPlaceholder { color: #999; font-size: 13px; padding: 40px; }
+"""
+
+
+# Social media version card titles; old-format results key the versions by name instead
+_VERSION_TITLES = (
+    "📱 VERSION 1: CASUAL/FRIENDLY",
+    "💼 VERSION 2: PROFESSIONAL",
+    "😂 VERSION 3: FUNNY/ENGAGING",
+)
+_LEGACY_VERSION_KEYS = ("casual", "professional", "funny")
+
+# Social media version cards, set once on the social tab's content widget instead of
+# per card. "X, X *" keeps the cascade the old selector-less per-widget sheets had.
+_SOCIAL_QSS = """
+    QGroupBox#socialVersion {
+        background: #E1F5FE;
+        border: 2px solid #00ACC1;
+        border-radius: 8px;
+        margin-top: 16px;
+        padding: 16px;
+        font-weight: bold;
+        font-size: 14pt;
+    }
+    QGroupBox#socialVersion::title {
+        subcontrol-origin: margin;
+        subcontrol-position: top left;
+        padding: 6px 12px;
+        background: #00ACC1;
+        color: white;
+        border-radius: 4px;
+        left: 12px;
+        top: 8px;
+    }
+    QFrame#socialSection, QFrame#socialSection * {
+        background: white;
+        border-radius: 4px;
+        padding: 8px;
+    }
+    QLabel#socialHeading { color: #00838F; }
+    QPlainTextEdit#socialText, QPlainTextEdit#socialText * {
+        border: 1px solid #ddd;
+        border-radius: 4px;
+        padding: 6px;
+    }
+    QLabel#socialCta {
+        border: 1px solid #ddd;
+        border-radius: 4px;
+        padding: 6px;
+        background: #f9f9f9;
+    }
+    QPushButton#socialCopyBtn {
+        background: #00ACC1;
+        color: white;
+        border: none;
+        border-radius: 4px;
+        padding: 6px 12px;
+        font-weight: bold;
+    }
+    QPushButton#socialCopyBtn:hover { background: #00838F; }
+    QPushButton#socialCopyAllBtn {
+        background: #0277BD;
+        color: white;
+        border: none;
+        border-radius: 4px;
+        padding: 8px 16px;
+        font-weight: bold;
+        font-size: 13px;
+    }
+    QPushButton#socialCopyAllBtn:hover { background: #01579B; }
+"""
+
+
+def _thumb_cache_key(path, mtime):
+    """QPixmapCache key for a storyboard thumbnail (changes when the file does)"""
+    w, h = STORYBOARD_THUMB_SIZE
+    return f"{path}|{mtime}|{w}x{h}"
+
+
+class _ThumbLoadSignals(QObject):
+    """Signals for _ThumbLoadTask (QRunnable cannot emit signals itself)"""
+    loaded = pyqtSignal(int, str, str, QImage)  # scene_num, path, cache key, scaled image
+
+
+class _ThumbLoadTask(QRunnable):
+    """Decode and scale a thumbnail on the thread pool; QImage is safe off the GUI thread"""
+
+    def __init__(self, scene_num, path, key, signals):
+        super().__init__()
+        self.scene_num = scene_num
+        self.path = path
+        self.key = key
+        self.signals = signals
+
+    def run(self):
+        w, h = STORYBOARD_THUMB_SIZE
+        image = QImage(self.path)
+        # Nearest-neighbour is indistinguishable at card size; keep smoothing only for
+        # very large sources where aliasing would show
+        mode = Qt.SmoothTransformation if image.width() > 4 * w else Qt.FastTransformation
+        image = image.scaled(w, h, Qt.KeepAspectRatio, mode)
+        self.signals.loaded.emit(self.scene_num, self.path, self.key, image)
+
+
+class _SavePromptSignals(QObject):
+    """Signals for _SavePromptTask; emitted from the pool, delivered on the GUI thread"""
+    log = pyqtSignal(str)
+
+
+class _SavePromptTask(QRunnable):
+    """Build one scene's prompt JSON and write scene_XX.json / scene_XX.txt on the thread pool
+
+    Only plain data snapshotted on the GUI thread is passed in; results and errors
+    go back through signals.log.
+    """
+
+    def __init__(self, json_path, txt_path, args, kwargs, signals):
+        super().__init__()
+        self.json_path = json_path
+        self.txt_path = txt_path
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = signals
+
+    def run(self):
+        try:
+            j = build_prompt_json(*self.args, **self.kwargs)
+
+            # Compact on disk; the .txt below is the human-readable copy
+            with open(self.json_path, "wb", buffering=65536) as f:
+                f.write(json_dumpb(j))
+
+            # Auto-save formatted prompt as .txt file (Requirement #2)
+            try:
+                if _build_complete_prompt_text is None:
+                    raise ImportError("services.labs_flow_service is not available")
+                formatted_prompt = _build_complete_prompt_text(j)
+                with open(self.txt_path, "w", encoding="utf-8", buffering=65536) as f:
+                    f.write(formatted_prompt)
+            except Exception as txt_err:
+                self.signals.log.emit(f"[WARN] Could not save .txt prompt: {txt_err}")
+        except Exception as e:
+            self.signals.log.emit(f"[WARN] Could not save prompt: {e}")
+
+
+class _WorkerRunnable(QRunnable):
+    """Run a _Worker on QThreadPool so consecutive jobs reuse pooled threads
+
+    The _Worker keeps its own signals; it stays owned by the GUI thread and only
+    its run() executes on the pool.
+    """
+
+    def __init__(self, worker):
+        super().__init__()
+        self.worker = worker
+
+    def run(self):
+        self.worker.run()
+
+
+class _LoadVoicesSignals(QObject):
+    """Signals for _LoadVoicesTask; emitted from the pool, delivered on the GUI thread"""
+    voices_ready = pyqtSignal(int, str, str, list)  # request id, provider, language, voices
+    failed = pyqtSignal(int, str)  # request id, error message
+
+
+class _LoadVoicesTask(QRunnable):
+    """Fetch the voice list for a provider/language on the thread pool"""
+
+    def __init__(self, request_id, provider, language, signals):
+        super().__init__()
+        self.request_id = request_id
+        self.provider = provider
+        self.language = language
+        self.signals = signals
+
+    def run(self):
+        try:
+            voices = get_voices_for_provider(self.provider, self.language) or []
+        except Exception as e:
+            self.signals.failed.emit(self.request_id, str(e))
+            return
+        self.signals.voices_ready.emit(self.request_id, self.provider, self.language, list(voices))
+
+
+class _ViewButtonDelegate(QStyledItemDelegate):
+    """Paints a push button in every cell of a table column and reports clicks by row
+
+    Replaces one QPushButton cell widget per row; the button face is rendered once
+    per (size, pressed) and blitted.
+    """
+
+    clicked = pyqtSignal(int)  # row
+
+    def __init__(self, text, parent=None):
+        super().__init__(parent)
+        self._text = text
+        self._pressed = None  # (row, column) under a left-button press
+        self._faces = {}  # (width, height, pressed) -> QPixmap
+
+    def _face(self, widget, w, h, pressed):
+        key = (w, h, pressed)
+        pm = self._faces.get(key)
+        if pm is None:
+            pm = QPixmap(w, h)
+            pm.fill(Qt.transparent)
+            opt = QStyleOptionButton()
+            opt.rect = QRect(0, 0, w, h)
+            opt.text = self._text
+            opt.state = QStyle.State_Enabled | (QStyle.State_Sunken if pressed else QStyle.State_Raised)
+            style = widget.style() if widget else QApplication.style()
+            painter = QPainter(pm)
+            style.drawControl(QStyle.CE_PushButton, opt, painter, widget)
+            painter.end()
+            self._faces[key] = pm
+        return pm
+
+    def paint(self, painter, option, index):
+        rect = option.rect.adjusted(2, 2, -2, -2)
+        pressed = self._pressed == (index.row(), index.column())
+        painter.drawPixmap(rect.topLeft(), self._face(option.widget, rect.width(), rect.height(), pressed))
+
+    def createEditor(self, parent, option, index):
+        return None  # Button cells are never edited
+
+    def _repaint(self, rect):
+        view = self.parent()
+        if view is not None:
+            view.viewport().update(rect)
+
+    def editorEvent(self, event, model, option, index):
+        etype = event.type()
+        if etype == QEvent.MouseButtonPress and event.button() == Qt.LeftButton:
+            self._pressed = (index.row(), index.column())
+            self._repaint(option.rect)
+            return True
+        if etype == QEvent.MouseButtonRelease and self._pressed is not None:
+            pressed, self._pressed = self._pressed, None
+            self._repaint(option.rect)
+            if pressed == (index.row(), index.column()) and option.rect.contains(event.pos()):
+                self.clicked.emit(index.row())
+            return True
+        return super().editorEvent(event, model, option, index)
+
+
+class _LazyComboBox(QComboBox):
+    """QComboBox that adds its items on first use (popup, wheel or key) instead of at build time"""
+
+    def __init__(self, populate=None, parent=None):
+        super().__init__(parent)
+        self._populate = populate
+
+    def set_populator(self, populate):
+        """Replace the populate callback; it runs on the next use"""
+        self._populate = populate
+
+    def ensure_populated(self):
+        if self._populate is not None:
+            populate, self._populate = self._populate, None
+            populate(self)
+
+    def showPopup(self):
+        self.ensure_populated()
+        super().showPopup()
+
+    def wheelEvent(self, e):
+        self.ensure_populated()
+        super().wheelEvent(e)
+
+    def keyPressEvent(self, e):
+        self.ensure_populated()
+        super().keyPressEvent(e)
+
+
+def _add_domain_items(combo, domains_fn=None):
+    """Populator for the domain combo: one item per domain, data = domain name"""
+    domains_fn = domains_fn or get_all_domains
+    if domains_fn:
+        for domain in domains_fn():
+            combo.addItem(domain, domain)
+
+
+# Video style combo: (label, data key); "separator_*" keys are disabled group headers
+_VIDEO_STYLES = (
+    # Group 1: Animation Styles
+    ("━━━ ANIMATION ━━━", "separator_1"),
+    ("  Anime 2D (Phẳng, viền đậm)", "anime_2d"),
+    ("  Anime Cinematic (Anime + Điện ảnh)", "anime_cinematic"),
+    ("  Pixar 3D (Phong cách Pixar)", "pixar_3d"),
+    ("  Disney 3D (Phong cách Disney)", "disney_3d"),
+    ("  DreamWorks 3D (Phong cách DreamWorks)", "dreamworks_3d"),
+    ("  Illumination 3D (Minions style)", "illumination_3d"),
+    ("  Studio Ghibli 3D (Ghibli 3D)", "ghibli_3d"),
+    # Group 2: Realistic Styles
+    ("━━━ REALISTIC ━━━", "separator_2"),
+    ("  Realistic (Chân thực)", "realistic"),
+    ("  Cinematic (Điện ảnh)", "cinematic"),
+    # Group 3: Genre Styles
+    ("━━━ GENRE ━━━", "separator_3"),
+    ("  Sci-fi (Khoa học viễn tưởng)", "sci_fi"),
+    ("  Horror (Kinh dị)", "horror"),
+    ("  Fantasy (Thần thoại)", "fantasy"),
+    ("  Action (Hành động)", "action"),
+    ("  Romance (Lãng mạn)", "romance"),
+    ("  Comedy (Hài hước)", "comedy"),
+    # Group 4: Special Styles
+    ("━━━ SPECIAL ━━━", "separator_4"),
+    ("  Documentary (Phim tài liệu)", "documentary"),
+    ("  Film Noir (Đen trắng cổ điển)", "film_noir"),
+)
+
+
+def _build_style_model(parent):
+    """Build the video style model in one pass, separators disabled and greyed"""
+    model = QStandardItemModel(parent)
+    sep_bg = QColor("#2a2a2a")
+    sep_fg = QColor("#888888")
+    for text, key in _VIDEO_STYLES:
+        item = QStandardItem(text)
+        item.setData(key, Qt.UserRole)
+        if key.startswith("separator"):
+            # Make separator items non-selectable and style them differently
+            item.setEnabled(False)
+            item.setBackground(sep_bg)
+            item.setForeground(sep_fg)
+        model.appendRow(item)
+    return model
+
+
+@dataclass
+class _UIState:
+    """Video settings read from the panel widgets by _snapshot_ui_state"""
+    lang_code: str
+    ratio_key: str
+    ratio: str  # VIDEO_ASPECT_RATIO_* for ratio_key
+    style: str
+    tts_provider: str
+    voice_id: str
+    voice_name: str
+    domain: Optional[str]
+    topic: Optional[str]
+    prompt_quality: Optional[str]  # Passed to build_prompt_json; None while the quality box is hidden
+    quality: str
+    model_display: str
+    model_key: str
+    upscale_4k: bool
+    auto_download: bool
+
+
+def _build_video_scenes(rows, prompt_args, prompt_kwargs, aspect, stitch=False, log=None):
+    """Build the video worker's scene list (prompt JSON per row)
+
+    Runs on the VideoGenerationWorker thread via payload["build_scenes"], so it only
+    touches the plain data passed in, never widgets.
+
+    Args:
+        rows: [(scene_num, prompt_vi, prompt_tgt, scene dict or None), ...]
+        prompt_args: (lang_code, ratio_key, style) for build_prompt_json
+        prompt_kwargs: build_prompt_json keywords shared by every scene
+        aspect: VIDEO_ASPECT_RATIO_* value for each scene
+        stitch: Combine all scenes into a single prompt (single combined video mode)
+        log: Optional callable(str) for progress messages
+    """
+    log = log or (lambda msg: None)
+    scenes = []
+    for scene_num, vi, tgt, scene in rows:
+        location_ctx = None
+        dialogues = []
+        if scene is not None:
+            # Extract location context if extractor function is available
+            if extract_location_context:
+                location_ctx = extract_location_context(scene)
+            # Part G: Extract dialogues for voiceover
+            dialogues = scene.get("dialogues", [])
+        j = build_prompt_json(
+            scene_num, vi, tgt, *prompt_args,
+            location_context=location_ctx,
+            dialogues=dialogues,
+            **prompt_kwargs
+        )
+        scenes.append({
+            "prompt": json_dumps(j, indent=True),
+            "aspect": aspect,
+            "actual_scene_num": scene_num  # Include actual scene number for consistency
+        })
+
+    # Check if single combined video mode is enabled
+    if stitch and len(scenes) > 1:
+        log("[INFO] 🎬 Chế độ video đơn: Kết hợp tất cả cảnh thành 1 video...")
+        log(f"[INFO] Đang kết hợp {len(scenes)} cảnh bằng Google Labs Flow API...")
+        try:
+            # Combine all scene prompts into one
+            scene_prompts = [sc["prompt"] for sc in scenes]
+            combined_prompt = combine_scene_prompts_for_single_video(scene_prompts, max_duration=30.0)
+
+            # Replace multiple scenes with single combined scene
+            combined = [{
+                "prompt": json_dumps(combined_prompt, indent=True),
+                "aspect": scenes[0]["aspect"],  # Use aspect from first scene
+                "actual_scene_num": 1
+            }]
+            log(f"[INFO] ✅ Đã kết hợp {len(scenes)} cảnh thành 1 prompt duy nhất")
+            log("[INFO] Tạo 1 video thay vì nhiều video riêng lẻ")
+            return combined
+        except Exception as e:
+            log(f"[ERROR] Không thể kết hợp prompts: {str(e)}")
+            log("[INFO] Sẽ tạo video theo cách thông thường (nhiều cảnh riêng lẻ)")
+    return scenes
+
 class CollapsibleGroupBox(QGroupBox):
     """Collapsible group box"""
     def __init__(self, title="", parent=None, accordion_group=None):
@@ -143,9 +843,10 @@ class StoryboardView(QWidget):
         scroll.setWidgetResizable(True)
         scroll.setFrameShape(QFrame.NoFrame)
         scroll.setStyleSheet("QScrollArea { background: white; border: none; }")  # Enhanced: Ensure white bg
+        self.scroll = scroll
 
         self.container = QWidget()
-        self.container.setStyleSheet("QWidget { background: white; }")  # Enhanced: White background
+        self.container.setStyleSheet(_STORYBOARD_QSS)  # Enhanced: White background + all card styles
         self.grid_layout = QGridLayout(self.container)
         self.grid_layout.setSpacing(12)
         self.grid_layout.setContentsMargins(12, 12, 12, 12)
@@ -158,24 +859,98 @@ class StoryboardView(QWidget):
         main_layout.addWidget(scroll)
 
         self.scene_cards = {}
+        self._card_pool = []  # Cards released by clear(), rebound by add_scene
+        self._dir_listing = None  # {dir: {name: DirEntry}} while a bulk add is running
         self.num_columns = 3  # Default columns, will be recalculated
+        self._last_width = 0  # Container width num_columns was last computed for
+
+        # Decoded thumbnails are reused across storyboard rebuilds
+        QPixmapCache.setCacheLimit(PIXMAP_CACHE_LIMIT_KB)
+
+        # "No image" placeholder rendered once; cards blit it instead of laying out text per paint
+        self._placeholder_pm = self._build_placeholder_pixmap()
+
+        # Debounce relayout while the window is being drag-resized
+        self._resize_timer = QTimer(self)
+        self._resize_timer.setSingleShot(True)
+        self._resize_timer.timeout.connect(self._maybe_relayout)
+
+        # Thumbnails are decoded only once their card scrolls into view
+        self._visible_timer = QTimer(self)
+        self._visible_timer.setSingleShot(True)
+        self._visible_timer.timeout.connect(self._load_visible_thumbs)
+        scroll.verticalScrollBar().valueChanged.connect(self._schedule_visible_thumbs)
+        scroll.horizontalScrollBar().valueChanged.connect(self._schedule_visible_thumbs)
+
+        # Decode + scale runs on QThreadPool; the pixmap is built back on the GUI thread
+        self._thumb_signals = _ThumbLoadSignals(self)
+        self._thumb_signals.loaded.connect(self._on_thumb_loaded)
 
     def _calculate_columns(self):
         """Calculate optimal number of columns based on container width"""
         container_width = self.container.width()
-        if container_width <= 0:
-            return 3  # Default
-
         # Each card needs about 280px width + 12px spacing
         card_width = 280 + 12
+
+        # Not laid out yet (0 or a transient tiny width while the window is shown):
+        # keep the current count instead of clamping to 2 and relayouting again
+        # when the real width arrives
+        if container_width < card_width + 4:
+            return self.num_columns
+        if container_width == self._last_width:
+            return self.num_columns
+        self._last_width = container_width
+
         optimal_columns = max(1, container_width // card_width)
 
         # Limit to reasonable range (2-5 columns)
         return min(5, max(2, optimal_columns))
 
     def resizeEvent(self, event):
-        """Handle resize to adjust column count"""
+        """Handle resize to adjust column count (once the resize settles)"""
         super().resizeEvent(event)
+        self._resize_timer.start(80)
+        self._schedule_visible_thumbs()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._schedule_visible_thumbs()
+
+    def _schedule_visible_thumbs(self, *_):
+        """Check thumbnail visibility after the current layout pass"""
+        self._visible_timer.start(0)
+
+    def _load_visible_thumbs(self):
+        """Load pending thumbnails for cards that intersect the viewport"""
+        viewport = self.scroll.viewport()
+        visible = QRect(-self.container.x(), -self.container.y(), viewport.width(), viewport.height())
+        pool = QThreadPool.globalInstance()
+        for scene_num, card in self.scene_cards.items():
+            thumb_label = card.thumb_label
+            path = thumb_label._pending_path
+            if not path or not card.geometry().intersects(visible):
+                continue
+            thumb_label._pending_path = None
+            key = _thumb_cache_key(path, thumb_label._pending_mtime)
+            pixmap = QPixmapCache.find(key)
+            if pixmap is not None and not pixmap.isNull():
+                thumb_label.setPixmap(pixmap)
+            else:
+                thumb_label._loading_path = path
+                pool.start(_ThumbLoadTask(scene_num, path, key, self._thumb_signals))
+
+    def _on_thumb_loaded(self, scene_num, path, key, image):
+        """Convert a decoded thumbnail to a pixmap on the GUI thread and show it"""
+        pixmap = QPixmap.fromImage(image)
+        QPixmapCache.insert(key, pixmap)
+        card = self.scene_cards.get(scene_num)
+        # The card may have been cleared or rebuilt for another image meanwhile
+        if card is not None and card.thumb_label._loading_path == path:
+            card.thumb_label.setPixmap(pixmap)
+            card.thumb_label._loading_path = None
+
+    def _maybe_relayout(self):
+        """Relayout cards if the column count changed"""
         new_columns = self._calculate_columns()
         if new_columns != self.num_columns:
             self.num_columns = new_columns
@@ -186,18 +961,85 @@ class StoryboardView(QWidget):
         if not self.scene_cards:
             return
 
-        # Remove all widgets from layout
-        for i in reversed(range(self.grid_layout.count())):
-            item = self.grid_layout.itemAt(i)
-            if item and item.widget():
-                self.grid_layout.removeWidget(item.widget())
-
-        # Re-add cards with new layout
-        for scene_num in sorted(self.scene_cards.keys()):
+        # Move existing cards to their new cells. addWidget() on a widget already in
+        # this layout takes it out of its old cell first, so no separate removeWidget()
+        # pass is needed; updates are off so the moves are painted once
+        self.container.setUpdatesEnabled(False)
+        for scene_num, card in sorted(self.scene_cards.items()):
             idx = scene_num - 1
             row = idx // self.num_columns
             col = idx % self.num_columns
-            self.grid_layout.addWidget(self.scene_cards[scene_num], row, col)
+            self.grid_layout.addWidget(card, row, col)
+        self.container.setUpdatesEnabled(True)
+        self.container.update()
+        self._schedule_visible_thumbs()
+
+    @contextmanager
+    def bulk_add(self):
+        """Suspend repaint/relayout while many scenes are added or updated
+
+        Layout and repaint are re-enabled once on exit, also when the body raises.
+        """
+        self.container.setUpdatesEnabled(False)
+        self.grid_layout.setEnabled(False)
+        self._dir_listing = {}  # Never reuse a listing left over from an earlier add
+        try:
+            yield self
+        finally:
+            self.grid_layout.setEnabled(True)
+            self.grid_layout.activate()
+            self.container.setUpdatesEnabled(True)
+            self.container.updateGeometry()
+            self._dir_listing = None
+            self._schedule_visible_thumbs()
+
+    @staticmethod
+    def _build_placeholder_pixmap():
+        w, h = STORYBOARD_THUMB_SIZE
+        pm = QPixmap(w - 2, h - 2)  # Inside the label's 1px border
+        pm.fill(QColor("#F5F5F5"))
+        painter = QPainter(pm)
+        font = QFont("Segoe UI")
+        font.setPixelSize(11)
+        painter.setFont(font)
+        painter.setPen(QColor("#9E9E9E"))
+        painter.drawText(pm.rect(), Qt.AlignCenter, "🖼️\nChưa tạo ảnh")
+        painter.end()
+        return pm
+
+    def set_project_dir(self, path):
+        """List a project directory once for the current bulk add (call inside bulk_add())
+
+        Files under it are then looked up in the listing instead of stat'ed per card;
+        other directories are listed on first use.
+        """
+        if self._dir_listing is not None and path:
+            self._scan_dir(os.path.normpath(path))
+
+    def _scan_dir(self, d):
+        try:
+            with os.scandir(d or ".") as it:
+                listing = {entry.name: entry for entry in it}
+        except OSError:
+            listing = {}
+        self._dir_listing[d] = listing
+        return listing
+
+    def _file_mtime(self, path):
+        """mtime of path, or None if missing; uses the bulk-add directory listing when active"""
+        if not path:
+            return None
+        try:
+            if self._dir_listing is None:
+                return os.stat(path).st_mtime
+            d, name = os.path.split(os.path.normpath(path))
+            listing = self._dir_listing.get(d)
+            if listing is None:
+                listing = self._scan_dir(d)
+            entry = listing.get(name)
+            return entry.stat().st_mtime if entry is not None else None
+        except OSError:
+            return None
 
     def add_scene(self, scene_num, thumbnail_path, prompt_text, state_dict):
         # NEW: Calculate position based on current column count
@@ -205,22 +1047,43 @@ class StoryboardView(QWidget):
         row = idx // self.num_columns
         col = idx % self.num_columns
 
+        # Reuse a card released by clear() when possible; construction is the expensive part
+        card = self._card_pool.pop() if self._card_pool else self._create_card()
+        self._rebind(card, scene_num, thumbnail_path, prompt_text, state_dict)
+
+        self.grid_layout.addWidget(card, row, col)
+        card.show()
+        self.scene_cards[scene_num] = card
+        self._schedule_visible_thumbs()
+
+    def update_scene(self, scene_num, thumbnail_path, prompt_text, state_dict):
+        """Show a scene's current data, adding its card if the scene is new
+
+        An existing card stays in its grid cell and is only rebound (which is a no-op
+        when nothing shown on it changed).
+        """
+        card = self.scene_cards.get(scene_num)
+        if card is None:
+            self.add_scene(scene_num, thumbnail_path, prompt_text, state_dict)
+        else:
+            self._rebind(card, scene_num, thumbnail_path, prompt_text, state_dict)
+
+    def remove_scene(self, scene_num):
+        """Take a scene's card out of the grid and pool it for reuse"""
+        card = self.scene_cards.pop(scene_num, None)
+        if card is not None:
+            self.grid_layout.removeWidget(card)
+            card.hide()
+            self._card_pool.append(card)
+
+    def _create_card(self):
+        """Build an empty scene card; _rebind() fills it with a scene's data"""
         card = QFrame()
         card.setMinimumSize(240, 220)
         # Set flexible size policy for responsive scaling (no maximum size constraint)
-        card.setSizePolicy(QSizePolicy.Preferred, QSizePolicy.Fixed)
+        card.setSizePolicy(_CARD_SIZE_POLICY)
         card.setCursor(Qt.PointingHandCursor)
-        card.setStyleSheet("""
-            QFrame {
-                background: white;
-                border: 2px solid #E0E0E0;
-                border-radius: 8px;
-            }
-            QFrame:hover {
-                border: 2px solid #1E88E5;
-                background: #F8FCFF;
-            }
-        """)
+        card.setObjectName("sceneCard")
 
         card_layout = QVBoxLayout(card)
         card_layout.setSpacing(8)
@@ -230,164 +1093,199 @@ class StoryboardView(QWidget):
         thumb_label.setFixedSize(242, 136)
         thumb_label.setAlignment(Qt.AlignCenter)
         thumb_label.setCursor(Qt.PointingHandCursor)  # Enhanced: Clickable cursor
-        thumb_label.setStyleSheet("""
-            QLabel {
-                background: #F5F5F5; 
-                border: 1px solid #E0E0E0;
-                border-radius: 6px;
-                color: #9E9E9E;
-                font-size: 11px;
-            }
-            QLabel:hover {
-                border: 2px solid #1E88E5;
-                background: #E3F2FD;
-            }
-        """)
-
-        if thumbnail_path and os.path.exists(thumbnail_path):
-            pixmap = QPixmap(thumbnail_path).scaled(242, 136, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            thumb_label.setPixmap(pixmap)
-
-            # Enhanced: Make thumbnail clickable to play video
-            vids = state_dict.get('videos', {})
-            if vids:
-                first_video = list(vids.values())[0]
-                video_path = first_video.get('path', '')
-                if video_path and os.path.exists(video_path):
-                    # BUG FIX: Use main_panel reference instead of parent() to avoid AttributeError
-                    thumb_label.mousePressEvent = lambda e, path=video_path: self.main_panel._play_video(path)
-        else:
-            thumb_label.setText("🖼️\nChưa tạo ảnh")
+        thumb_label.setObjectName("sceneThumb")
 
+        # Enhanced: Make thumbnail clickable to play video
+        thumb_label.mousePressEvent = partial(self._on_thumb_click, card)
         card_layout.addWidget(thumb_label)
 
-        title_label = QLabel(f"<b style='color:#1E88E5; font-size:14px;'>🎬 Cảnh {scene_num}</b>")
+        title_label = QLabel()
         title_label.setAlignment(Qt.AlignCenter)
         card_layout.addWidget(title_label)
 
-        preview_text = prompt_text[:50] + "..." if len(prompt_text) > 50 else prompt_text
-        desc_label = QLabel(preview_text)
+        desc_label = QLabel()
         desc_label.setWordWrap(True)
         desc_label.setAlignment(Qt.AlignCenter)
-        desc_label.setFont(QFont("Segoe UI", 10))  # Enhanced: Size 10
-        desc_label.setStyleSheet("color: #757575;")
+        desc_label.setFont(FONT_CARD_DESC)  # Enhanced: Size 10
+        desc_label.setObjectName("sceneDesc")
         desc_label.setMaximumHeight(40)
         card_layout.addWidget(desc_label)
 
-        vids = state_dict.get('videos', {})
-        if vids:
-            completed = sum(1 for v in vids.values() if v.get('status') in ('DOWNLOADED', 'COMPLETED', 'UPSCALED_4K'))
-            failed = sum(1 for v in vids.values() if v.get('status') in ('FAILED', 'ERROR', 'FAILED_START', 'DONE_NO_URL', 'DOWNLOAD_FAILED'))
-            total = len(vids)
-
-            # Status label with color coding
-            if failed > 0:
-                status_label = QLabel(f"❌ {failed} failed, {completed}/{total} OK")
-                status_label.setStyleSheet("color: #E53935; font-weight: bold;")
-            else:
-                status_label = QLabel(f"🎥 {completed}/{total} videos")
-                status_label.setStyleSheet("color: #4CAF50; font-weight: bold;")
+        # Status label with color coding (object name picks the color)
+        status_label = QLabel()
+        status_label.setAlignment(Qt.AlignCenter)
+        status_label.setFont(FONT_CARD_STATUS)
+        card_layout.addWidget(status_label)
+
+        # BUG FIX #3: Add retry button for failed videos
+        retry_btn = QPushButton()
+        retry_btn.setIcon(_emoji_icon("🔄"))
+        retry_btn.setMinimumHeight(28)
+        retry_btn.setObjectName("sceneRetryBtn")
+        retry_btn.clicked.connect(partial(self._on_retry, card))
+        card_layout.addWidget(retry_btn)
+
+        # Issue #3: Add regenerate button to Storyboard (always visible when videos exist)
+        regen_btn = QPushButton("Tạo lại video")
+        regen_btn.setIcon(_emoji_icon("🔁"))
+        regen_btn.setMinimumHeight(28)
+        regen_btn.setObjectName("sceneRegenBtn")
+        regen_btn.clicked.connect(partial(self._on_regen, card))
+        card_layout.addWidget(regen_btn)
+
+        # No videos yet - show a "Generate Video" button
+        gen_btn = QPushButton("Tạo Video")
+        gen_btn.setIcon(_emoji_icon("🎬"))
+        gen_btn.setMinimumHeight(28)
+        gen_btn.setObjectName("sceneGenBtn")
+        gen_btn.clicked.connect(partial(self._on_gen, card))
+        card_layout.addWidget(gen_btn)
+
+        card.mousePressEvent = partial(self._on_card_click, card)
+
+        card.scene_num = None
+        card.video_path = None
+        card._render_sig = None  # Inputs of the last _rebind, to skip identical rebinds
+        card.thumb_label = thumb_label
+        card.title_label = title_label
+        card.desc_label = desc_label
+        card.status_label = status_label
+        card.retry_btn = retry_btn
+        card.regen_btn = regen_btn
+        card.gen_btn = gen_btn
+        return card
+
+    # Card slots are bound once per card with partial(); they read the scene the card
+    # currently shows, so recycled cards need no reconnecting
+
+    def _on_card_click(self, card, e):
+        self.scene_clicked.emit(card.scene_num)
+
+    def _on_thumb_click(self, card, e):
+        if card.video_path:
+            # BUG FIX: Use main_panel reference instead of parent() to avoid AttributeError
+            self.main_panel._play_video(card.video_path)
+        else:
+            e.ignore()  # Let the click reach the card
+
+    def _on_retry(self, card, checked=False):
+        # FIX: Add logging and proper connection with error handling
+        scene_num = card.scene_num
+        print(f"[DEBUG] Retry button clicked for scene {scene_num}")
+        if hasattr(self.main_panel, '_retry_failed_scene'):
+            self.main_panel._append_log(f"[INFO] 🔄 Retry button clicked for scene {scene_num}")
+            self.main_panel._retry_failed_scene(scene_num)
+        else:
+            print("[ERROR] main_panel does not have _retry_failed_scene method!")
+
+    def _on_regen(self, card, checked=False):
+        scene_num = card.scene_num
+        print(f"[DEBUG] Regenerate button clicked for scene {scene_num}")
+        if hasattr(self.main_panel, '_regenerate_scene_video'):
+            self.main_panel._append_log(f"[INFO] 🔁 Regenerate button clicked for scene {scene_num}")
+            self.main_panel._regenerate_scene_video(scene_num)
+        else:
+            print("[ERROR] main_panel does not have _regenerate_scene_video method!")
+
+    def _on_gen(self, card, checked=False):
+        # Generate uses the same regenerate method
+        scene_num = card.scene_num
+        print(f"[DEBUG] Generate button clicked for scene {scene_num}")
+        if hasattr(self.main_panel, '_regenerate_scene_video'):
+            self.main_panel._append_log(f"[INFO] 🎬 Generate button clicked for scene {scene_num}")
+            self.main_panel._regenerate_scene_video(scene_num)
+        else:
+            print("[ERROR] main_panel does not have _regenerate_scene_video method!")
 
-            status_label.setAlignment(Qt.AlignCenter)
-            status_label.setFont(QFont("Segoe UI", 10, QFont.Bold))
-            card_layout.addWidget(status_label)
+    def _rebind(self, card, scene_num, thumbnail_path, prompt_text, state_dict):
+        """Fill a new or recycled card with one scene's thumbnail, text and buttons
 
-            # BUG FIX #3: Add retry button for failed videos
-            if failed > 0:
-                retry_btn = QPushButton(f"🔄 Retry ({failed})")
-                retry_btn.setMinimumHeight(28)
-                retry_btn.setStyleSheet("""
-                    QPushButton {
-                        background: #FF9800;
-                        color: white;
-                        border: none;
-                        border-radius: 4px;
-                        font-weight: bold;
-                        font-size: 11px;
-                        padding: 4px 8px;
-                    }
-                    QPushButton:hover { background: #F57C00; }
-                """)
-
-                # FIX: Add logging and proper connection with error handling
-                def on_retry_click():
-                    print(f"[DEBUG] Retry button clicked for scene {scene_num}")
-                    if hasattr(self.main_panel, '_retry_failed_scene'):
-                        self.main_panel._append_log(f"[INFO] 🔄 Retry button clicked for scene {scene_num}")
-                        self.main_panel._retry_failed_scene(scene_num)
-                    else:
-                        print("[ERROR] main_panel does not have _retry_failed_scene method!")
-
-                retry_btn.clicked.connect(on_retry_click)
-                card_layout.addWidget(retry_btn)
-            
-            # Issue #3: Add regenerate button to Storyboard (always visible, not just for failed)
-            regen_btn = QPushButton("🔁 Tạo lại video")
-            regen_btn.setMinimumHeight(28)
-            regen_btn.setStyleSheet("""
-                QPushButton {
-                    background: #2196F3;
-                    color: white;
-                    border: none;
-                    border-radius: 4px;
-                    font-weight: bold;
-                    font-size: 11px;
-                    padding: 4px 8px;
-                }
-                QPushButton:hover { background: #1976D2; }
-            """)
-
-            # Connect to regenerate method
-            def on_regenerate_click():
-                print(f"[DEBUG] Regenerate button clicked for scene {scene_num}")
-                if hasattr(self.main_panel, '_regenerate_scene_video'):
-                    self.main_panel._append_log(f"[INFO] 🔁 Regenerate button clicked for scene {scene_num}")
-                    self.main_panel._regenerate_scene_video(scene_num)
-                else:
-                    print("[ERROR] main_panel does not have _regenerate_scene_video method!")
+        Skipped when the card already shows exactly this scene state (same text, same
+        thumbnail/video files, same per-copy status), which is the common case when
+        the storyboard is refreshed after a single status change.
+        """
+        # One lookup gives both existence and the mtime for the pixmap cache key
+        thumb_mtime = self._file_mtime(thumbnail_path)
+        vids = state_dict.get('videos', {})
+        first_video_path = next(iter(vids.values())).get('path', '') if vids else ''
+        video_mtime = self._file_mtime(first_video_path) if first_video_path else None
+        sig = (
+            scene_num, prompt_text, thumbnail_path, thumb_mtime, first_video_path, video_mtime,
+            tuple((c, v.get('status'), v.get('path')) for c, v in vids.items()),
+        )
+        if card._render_sig == sig:
+            return
+        card._render_sig = sig
 
-            regen_btn.clicked.connect(on_regenerate_click)
-            card_layout.addWidget(regen_btn)
+        card.scene_num = scene_num
+        card.video_path = None
+
+        thumb_label = card.thumb_label
+        thumb_label.clear()
+        thumb_label._pending_path = None
+        thumb_label._loading_path = None
+        if thumb_mtime is not None:
+            # Decoded lazily by _load_visible_thumbs once the card is on screen
+            thumb_label._pending_path = thumbnail_path
+            thumb_label._pending_mtime = thumb_mtime
+
+            # Enhanced: Thumbnail click plays the first video
+            if video_mtime is not None:
+                card.video_path = first_video_path
         else:
-            # No videos yet - show a "Generate Video" button
-            gen_btn = QPushButton("🎬 Tạo Video")
-            gen_btn.setMinimumHeight(28)
-            gen_btn.setStyleSheet("""
-                QPushButton {
-                    background: #4CAF50;
-                    color: white;
-                    border: none;
-                    border-radius: 4px;
-                    font-weight: bold;
-                    font-size: 11px;
-                    padding: 4px 8px;
-                }
-                QPushButton:hover { background: #388E3C; }
-            """)
-
-            # Connect to regenerate method (same as generate)
-            def on_generate_click():
-                print(f"[DEBUG] Generate button clicked for scene {scene_num}")
-                if hasattr(self.main_panel, '_regenerate_scene_video'):
-                    self.main_panel._append_log(f"[INFO] 🎬 Generate button clicked for scene {scene_num}")
-                    self.main_panel._regenerate_scene_video(scene_num)
-                else:
-                    print("[ERROR] main_panel does not have _regenerate_scene_video method!")
+            thumb_label.setPixmap(self._placeholder_pm)
 
-            gen_btn.clicked.connect(on_generate_click)
-            card_layout.addWidget(gen_btn)
+        card.title_label.setText(f"<b style='color:#1E88E5; font-size:14px;'>🎬 Cảnh {scene_num}</b>")
 
-        card.scene_num = scene_num
-        card.mousePressEvent = lambda e: self.scene_clicked.emit(scene_num)
+        global _desc_metrics
+        if _desc_metrics is None:
+            _desc_metrics = QFontMetrics(FONT_CARD_DESC)
+        # Pixel-based truncation: correct for wide/multibyte text where a 50-char cut is not
+        preview_text = _desc_metrics.elidedText(prompt_text, Qt.ElideRight, _DESC_ELIDE_WIDTH)
+        card.desc_label.setText(preview_text)
 
-        self.grid_layout.addWidget(card, row, col)
-        self.scene_cards[scene_num] = card
+        if vids:
+            completed = failed = 0
+            for v in vids.values():
+                status = v.get('status')
+                if status in _COMPLETED_STATUSES:
+                    completed += 1
+                elif status in _FAILED_STATUSES:
+                    failed += 1
+            total = len(vids)
+
+            status_label = card.status_label
+            if failed > 0:
+                status_label.setText(f"❌ {failed} failed, {completed}/{total} OK")
+                status_name = "sceneStatusFailed"
+            else:
+                status_label.setText(f"🎥 {completed}/{total} videos")
+                status_name = "sceneStatusOk"
+            if status_label.objectName() != status_name:
+                # Re-polish so the container stylesheet picks up the new selector
+                status_label.setObjectName(status_name)
+                status_label.style().unpolish(status_label)
+                status_label.style().polish(status_label)
+            status_label.show()
+
+            card.retry_btn.setText(f"Retry ({failed})")
+            card.retry_btn.setVisible(failed > 0)
+            card.regen_btn.show()
+            card.gen_btn.hide()
+        else:
+            card.status_label.hide()
+            card.retry_btn.hide()
+            card.regen_btn.hide()
+            card.gen_btn.show()
 
     def clear(self):
-        while self.grid_layout.count():
-            item = self.grid_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
+        """Remove all cards from the grid, keeping them pooled for reuse by add_scene"""
+        # Pooled in reverse so add_scene's pop() hands each scene its previous card,
+        # letting _rebind skip cards whose scene has not changed
+        for card in reversed(list(self.scene_cards.values())):
+            self.grid_layout.removeWidget(card)
+            card.hide()
+            self._card_pool.append(card)
         self.scene_cards.clear()
 
 class Text2VideoPanelV5(QWidget):
@@ -403,7 +1301,56 @@ class Text2VideoPanelV5(QWidget):
         self._character_bible = None
         self._script_data = None
         self.worker = None
-        self.thread = None
+        # Script/video workers can poll for many minutes, so they get their own pool
+        # instead of tying up the global one used by thumbnail, prompt-save and voice
+        # tasks; held in _active_workers until job_finished fires
+        self._worker_pool = QThreadPool(self)
+        self._worker_pool.setMaxThreadCount(_MAX_CONCURRENT_WORKERS)
+        self._active_workers = set()
+
+        # Log lines are buffered and written to the console in one append per tick.
+        # The timer runs continuously so _append_log never has to start it; together
+        # with the popleft() drain in _flush_log this keeps _append_log safe to call
+        # from worker threads.
+        self._log_buffer = deque(maxlen=_LOG_MAX_LINES)
+        self._log_timer = QTimer(self)
+        self._log_timer.setInterval(50)
+        self._log_timer.timeout.connect(self._flush_log)
+        self._log_timer.start()
+
+        # Voice slider labels are refreshed once per frame while a slider is dragged,
+        # not on every valueChanged step
+        self._slider_timer = QTimer(self)
+        self._slider_timer.setSingleShot(True)
+        self._slider_timer.setInterval(16)
+        self._slider_timer.timeout.connect(self._update_slider_labels)
+
+        # Last progress value painted, for throttling _on_progress_update
+        self._last_progress_pct = -1
+        self._last_progress_ts = 0.0
+
+        # Per-scene prompt files are written by _SavePromptTask on the thread pool
+        self._save_signals = _SavePromptSignals(self)
+        self._save_signals.log.connect(self._append_log)
+
+        # Result-tab repopulation deferred while that tab is hidden: {tab page: callable}
+        self._pending_tab_updates = {}
+
+        # {path: time it was last seen on disk} for _isfile_cached
+        self._file_exists_cache = {}
+
+        # Scenes whose job card changed since the last _flush_card_updates
+        self._dirty_scenes = set()
+        self._card_flush_scheduled = False
+        self._social_cards = []  # Widgets of the shown social versions, refilled on regenerate
+
+        # Voice lists are fetched by _LoadVoicesTask; only the newest request is applied
+        self._voices_request_id = 0
+        self._voices_key = None  # (provider, language) of the last requested voice list
+        self._voice_ids = None  # Voice ids currently in cb_voice
+        self._voices_signals = _LoadVoicesSignals(self)
+        self._voices_signals.voices_ready.connect(self._apply_voices)
+        self._voices_signals.failed.connect(self._on_voices_failed)
 
         self._build_ui()
         self._apply_styles()
@@ -432,16 +1379,7 @@ class Text2VideoPanelV5(QWidget):
         self.ed_project = QLineEdit()
         self.ed_project.setPlaceholderText("Nhập tên dự án (để trống sẽ tự tạo)")
         self.ed_project.setMinimumHeight(36)
-        self.ed_project.setStyleSheet("""
-            QLineEdit {
-                background: white;
-                border: 2px solid #BDBDBD;
-                border-radius: 6px;
-                padding: 8px 12px;
-                font-size: 13px;
-            }
-            QLineEdit:focus { border: 2px solid #1E88E5; }
-        """)
+        self.ed_project.setObjectName("projectEdit")
         project_layout.addWidget(self.ed_project)
 
         lbl = QLabel("Ý tưởng (đoạn văn):")
@@ -454,16 +1392,7 @@ class Text2VideoPanelV5(QWidget):
         self.ed_idea.setPlaceholderText("Nhập ý tưởng thô (<10 từ)…")
         self.ed_idea.setMinimumHeight(150)  # 6 lines
         self.ed_idea.setMaximumHeight(180)
-        self.ed_idea.setStyleSheet("""
-            QTextEdit {
-                background: white;
-                border: 2px solid #BDBDBD;
-                border-radius: 6px;
-                padding: 10px;
-                font-size: 13px;
-            }
-            QTextEdit:focus { border: 2px solid #1E88E5; }
-        """)
+        self.ed_idea.setObjectName("ideaEdit")
         project_layout.addWidget(self.ed_idea)
 
         # Expert label
@@ -476,12 +1405,10 @@ class Text2VideoPanelV5(QWidget):
         lbl = QLabel("Lĩnh vực:")
         lbl.setFont(FONT_H2)
         row_dt.addWidget(lbl)
-        self.cb_domain = QComboBox()
+        # Domains are added on first open; only the placeholder is needed at startup
+        self.cb_domain = _LazyComboBox(_add_domain_items)
         self.cb_domain.setMinimumHeight(32)
         self.cb_domain.addItem("(Không chọn)", "")
-        if get_all_domains:
-            for domain in get_all_domains():
-                self.cb_domain.addItem(domain, domain)
         row_dt.addWidget(self.cb_domain, 1)
         
         row_dt.addSpacing(12)
@@ -524,51 +1451,11 @@ class Text2VideoPanelV5(QWidget):
         row1.addWidget(lbl)
         self.cb_style = QComboBox()
         self.cb_style.setMinimumHeight(32)
-
-        # Group 1: Animation Styles
-        self.cb_style.addItem("━━━ ANIMATION ━━━", "separator_1")
-        self.cb_style.addItem("  Anime 2D (Phẳng, viền đậm)", "anime_2d")
-        self.cb_style.addItem("  Anime Cinematic (Anime + Điện ảnh)", "anime_cinematic")
-        self.cb_style.addItem("  Pixar 3D (Phong cách Pixar)", "pixar_3d")
-        self.cb_style.addItem("  Disney 3D (Phong cách Disney)", "disney_3d")
-        self.cb_style.addItem("  DreamWorks 3D (Phong cách DreamWorks)", "dreamworks_3d")
-        self.cb_style.addItem("  Illumination 3D (Minions style)", "illumination_3d")
-        self.cb_style.addItem("  Studio Ghibli 3D (Ghibli 3D)", "ghibli_3d")
-
-        # Group 2: Realistic Styles
-        self.cb_style.addItem("━━━ REALISTIC ━━━", "separator_2")
-        self.cb_style.addItem("  Realistic (Chân thực)", "realistic")
-        self.cb_style.addItem("  Cinematic (Điện ảnh)", "cinematic")
-
-        # Group 3: Genre Styles
-        self.cb_style.addItem("━━━ GENRE ━━━", "separator_3")
-        self.cb_style.addItem("  Sci-fi (Khoa học viễn tưởng)", "sci_fi")
-        self.cb_style.addItem("  Horror (Kinh dị)", "horror")
-        self.cb_style.addItem("  Fantasy (Thần thoại)", "fantasy")
-        self.cb_style.addItem("  Action (Hành động)", "action")
-        self.cb_style.addItem("  Romance (Lãng mạn)", "romance")
-        self.cb_style.addItem("  Comedy (Hài hước)", "comedy")
-
-        # Group 4: Special Styles
-        self.cb_style.addItem("━━━ SPECIAL ━━━", "separator_4")
-        self.cb_style.addItem("  Documentary (Phim tài liệu)", "documentary")
-        self.cb_style.addItem("  Film Noir (Đen trắng cổ điển)", "film_noir")
+        self.cb_style.setModel(_build_style_model(self.cb_style))
 
         # Set default to Anime 2D (index 1, after first separator)
         self.cb_style.setCurrentIndex(1)
 
-        # Disable separator items so they can't be selected
-        for i in range(self.cb_style.count()):
-            item_data = self.cb_style.itemData(i)
-            if item_data and str(item_data).startswith("separator"):
-                # Make separator items non-selectable
-                item_model = self.cb_style.model()
-                item = item_model.item(i)
-                item.setEnabled(False)
-                # Style separator items differently
-                item.setBackground(QColor("#2a2a2a"))
-                item.setForeground(QColor("#888888"))
-
         row1.addWidget(self.cb_style, 1)
 
         row1.addSpacing(12)
@@ -678,13 +1565,7 @@ class Text2VideoPanelV5(QWidget):
         scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAsNeeded)
         scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         scroll_area.setMaximumHeight(100)
-        scroll_area.setStyleSheet("""
-            QScrollArea {
-                border: 1px solid #ccc;
-                border-radius: 4px;
-                background: #f9f9f9;
-            }
-        """)
+        scroll_area.setObjectName("charRefScroll")
         
         scroll_container = QWidget()
         self.char_ref_thumb_container = QHBoxLayout(scroll_container)
@@ -753,7 +1634,7 @@ class Text2VideoPanelV5(QWidget):
 
         # Style description
         self.lbl_style_description = QLabel("Giọng sinh động, có cảm xúc")
-        self.lbl_style_description.setStyleSheet("font-size: 11px; color: #666;")
+        self.lbl_style_description.setObjectName("styleDescription")
         self.lbl_style_description.setWordWrap(True)
         voice_layout.addWidget(self.lbl_style_description)
 
@@ -822,64 +1703,26 @@ class Text2VideoPanelV5(QWidget):
         hb = QHBoxLayout()
         self.btn_auto = QPushButton("⚡ Tạo video tự động (3 bước)")
         self.btn_auto.setMinimumHeight(48)
-        self.btn_auto.setStyleSheet("""
-            QPushButton {
-                background: #FF6B35;
-                color: white;
-                border: none;
-                border-radius: 24px;
-                font-weight: 700;
-                font-size: 15px;
-            }
-            QPushButton:hover { background: #FF8555; }
-        """)
+        self.btn_auto.setObjectName("btnAuto")
         hb.addWidget(self.btn_auto)
 
         self.btn_stop = QPushButton("⏹ Dừng")
         self.btn_stop.setMinimumHeight(48)
         self.btn_stop.setMaximumWidth(80)
         self.btn_stop.setEnabled(False)
-        self.btn_stop.setStyleSheet("""
-            QPushButton {
-                background: #E0E0E0;
-                color: #616161;
-                border: none;
-                border-radius: 24px;
-                font-weight: 700;
-            }
-            QPushButton:disabled { background: #F5F5F5; color: #BDBDBD; }
-        """)
+        self.btn_stop.setObjectName("btnStop")
         hb.addWidget(self.btn_stop)
         colL.addLayout(hb)
 
         self.btn_open_folder = QPushButton("📁 Mở thư mục dự án")
         self.btn_open_folder.setMinimumHeight(40)
-        self.btn_open_folder.setStyleSheet("""
-            QPushButton {
-                background: #1E88E5;
-                color: white;
-                border: none;
-                border-radius: 20px;
-                font-weight: 700;
-            }
-            QPushButton:hover { background: #2196F3; }
-        """)
+        self.btn_open_folder.setObjectName("btnOpenFolder")
         colL.addWidget(self.btn_open_folder)
 
         self.btn_clear_project = QPushButton("🔄 Tạo dự án mới")
         self.btn_clear_project.setMinimumHeight(40)
         self.btn_clear_project.setEnabled(False)
-        self.btn_clear_project.setStyleSheet("""
-            QPushButton {
-                background: #E0E0E0;
-                color: #616161;
-                border: none;
-                border-radius: 20px;
-                font-weight: 700;
-            }
-            QPushButton:hover { background: #EEEEEE; }
-            QPushButton:disabled { background: #F5F5F5; color: #BDBDBD; }
-        """)
+        self.btn_clear_project.setObjectName("btnClearProject")
         colL.addWidget(self.btn_clear_project)
 
         # PROGRESS UI - PR#7: Progress label, bar and cancel button
@@ -894,17 +1737,7 @@ class Text2VideoPanelV5(QWidget):
         self.cancel_video_button.setMaximumWidth(100)
         self.cancel_video_button.setMinimumHeight(32)
         self.cancel_video_button.setVisible(False)
-        self.cancel_video_button.setStyleSheet("""
-            QPushButton {
-                background: #E0E0E0;
-                color: #616161;
-                border: none;
-                border-radius: 16px;
-                font-weight: 700;
-                font-size: 12px;
-            }
-            QPushButton:hover { background: #BDBDBD; }
-        """)
+        self.cancel_video_button.setObjectName("btnCancelVideo")
         progress_layout.addWidget(self.cancel_video_button)
         colL.addLayout(progress_layout)
 
@@ -916,20 +1749,7 @@ class Text2VideoPanelV5(QWidget):
         self.progress_bar.setTextVisible(True)
         self.progress_bar.setFormat("%p% - Đang xử lý...")
         self.progress_bar.setMinimumHeight(32)
-        self.progress_bar.setStyleSheet("""
-            QProgressBar {
-                border: 2px solid #4CAF50;
-                border-radius: 5px;
-                text-align: center;
-                background-color: #E8F5E9;
-                font-weight: bold;
-                font-size: 12px;
-            }
-            QProgressBar::chunk {
-                background-color: #4CAF50;
-                border-radius: 3px;
-            }
-        """)
+        self.progress_bar.setObjectName("progressBar")
         colL.addWidget(self.progress_bar)
 
         # === RIGHT COLUMN (2/3) ===
@@ -944,6 +1764,10 @@ class Text2VideoPanelV5(QWidget):
             "Tỉ lệ", "Thời lượng (s)", "Xem"
         ])
         self.table.horizontalHeader().setStretchLastSection(True)
+        # "Xem" column: one painting delegate instead of a QPushButton per row
+        self._view_btn_delegate = _ViewButtonDelegate("Xem", self.table)
+        self._view_btn_delegate.clicked.connect(self._open_prompt_view)
+        self.table.setItemDelegateForColumn(5, self._view_btn_delegate)
         self.table.setHidden(True)
         colR.addWidget(self.table, 0)
 
@@ -955,7 +1779,7 @@ class Text2VideoPanelV5(QWidget):
         script_widget = QWidget()
         script_layout = QVBoxLayout(script_widget)
         script_layout.setContentsMargins(8, 8, 8, 8)
-        self.view_story = QTextEdit()
+        self.view_story = QPlainTextEdit()
         self.view_story.setReadOnly(True)
         self.view_story.setPlaceholderText(
             "Kịch bản chi tiết sẽ hiển thị ở đây sau khi tạo"
@@ -972,24 +1796,13 @@ class Text2VideoPanelV5(QWidget):
         self.btn_generate_bible = QPushButton("✨ Tạo Character Bible")
         self.btn_generate_bible.setMinimumHeight(36)
         self.btn_generate_bible.setEnabled(False)
-        self.btn_generate_bible.setStyleSheet("""
-            QPushButton {
-                background: #1E88E5;
-                color: white;
-                border: none;
-                border-radius: 18px;
-                font-weight: 700;
-            }
-            QPushButton:hover { background: #2196F3; }
-            QPushButton:disabled { background: #CCCCCC; }
-        """)
+        self.btn_generate_bible.setObjectName("btnGenerateBible")
         bible_btn_row.addWidget(self.btn_generate_bible)
         bible_btn_row.addStretch()
         bible_layout.addLayout(bible_btn_row)
 
-        self.view_bible = QTextEdit()
+        self.view_bible = QPlainTextEdit()
         self.view_bible.setReadOnly(False)
-        self.view_bible.setAcceptRichText(False)
         self.view_bible.setPlaceholderText(
             "Character Bible sẽ hiển thị ở đây sau khi tạo..."
         )
@@ -1006,40 +1819,24 @@ class Text2VideoPanelV5(QWidget):
         toggle_layout = QHBoxLayout(toggle_widget)
         toggle_layout.setContentsMargins(8, 8, 8, 8)
         toggle_layout.setSpacing(8)
+        toggle_widget.setStyleSheet(_TOGGLE_BTN_QSS)  # Inherited by both toggle buttons
+        toggle_group = QButtonGroup(toggle_widget)
+        toggle_group.setExclusive(True)
 
         self.btn_view_card = QPushButton("📇 Card")
         self.btn_view_card.setCheckable(True)
         self.btn_view_card.setChecked(True)
         self.btn_view_card.setFixedHeight(34)
         self.btn_view_card.setFixedWidth(100)
-        self.btn_view_card.setStyleSheet("""
-            QPushButton {
-                background: white;
-                border: 2px solid #BDBDBD;
-                border-radius: 6px;
-                font-size: 13px;
-                font-weight: 600;
-                color: #424242;
-            }
-            QPushButton:checked {
-                background: #1E88E5;
-                border: 2px solid #1E88E5;
-                color: white;
-                font-weight: 700;
-            }
-            QPushButton:hover { 
-                border: 2px solid #1E88E5;
-                color: #1E88E5;
-            }
-        """)
         self.btn_view_card.clicked.connect(lambda: self._switch_view('card'))
+        toggle_group.addButton(self.btn_view_card)
 
         self.btn_view_storyboard = QPushButton("📊 Storyboard")
         self.btn_view_storyboard.setCheckable(True)
         self.btn_view_storyboard.setFixedHeight(34)
         self.btn_view_storyboard.setFixedWidth(120)
-        self.btn_view_storyboard.setStyleSheet(self.btn_view_card.styleSheet())
         self.btn_view_storyboard.clicked.connect(lambda: self._switch_view('storyboard'))
+        toggle_group.addButton(self.btn_view_storyboard)
 
         toggle_layout.addWidget(self.btn_view_card)
         toggle_layout.addWidget(self.btn_view_storyboard)
@@ -1057,6 +1854,8 @@ class Text2VideoPanelV5(QWidget):
         card_scroll.setFrameShape(QFrame.NoFrame)
 
         card_container = QWidget()
+        card_container.setStyleSheet(SCENE_CARD_QSS)  # Styles every SceneResultCard added below
+        self._card_container = card_container
         self.cards_layout = QVBoxLayout(card_container)
         self.cards_layout.setContentsMargins(16, 16, 16, 16)
         self.cards_layout.setSpacing(8)
@@ -1065,14 +1864,10 @@ class Text2VideoPanelV5(QWidget):
         card_scroll.setWidget(card_container)
         self.view_stack.addWidget(card_scroll)
 
-        # Keep reference to scene cards
+        # Keep reference to scene cards (the ones in use) and to every card built so far,
+        # which are reused in order by later script generations
         self.scene_cards = []
-
-        # Keep old QListWidget for backward compatibility (hidden)
-        self.cards = QListWidget()
-        self.cards.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        self.cards.setIconSize(QSize(240, 135))
-        self.cards.itemDoubleClicked.connect(self._open_card_prompt_detail)
+        self._scene_card_pool = []
 
         # Storyboard view (new)
         self.storyboard_view = StoryboardView(self)
@@ -1085,12 +1880,13 @@ class Text2VideoPanelV5(QWidget):
 
         scenes_layout.addWidget(self.view_stack)
         self.result_tabs.addTab(scenes_widget, "🎬 Kết quả cảnh")
+        self._scenes_tab = scenes_widget
 
         # Tab 4: Thumbnail
         thumbnail_widget = QWidget()
         thumbnail_layout = QVBoxLayout(thumbnail_widget)
         thumbnail_layout.setContentsMargins(4, 4, 4, 4)
-        self.thumbnail_display = QTextEdit()
+        self.thumbnail_display = QPlainTextEdit()
         self.thumbnail_display.setReadOnly(True)
         self.thumbnail_display.setPlaceholderText(
             "Thumbnail preview sẽ hiển thị ở đây"
@@ -1110,6 +1906,7 @@ class Text2VideoPanelV5(QWidget):
         scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
 
         self.social_content_widget = QWidget()
+        self.social_content_widget.setStyleSheet(_SOCIAL_QSS)  # Styles every version card
         self.social_content_layout = QVBoxLayout(self.social_content_widget)
         self.social_content_layout.setContentsMargins(4, 4, 4, 4)
         self.social_content_layout.setSpacing(12)
@@ -1117,52 +1914,37 @@ class Text2VideoPanelV5(QWidget):
         # Placeholder label
         self.social_placeholder = QLabel("Social media content sẽ hiển thị ở đây sau khi tạo kịch bản...")
         self.social_placeholder.setAlignment(Qt.AlignCenter)
-        self.social_placeholder.setStyleSheet("color: #999; font-size: 13px; padding: 40px;")
+        self.social_placeholder.setObjectName("socialPlaceholder")
         self.social_content_layout.addWidget(self.social_placeholder)
         self.social_content_layout.addStretch()
 
         scroll.setWidget(self.social_content_widget)
         social_layout.addWidget(scroll)
         self.result_tabs.addTab(social_widget, "📱 Social")
+        self._social_tab = social_widget
 
         # Tab 6: History - Video creation history
         if HistoryWidget:
-            self.history_widget = HistoryWidget(panel_type="text2video", parent=self)
-            self.result_tabs.addTab(self.history_widget, "📜 Lịch sử")
+            # HistoryWidget reads the history file when constructed; build it the first
+            # time the tab is opened (_ensure_history_widget) so startup skips that I/O
+            self._history_page = QWidget()
+            self._history_layout = QVBoxLayout(self._history_page)
+            self._history_layout.setContentsMargins(0, 0, 0, 0)
+            self.result_tabs.addTab(self._history_page, "📜 Lịch sử")
+            self.history_widget = None
         else:
             # Placeholder if HistoryWidget is not available
             history_placeholder = QWidget()
             history_placeholder_layout = QVBoxLayout(history_placeholder)
             placeholder_label = QLabel("⚠️ Lịch sử không khả dụng")
             placeholder_label.setAlignment(Qt.AlignCenter)
-            placeholder_label.setStyleSheet("color: #999; font-size: 13px;")
+            placeholder_label.setObjectName("tabPlaceholder")
             history_placeholder_layout.addWidget(placeholder_label)
             self.result_tabs.addTab(history_placeholder, "📜 Lịch sử")
             self.history_widget = None
 
-        # OCEAN BLUE STYLING
-        self.result_tabs.setStyleSheet("""
-            QTabBar::tab {
-                min-width: 140px;
-                padding: 12px 18px;
-                font-weight: 700;
-                border-top-left-radius: 8px;
-                border-top-right-radius: 8px;
-                margin-right: 3px;
-            }
-            QTabBar::tab:selected {
-                background: #00ACC1;
-                color: white;
-                border-bottom: 4px solid #00838F;
-            }
-            QTabBar::tab:!selected {
-                background: #F5F5F5;
-                color: #616161;
-            }
-            QTabBar::tab:hover {
-                background: #B2EBF2;
-            }
-        """)
+        # OCEAN BLUE STYLING (tab rules live in _PANEL_QSS)
+        self.result_tabs.setObjectName("resultTabs")
 
         colR.addWidget(self.result_tabs, 1)
 
@@ -1171,20 +1953,14 @@ class Text2VideoPanelV5(QWidget):
         lbl.setFont(FONT_H2)
         colR.addWidget(lbl)
 
-        self.console = QTextEdit()
+        # Plain-text log with bounded history: no rich-text layout, oldest lines dropped
+        self.console = QPlainTextEdit()
         self.console.setReadOnly(True)
+        self.console.setMaximumBlockCount(_LOG_MAX_LINES)
         self.console.setMinimumHeight(120)
         self.console.setMaximumHeight(150)
         self.console.setFont(QFont("Courier New", 11))
-        self.console.setStyleSheet("""
-            QTextEdit {
-                background: #C8E6C9;
-                color: #1B5E20;
-                border: 2px solid #4CAF50;
-                border-radius: 6px;
-                padding: 8px;
-            }
-        """)
+        self.console.setObjectName("console")
         colR.addWidget(self.console, 0)
 
         root.addLayout(colL, 1)
@@ -1200,7 +1976,6 @@ class Text2VideoPanelV5(QWidget):
         self.cancel_video_button.clicked.connect(self._on_cancel_video_generation)  # PR#7: Cancel button
 
         self.table.cellDoubleClicked.connect(self._open_prompt_view)
-        self.cards.itemDoubleClicked.connect(self._open_card_prompt)
 
         self.cb_speaking_style.currentIndexChanged.connect(
             self._on_speaking_style_changed
@@ -1219,6 +1994,8 @@ class Text2VideoPanelV5(QWidget):
         )
 
         self.cb_domain.currentIndexChanged.connect(self._on_domain_changed)
+        self.result_tabs.currentChanged.connect(self._flush_pending_tab_update)
+        self.result_tabs.currentChanged.connect(self._ensure_history_widget)
         self.cb_topic.currentIndexChanged.connect(self._on_topic_changed)
 
         shortcut = QShortcut(QKeySequence("Ctrl+N"), self)
@@ -1232,37 +2009,66 @@ class Text2VideoPanelV5(QWidget):
         # Note: _switch_view('storyboard') will be called when scenes are loaded
 
     def _apply_styles(self):
-        groupbox_style = """
-        QGroupBox {
-            font-weight: bold;
-            font-size: 13px;
-            border: 1px solid #d0d0d0;
-            border-radius: 5px;
-            margin-top: 10px;
-            padding-top: 10px;
-        }
-        QGroupBox::title {
-            subcontrol-origin: margin;
-            subcontrol-position: top left;
-            padding: 4px 10px;
-            left: 10px;
-            top: 0px;
-        }
+        self.setStyleSheet(_PANEL_QSS)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        # The current tab may have been updated while the whole panel was hidden
+        self._flush_pending_tab_update(self.result_tabs.currentIndex())
+
+    def _defer_until_tab_shown(self, tab, fn):
+        """Queue fn until result tab `tab` is on screen; returns True if it was deferred
+
+        A later call for the same tab replaces the queued one, so only the newest
+        content is ever built.
         """
-        self.setStyleSheet(groupbox_style)
+        if self.isVisible() and self.result_tabs.currentWidget() is tab:
+            return False
+        self._pending_tab_updates[tab] = fn
+        return True
+
+    def _flush_pending_tab_update(self, index):
+        """Run the update queued for the result tab at `index`, if any"""
+        fn = self._pending_tab_updates.pop(self.result_tabs.widget(index), None)
+        if fn is not None:
+            fn()
+
+    def _ensure_history_widget(self, index):
+        """Create the HistoryWidget the first time the history tab is shown"""
+        if (self.history_widget is not None or not HistoryWidget
+                or self.result_tabs.widget(index) is not self._history_page):
+            return
+        self.history_widget = HistoryWidget(panel_type="text2video", parent=self._history_page)
+        self._history_layout.addWidget(self.history_widget)
 
     def _append_log(self, msg):
-        """Append log message to console in thread-safe manner"""
+        """Queue a log message for the console (written by _flush_log every 50 ms)"""
         try:
             ts = datetime.datetime.now().strftime("%H:%M:%S")
             # Ensure we're working with string type
             if not isinstance(msg, str):
                 msg = str(msg)
-            self.console.append(f"[{ts}] {msg}")
+            self._log_buffer.append(f"[{ts}] {msg}")
         except Exception as e:
             # Fallback in case of any threading or formatting issues
             print(f"[LOG ERROR] Failed to append log: {e}, msg={msg}")
 
+    def _flush_log(self):
+        """Write all buffered log lines to the console with a single append"""
+        if not self._log_buffer:
+            return
+        # Drain with popleft() instead of swapping the deque: append() and popleft()
+        # are atomic, so a line appended from another thread meanwhile is either
+        # taken here or left for the next flush
+        buffer = self._log_buffer
+        lines = []
+        while buffer:
+            lines.append(buffer.popleft())
+        try:
+            self.console.appendPlainText("\n".join(lines))
+        except Exception as e:
+            print(f"[LOG ERROR] Failed to flush log: {e}")
+
     def _toggle_char_ref_ui(self, state):
         """Toggle visibility of character reference image UI"""
         self.char_ref_container.setVisible(state == Qt.Checked)
@@ -1308,13 +2114,16 @@ class Text2VideoPanelV5(QWidget):
             thumb = QLabel()
             thumb.setFixedSize(THUMBNAIL_SIZE, THUMBNAIL_SIZE)
             thumb.setScaledContents(True)
-            thumb.setStyleSheet("border: 1px solid #ddd; border-radius: 4px;")
+            thumb.setObjectName("charRefThumb")
             
             pixmap = QPixmap(path)
             if not pixmap.isNull():
+                # Same rule as the storyboard thumbs: smoothing only pays off for big sources
+                mode = (Qt.SmoothTransformation if pixmap.width() > 4 * THUMBNAIL_SIZE
+                        else Qt.FastTransformation)
                 thumb.setPixmap(pixmap.scaled(
                     THUMBNAIL_SIZE, THUMBNAIL_SIZE,
-                    Qt.KeepAspectRatio, Qt.SmoothTransformation
+                    Qt.KeepAspectRatio, mode
                 ))
             else:
                 thumb.setText("❌")
@@ -1329,7 +2138,7 @@ class Text2VideoPanelV5(QWidget):
             extra.setFixedSize(THUMBNAIL_SIZE, THUMBNAIL_SIZE)
             extra.setText(f"+{len(self._character_ref_images) - max_show}")
             extra.setAlignment(Qt.AlignCenter)
-            extra.setStyleSheet("border: 1px solid #ddd; border-radius: 4px; font-weight: bold;")
+            extra.setObjectName("charRefMore")
             self.char_ref_thumb_container.insertWidget(max_show, extra)
 
     # === CONTINUE IN NEXT PART (methods from original) ===
@@ -1342,8 +2151,9 @@ class Text2VideoPanelV5(QWidget):
 
     def stop_processing(self):
         """Stop all workers"""
-        if self.worker:
-            self.worker.should_stop = True
+        if self._active_workers:
+            for worker in self._active_workers:
+                worker.should_stop = True
             self._append_log("[INFO] Đang dừng xử lý...")
 
         self.btn_auto.setEnabled(True)
@@ -1402,7 +2212,6 @@ class Text2VideoPanelV5(QWidget):
 
         # Issue #33: Generate base seed for this batch (for character consistency)
         # PR #8: Generate style seed for visual style consistency (separate from character seed)
-        import random
         base_seed = random.randint(0, 2**31 - 1)
         style_seed = random.randint(0, 2**31 - 1)  # PR #8: Separate seed for style
 
@@ -1442,53 +2251,63 @@ class Text2VideoPanelV5(QWidget):
             self._append_log("[ERR] Worker not available")
             return
 
-        # Clean up any existing thread/worker before creating new ones
-        if hasattr(self, 'thread') and self.thread:
-            try:
-                if self.thread.isRunning():
-                    self.thread.quit()
-                    self.thread.wait()
-                self.thread.deleteLater()
-            except RuntimeError:
-                # Thread already deleted
-                pass
-            finally:
-                self.thread = None
-        
-        if hasattr(self, 'worker') and self.worker:
-            try:
-                self.worker.deleteLater()
-            except RuntimeError:
-                # Worker already deleted
-                pass
-            finally:
-                self.worker = None
-
-        self.thread = QThread(self)
-        self.worker = _Worker(task, payload)
-        self.worker.moveToThread(self.thread)
-
-        self.thread.started.connect(self.worker.run)
-        self.worker.log.connect(self._append_log)
+        # A previous run that is still going (e.g. another scene's retry) keeps running
+        # on its own pool thread, held by _active_workers; only Stop and clearing the
+        # project cancel it. self.worker is the run the progress UI follows.
+        # The worker object lives on the GUI thread and runs on a pooled thread, so
+        # its signals reach the slots below as queued calls
+        self.worker = worker = _Worker(task, payload)
+        worker.log.connect(self._append_log)
 
         if task == "script":
-            self.worker.story_done.connect(self._on_story_ready)
-            self.worker.progress_update.connect(self._on_progress_update)  # NEW: Connect progress signal
+            worker.story_done.connect(self._on_story_ready)
+            worker.progress_update.connect(self._on_progress_update)  # NEW: Connect progress signal
         else:
-            self.worker.job_card.connect(self._on_job_card)
+            worker.job_card.connect(self._on_job_card)
 
-        # BUG FIX: Single cleanup slot to avoid race conditions
-        self.worker.job_finished.connect(self._on_worker_finished_cleanup)
+        # BUG FIX: Single cleanup slot to avoid race conditions. It goes through
+        # _on_worker_released so a superseded run finishing does not reset the UI
+        # of the run that replaced it.
+        self._active_workers.add(worker)
+        worker.job_finished.connect(lambda: self._on_worker_released(worker))
 
-        self.thread.start()
+        self._worker_pool.start(_WorkerRunnable(worker))
 
+    def _on_worker_released(self, worker):
+        """Drop references to a worker once its run has finished"""
+        self._active_workers.discard(worker)
+        if self.worker is worker:
+            self.worker = None
+            self._on_worker_finished_cleanup()
+
+    def _on_gui_thread(self):
+        return QThread.currentThread() is self.thread()
+
+    @pyqtSlot(str, int)
     def _on_progress_update(self, message, percent):
         """Update progress bar with current progress"""
+        if not self._on_gui_thread():
+            # Called directly from a worker thread: re-post to the GUI thread
+            QMetaObject.invokeMethod(self, "_on_progress_update", Qt.QueuedConnection,
+                                     Q_ARG(str, message), Q_ARG(int, percent))
+            return
+        # Same percent within 100 ms: only the message changed, skip the repaint.
+        # 0 and 100 always go through so start/end states are never dropped.
+        now = time.monotonic()
+        if (percent == self._last_progress_pct and percent not in (0, 100)
+                and now - self._last_progress_ts < 0.1):
+            return
+        self._last_progress_pct = percent
+        self._last_progress_ts = now
         self.progress_bar.setValue(percent)
         self.progress_bar.setFormat(f"{percent}% - {message}")
 
+    @pyqtSlot()
     def _on_worker_finished_cleanup(self):
         """Handle worker completion with proper cleanup"""
+        if not self._on_gui_thread():
+            QMetaObject.invokeMethod(self, "_on_worker_finished_cleanup", Qt.QueuedConnection)
+            return
         self._append_log("[INFO] Worker hoàn tất.")
         self.btn_auto.setEnabled(True)
         self.btn_stop.setEnabled(False)
@@ -1497,28 +2316,16 @@ class Text2VideoPanelV5(QWidget):
         self.progress_bar.setVisible(False)
         self.progress_bar.setValue(0)
 
-        # Clean up thread and worker with proper error handling
-        if hasattr(self, 'thread') and self.thread:
-            try:
-                self.thread.quit()
-                self.thread.wait()
-                self.thread.deleteLater()
-            except RuntimeError:
-                # Thread object has already been deleted by Qt
-                pass
-            finally:
-                self.thread = None
-        if hasattr(self, 'worker') and self.worker:
-            try:
-                self.worker.deleteLater()
-            except RuntimeError:
-                # Worker object has already been deleted by Qt
-                pass
-            finally:
-                self.worker = None
+        # The pool thread that ran the worker is returned to QThreadPool for the
+        # next run; references are dropped in _on_worker_released
 
+    @pyqtSlot(dict, dict)
     def _on_story_ready(self, data, ctx):
         """Handle script generation completion"""
+        if not self._on_gui_thread():
+            QMetaObject.invokeMethod(self, "_on_story_ready", Qt.QueuedConnection,
+                                     Q_ARG(dict, data), Q_ARG(dict, ctx))
+            return
         self._ctx = ctx
         self._title = (
             self.ed_project.text().strip() or
@@ -1560,57 +2367,37 @@ class Text2VideoPanelV5(QWidget):
             )
 
         # Display Bible + Outline + Screenplay without framework headers
-        parts = []
-        cb = data.get("character_bible") or []
-        if cb:
-            for c in cb:
-                # Defensive: Skip non-dict items (can happen when JSON parsing partially fails)
-                if not isinstance(c, dict):
-                    continue
-                parts.append(
-                    f"- {c.get('name','?')} [{c.get('role','?')}]: "
-                    f"key_trait={c.get('key_trait','')}; "
-                    f"motivation={c.get('motivation','')}; "
-                    f"visual={c.get('visual_identity','')}"
-                )
-
         # Helper to safely convert value to string (handles both str and list)
         def safe_str(value):
             if isinstance(value, list):
                 return "\n".join(str(item) for item in value)
             return str(value) if value else ""
 
-        ol_vi = safe_str(data.get("outline_vi", "")).strip()
-        if ol_vi:
-            if parts:
-                parts.append("")  # Add blank line separator
-            parts.append(ol_vi)
-
-        sp_vi = safe_str(data.get("screenplay_vi", "")).strip()
-        sp_tgt = safe_str(data.get("screenplay_tgt", "")).strip()
-        if sp_vi or sp_tgt:
-            if parts:
-                parts.append("")  # Add blank line separator
-            if sp_vi:
-                parts.append(sp_vi)
-            if sp_tgt:
-                if sp_vi:
-                    parts.append("")  # Add blank line separator between VI and target
-                parts.append(sp_tgt)
-
-        self.view_story.setPlainText(
-            "\n\n".join(parts) if parts else "(Không có dữ liệu)"
+        cb = data.get("character_bible") or []
+        # Defensive: Skip non-dict items (can happen when JSON parsing partially fails)
+        bible = "\n\n".join(
+            f"- {c.get('name','?')} [{c.get('role','?')}]: "
+            f"key_trait={c.get('key_trait','')}; "
+            f"motivation={c.get('motivation','')}; "
+            f"visual={c.get('visual_identity','')}"
+            for c in cb if isinstance(c, dict)
         )
+        sections = [
+            bible,
+            safe_str(data.get("outline_vi", "")).strip(),
+            safe_str(data.get("screenplay_vi", "")).strip(),
+            safe_str(data.get("screenplay_tgt", "")).strip(),
+        ]
+        # Sections are separated by a blank paragraph (three empty lines)
+        story_text = "\n\n\n\n".join(sec for sec in sections if sec)
+        self.view_story.setPlainText(story_text or "(Không có dữ liệu)")
 
-        # Update cards with enhanced styling
-        self.cards.clear()
         self._cards_state = {}
 
-        # Clear existing scene cards
-        while self.cards_layout.count() > 1:
-            item = self.cards_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
+        # Add all cards with one relayout/repaint at the end
+        self._card_container.setUpdatesEnabled(False)
+
+        # Existing scene cards are rebound to the new scenes below instead of being deleted
         self.scene_cards = []
 
         for i, sc in enumerate(data.get('scenes', []), 1):
@@ -1631,126 +2418,129 @@ class Text2VideoPanelV5(QWidget):
                     'prompt_image': vi or tgt,
                     'prompt_video': tgt or vi
                 }
-                card = SceneResultCard(i, scene_data, alternating_color=(i % 2 == 1))
-                
-                # Connect scene card signals (Requirement #1)
-                card.prompt_requested.connect(self._on_scene_prompt_requested)
-                card.recreate_requested.connect(self._on_scene_recreate_requested)
-                card.generate_video_requested.connect(self._on_scene_generate_video_requested)
-                card.regenerate_video_requested.connect(self._on_scene_regenerate_video_requested)
-                
-                self.cards_layout.insertWidget(i - 1, card)
-                self.scene_cards.append(card)
-
-            # Also maintain old QListWidget for backward compatibility
-            it = QListWidgetItem(self._render_card_text(i))
-            it.setData(Qt.UserRole, ('scene', i))
+                pool_idx = len(self.scene_cards)
+                alternate = bool(i & 1)  # Odd scenes get the tinted background
+                if pool_idx < len(self._scene_card_pool):
+                    card = self._scene_card_pool[pool_idx]
+                    card.update_scene_data(i, scene_data, alternating_color=alternate)
+                    card.setVisible(True)
+                else:
+                    card = SceneResultCard(i, scene_data, alternating_color=alternate)
 
-            # Alternating backgrounds: #E3F2FD (odd) / #FFFFFF (even)
-            bg_color = QColor("#E3F2FD") if i % 2 == 1 else QColor("#FFFFFF")
-            it.setBackground(bg_color)
+                    # Connect scene card signals (Requirement #1)
+                    card.prompt_requested.connect(self._on_scene_prompt_requested)
+                    card.recreate_requested.connect(self._on_scene_recreate_requested)
+                    card.generate_video_requested.connect(self._on_scene_generate_video_requested)
+                    card.regenerate_video_requested.connect(self._on_scene_regenerate_video_requested)
 
-            # Set font for scene number (will be bolded in _render_card_text)
-            font = QFont("Segoe UI", 12)
-            it.setFont(font)
+                    self.cards_layout.insertWidget(pool_idx, card)
+                    self._scene_card_pool.append(card)
+                self.scene_cards.append(card)
 
-            self.cards.addItem(it)
+        # Cards left over from a longer previous script are hidden, not destroyed
+        for card in self._scene_card_pool[len(self.scene_cards):]:
+            card.setVisible(False)
+        self._card_container.setUpdatesEnabled(True)
 
         # Fill table & save prompts
+        # Size the table once and fill rows by index with repaint and signals off,
+        # instead of an insertRow + relayout per scene
+        scenes = data.get("scenes", [])
+        self.table.setUpdatesEnabled(False)
+        self.table.blockSignals(True)
         self.table.setRowCount(0)
+        self.table.setRowCount(sum(1 for sc in scenes if isinstance(sc, dict)))
         prdir = ctx.get("dir_prompts", "")
 
-        for i, sc in enumerate(data.get("scenes", []), 1):
+        json_tmpl = os.path.join(prdir, "scene_{:02d}.json")
+        txt_tmpl = os.path.join(prdir, "scene_{:02d}.txt")
+
+        # Widget state is the same for every scene: read it once, not per row
+        ratio_text = self.cb_ratio.currentText()
+        lang_code = self.cb_out_lang.currentData()
+        style = self.cb_style.currentData() or "anime_2d"  # Use data key
+        if build_prompt_json and prdir:
+            character_bible_basic = data.get("character_bible", [])
+            # Type guard: Ensure character_bible is a list
+            if not isinstance(character_bible_basic, list):
+                character_bible_basic = []
+            voice_settings = self.get_voice_settings()
+
+            # Type guard: Ensure voice_settings is a dict, not a string
+            if voice_settings and not isinstance(voice_settings, dict):
+                voice_settings = None
+
+            # Get additional parameters for enhanced prompt JSON
+            custom_voice = self.ed_custom_voice.text().strip()
+            tts_provider = self.cb_tts_provider.currentData()
+            voice_id = custom_voice or self.cb_voice.currentData()
+            voice_name = self.cb_voice.currentText() if not custom_voice else ""
+            domain = self.cb_domain.currentData() or None
+            topic = self.cb_topic.currentData() or None
+            quality = self.cb_quality.currentText() if self.cb_quality.isVisible() else None
+
+            # Issue #33: Get base_seed from context for character consistency
+            # PR #8: Get style_seed from context for visual style consistency
+            base_seed = ctx.get("base_seed") or data.get("base_seed")
+            style_seed = ctx.get("style_seed") or data.get("style_seed")
+
+            # build_prompt_json keywords shared by every scene; each row copies this
+            # and adds only its location context and dialogues
+            base_kwargs = dict(
+                character_bible=character_bible_basic,
+                voice_settings=voice_settings,
+                tts_provider=tts_provider,
+                voice_id=voice_id,
+                voice_name=voice_name,
+                domain=domain,
+                topic=topic,
+                quality=quality,
+                base_seed=base_seed,  # Issue #33: Pass base_seed for character consistency
+                style_seed=style_seed  # PR #8: Pass style_seed for visual style consistency
+            )
+
+        r = -1
+        for i, sc in enumerate(scenes, 1):
             # Type guard: Ensure sc is a dict, not a string
             if not isinstance(sc, dict):
                 self._append_log(f"[WARN] Scene {i} data is not a dict, skipping")
                 continue
             
-            r = self.table.rowCount()
-            self.table.insertRow(r)
+            r += 1
             self.table.setItem(r, 0, QTableWidgetItem(str(i)))
             self.table.setItem(r, 1, QTableWidgetItem(sc.get("prompt_vi", "")))
             self.table.setItem(r, 2, QTableWidgetItem(sc.get("prompt_tgt", "")))
-            self.table.setItem(r, 3, QTableWidgetItem(self.cb_ratio.currentText()))
+            self.table.setItem(r, 3, QTableWidgetItem(ratio_text))
             self.table.setItem(r, 4, QTableWidgetItem(str(sc.get("duration", 8))))
 
-            btn = QPushButton("Xem")
-            btn.clicked.connect(lambda _, row=r: self._open_prompt_view(row))
-            self.table.setCellWidget(r, 5, btn)
-
             # Save prompt JSON per scene
             if build_prompt_json and prdir:
                 try:
-                    lang_code = self.cb_out_lang.currentData()
-                    character_bible_basic = data.get("character_bible", [])
-                    # Type guard: Ensure character_bible is a list
-                    if not isinstance(character_bible_basic, list):
-                        character_bible_basic = []
-                    voice_settings = self.get_voice_settings()
-                    
-                    # Type guard: Ensure voice_settings is a dict, not a string
-                    if voice_settings and not isinstance(voice_settings, dict):
-                        voice_settings = None
-                    
                     location_ctx = extract_location_context(sc) if extract_location_context else None
 
-                    # Get additional parameters for enhanced prompt JSON
-                    tts_provider = self.cb_tts_provider.currentData()
-                    voice_id = self.ed_custom_voice.text().strip() or self.cb_voice.currentData()
-                    voice_name = self.cb_voice.currentText() if not self.ed_custom_voice.text().strip() else ""
-                    domain = self.cb_domain.currentData() or None
-                    topic = self.cb_topic.currentData() or None
-                    quality = self.cb_quality.currentText() if self.cb_quality.isVisible() else None
-
                     # Part G: Extract dialogues from scene data for voiceover
                     dialogues = sc.get("dialogues", [])
                     # Type guard: Ensure dialogues is a list
                     if not isinstance(dialogues, list):
                         dialogues = []
-                    
-                    # Issue #33: Get base_seed from context for character consistency
-                    # PR #8: Get style_seed from context for visual style consistency
-                    base_seed = ctx.get("base_seed") or data.get("base_seed")
-                    style_seed = ctx.get("style_seed") or data.get("style_seed")
 
-                    j = build_prompt_json(
+                    # Building and writing the prompt files runs on the thread pool
+                    args = (
                         i, sc.get("prompt_vi", ""), sc.get("prompt_tgt", ""),
-                        lang_code, self.cb_ratio.currentText(),
-                        self.cb_style.currentData() or "anime_2d",  # Use data key
-                        character_bible=character_bible_basic,
-                        voice_settings=voice_settings,
-                        location_context=location_ctx,
-                        tts_provider=tts_provider,
-                        voice_id=voice_id,
-                        voice_name=voice_name,
-                        domain=domain,
-                        topic=topic,
-                        quality=quality,
-                        dialogues=dialogues,
-                        base_seed=base_seed,  # Issue #33: Pass base_seed for character consistency
-                        style_seed=style_seed  # PR #8: Pass style_seed for visual style consistency
+                        lang_code, ratio_text, style,
+                    )
+                    kwargs = dict(base_kwargs, location_context=location_ctx, dialogues=dialogues)
+                    QThreadPool.globalInstance().start(
+                        _SavePromptTask(json_tmpl.format(i), txt_tmpl.format(i),
+                                        args, kwargs, self._save_signals)
                     )
-
-                    with open(
-                        os.path.join(prdir, f"scene_{i:02d}.json"),
-                        "w", encoding="utf-8"
-                    ) as f:
-                        json.dump(j, f, ensure_ascii=False, indent=2)
-                    
-                    # Auto-save formatted prompt as .txt file (Requirement #2)
-                    try:
-                        from services.labs_flow_service import _build_complete_prompt_text
-                        formatted_prompt = _build_complete_prompt_text(j)
-                        with open(
-                            os.path.join(prdir, f"scene_{i:02d}.txt"),
-                            "w", encoding="utf-8"
-                        ) as f:
-                            f.write(formatted_prompt)
-                    except Exception as txt_err:
-                        self._append_log(f"[WARN] Could not save .txt prompt: {txt_err}")
                 except Exception as e:
                     self._append_log(f"[WARN] Could not save prompt: {e}")
 
+        self.table.blockSignals(False)
+        self.table.setUpdatesEnabled(True)
+        self.table.viewport().update()
+
         self._append_log("[INFO] Kịch bản đã hiển thị & lưu file.")
         
         # Track script generation completion time
@@ -1785,26 +2575,17 @@ class Text2VideoPanelV5(QWidget):
         else:
             self.btn_auto.setEnabled(True)
 
-    def _on_create_video_clicked(self):
-        """Create videos from script - PR#7: Using background worker to prevent UI freeze"""
-        if self.table.rowCount() <= 0:
-            QMessageBox.information(
-                self, "Chưa có kịch bản",
-                "Hãy tạo kịch bản trước."
-            )
-            return
-
-        # Check if VideoGenerationWorker is available
-        if not VideoGenerationWorker:
-            self._append_log("[WARN] VideoGenerationWorker not available, using fallback method")
-            self._on_create_video_clicked_fallback()
-            return
+    def _build_scenes_and_payload(self):
+        """Snapshot the script table and settings into the video worker payload
 
+        Shared by both create-video handlers. payload["build_scenes"] builds the scene
+        prompts from the snapshot (see _build_video_scenes). Returns None when no
+        download folder is configured.
+        """
         lang_code = self.cb_out_lang.currentData()
         ratio_key = self.cb_ratio.currentText()
         ratio = _ASPECT_MAP.get(ratio_key, "VIDEO_ASPECT_RATIO_LANDSCAPE")
         style = self.cb_style.currentData() or "anime_2d"  # Use data key
-        scenes = []
 
         character_bible_basic = (
             self._script_data.get("character_bible", [])
@@ -1812,66 +2593,59 @@ class Text2VideoPanelV5(QWidget):
         )
         voice_settings = self.get_voice_settings()
 
-        for r in range(self.table.rowCount()):
-            vi = self.table.item(r, 1).text() if self.table.item(r, 1) else ""
-            tgt = self.table.item(r, 2).text() if self.table.item(r, 2) else vi
-
-            location_ctx = None
-            dialogues = []
-            if self._script_data and "scenes" in self._script_data:
-                scene_list = self._script_data["scenes"]
-                if r < len(scene_list):
-                    # Extract location context if extractor function is available
-                    if extract_location_context:
-                        location_ctx = extract_location_context(scene_list[r])
-                    # Part G: Extract dialogues for voiceover
-                    dialogues = scene_list[r].get("dialogues", [])
-
-            if build_prompt_json:
-                # Get additional parameters for enhanced prompt JSON
-                tts_provider = self.cb_tts_provider.currentData()
-                voice_id = self.ed_custom_voice.text().strip() or self.cb_voice.currentData()
-                voice_name = self.cb_voice.currentText() if not self.ed_custom_voice.text().strip() else ""
-                domain = self.cb_domain.currentData() or None
-                topic = self.cb_topic.currentData() or None
-                quality_text = self.cb_quality.currentText() if self.cb_quality.isVisible() else None
-                
-                # Issue #33: Get base_seed from script data for character consistency
-                # PR #8: Get style_seed from script data for visual style consistency
-                base_seed = self._script_data.get("base_seed") if self._script_data else None
-                style_seed = self._script_data.get("style_seed") if self._script_data else None
-
-                # Get character reference images if enabled
-                char_ref_imgs = self._character_ref_images if self.cb_use_char_ref.isChecked() else None
-                
-                j = build_prompt_json(
-                    r + 1, vi, tgt, lang_code, ratio_key, style,
-                    character_bible=character_bible_basic,
-                    enhanced_bible=self._character_bible,
-                    voice_settings=voice_settings,
-                    location_context=location_ctx,
-                    tts_provider=tts_provider,
-                    voice_id=voice_id,
-                    voice_name=voice_name,
-                    domain=domain,
-                    topic=topic,
-                    quality=quality_text,
-                    dialogues=dialogues,
-                    base_seed=base_seed,  # Issue #33: Pass base_seed for character consistency
-                    style_seed=style_seed,  # PR #8: Pass style_seed for visual style consistency
-                    character_ref_images=char_ref_imgs  # NEW: Pass character reference images
-                )
-                scenes.append({
-                    "prompt": json.dumps(j, ensure_ascii=False, indent=2),
-                    "aspect": ratio,
-                    "actual_scene_num": r + 1  # Include actual scene number for consistency
-                })
+        # Get additional parameters for enhanced prompt JSON (same for every scene)
+        custom_voice = self.ed_custom_voice.text().strip()
+        tts_provider = self.cb_tts_provider.currentData()
+        voice_id = custom_voice or self.cb_voice.currentData()
+        voice_name = self.cb_voice.currentText() if not custom_voice else ""
+        domain = self.cb_domain.currentData() or None
+        topic = self.cb_topic.currentData() or None
+        quality_text = self.cb_quality.currentText() if self.cb_quality.isVisible() else None
+
+        # Issue #33: Get base_seed from script data for character consistency
+        # PR #8: Get style_seed from script data for visual style consistency
+        base_seed = self._script_data.get("base_seed") if self._script_data else None
+        style_seed = self._script_data.get("style_seed") if self._script_data else None
+
+        # Get character reference images if enabled
+        char_ref_imgs = self._character_ref_images if self.cb_use_char_ref.isChecked() else None
+
+        # Only the table text is read here; build_prompt_json and serialisation run
+        # on the video worker thread (payload["build_scenes"]) so the UI does not stall
+        scene_list = (self._script_data or {}).get("scenes") or []
+        n_scenes = len(scene_list)
+        rows = []
+        for r in range(self.table.rowCount() if build_prompt_json else 0):
+            it_vi = self.table.item(r, 1)
+            it_tgt = self.table.item(r, 2)
+            vi = it_vi.text() if it_vi else ""
+            tgt = it_tgt.text() if it_tgt else vi
+            rows.append((r + 1, vi, tgt, scene_list[r] if r < n_scenes else None))
+
+        prompt_kwargs = dict(
+            character_bible=character_bible_basic,
+            enhanced_bible=self._character_bible,
+            voice_settings=voice_settings,
+            tts_provider=tts_provider,
+            voice_id=voice_id,
+            voice_name=voice_name,
+            domain=domain,
+            topic=topic,
+            quality=quality_text,
+            base_seed=base_seed,  # Issue #33: Pass base_seed for character consistency
+            style_seed=style_seed,  # PR #8: Pass style_seed for visual style consistency
+            character_ref_images=char_ref_imgs  # NEW: Pass character reference images
+        )
+        build_scenes = partial(
+            _build_video_scenes, rows, (lang_code, ratio_key, style), prompt_kwargs, ratio,
+            self.cb_stitch_videos.isChecked()
+        )
 
         model_display = self.cb_model.currentText()
         model_key = get_model_key_from_display(model_display) if get_model_key_from_display else model_display
 
         payload = dict(
-            scenes=scenes,
+            build_scenes=build_scenes,
             copies=self._t2v_get_copies(),
             model_key=model_key,
             title=self._title,
@@ -1883,53 +2657,53 @@ class Text2VideoPanelV5(QWidget):
 
         if not payload["dir_videos"]:
             if cfg:
-                st = cfg.load()
+                st = cfg.load_cached()
                 root = st.get("download_dir") or ""
                 if not root:
                     QMessageBox.warning(
                         self, "Thiếu cấu hình",
                         "Vào tab Cài đặt để chọn 'Thư mục tải về' trước."
                     )
-                    return
+                    return None
                 sanitized_title = sanitize_project_name(self._title or "Project")
                 prj = os.path.join(root, sanitized_title)
-                os.makedirs(prj, exist_ok=True)
                 payload["dir_videos"] = os.path.join(prj, "03_Videos")
-                os.makedirs(payload["dir_videos"], exist_ok=True)
+                # makedirs creates the project folder too; skip it when both already exist
+                if not os.path.isdir(payload["dir_videos"]):
+                    os.makedirs(payload["dir_videos"], exist_ok=True)
 
-        # Check if single combined video mode is enabled
-        if self.cb_stitch_videos.isChecked() and len(scenes) > 1:
-            self._append_log("[INFO] 🎬 Chế độ video đơn: Kết hợp tất cả cảnh thành 1 video...")
-            self._append_log(f"[INFO] Đang kết hợp {len(scenes)} cảnh bằng Google Labs Flow API...")
-            
-            try:
-                # Combine all scene prompts into one
-                scene_prompts = [scene["prompt"] for scene in scenes]
-                combined_prompt = combine_scene_prompts_for_single_video(scene_prompts, max_duration=30.0)
-                
-                # Replace multiple scenes with single combined scene
-                payload["scenes"] = [{
-                    "prompt": json.dumps(combined_prompt, ensure_ascii=False, indent=2),
-                    "aspect": scenes[0]["aspect"],  # Use aspect from first scene
-                    "actual_scene_num": 1
-                }]
-                
-                self._append_log(f"[INFO] ✅ Đã kết hợp {len(scenes)} cảnh thành 1 prompt duy nhất")
-                self._append_log("[INFO] Tạo 1 video thay vì nhiều video riêng lẻ")
-            except Exception as e:
-                self._append_log(f"[ERROR] Không thể kết hợp prompts: {str(e)}")
-                self._append_log("[INFO] Sẽ tạo video theo cách thông thường (nhiều cảnh riêng lẻ)")
+        return payload
+
+    def _on_create_video_clicked(self):
+        """Create videos from script - PR#7: Using background worker to prevent UI freeze"""
+        if self.table.rowCount() <= 0:
+            QMessageBox.information(
+                self, "Chưa có kịch bản",
+                "Hãy tạo kịch bản trước."
+            )
+            return
+
+        # Check if VideoGenerationWorker is available
+        if not VideoGenerationWorker:
+            self._append_log("[WARN] VideoGenerationWorker not available, using fallback method")
+            self._on_create_video_clicked_fallback()
+            return
+
+        payload = self._build_scenes_and_payload()
+        if payload is None:
+            return
 
         # Generate audio for each scene before video generation
         self._append_log("[INFO] 🎤 Bắt đầu tạo audio cho các cảnh...")
         if self._script_data and "scenes" in self._script_data:
             scene_list = self._script_data["scenes"]
+            tts_settings = self._scene_audio_tts_settings()  # Same voice for every scene
             for r in range(min(len(scene_list), self.table.rowCount())):
                 scene_data = scene_list[r]
                 scene_idx = r + 1
                 
                 # Generate audio for this scene
-                self._generate_scene_audio(scene_idx, scene_data)
+                self._generate_scene_audio(scene_idx, scene_data, tts_settings)
         else:
             self._append_log("[WARN] Không có dữ liệu kịch bản để tạo audio")
 
@@ -1947,120 +2721,23 @@ class Text2VideoPanelV5(QWidget):
         if self.table.rowCount() <= 0:
             return
 
-        lang_code = self.cb_out_lang.currentData()
-        ratio_key = self.cb_ratio.currentText()
-        ratio = _ASPECT_MAP.get(ratio_key, "VIDEO_ASPECT_RATIO_LANDSCAPE")
-        style = self.cb_style.currentData() or "anime_2d"
-        scenes = []
-
-        character_bible_basic = (
-            self._script_data.get("character_bible", [])
-            if self._script_data else []
-        )
-        voice_settings = self.get_voice_settings()
-
-        for r in range(self.table.rowCount()):
-            vi = self.table.item(r, 1).text() if self.table.item(r, 1) else ""
-            tgt = self.table.item(r, 2).text() if self.table.item(r, 2) else vi
-
-            location_ctx = None
-            dialogues = []
-            if self._script_data and "scenes" in self._script_data:
-                scene_list = self._script_data["scenes"]
-                if r < len(scene_list):
-                    if extract_location_context:
-                        location_ctx = extract_location_context(scene_list[r])
-                    dialogues = scene_list[r].get("dialogues", [])
-
-            if build_prompt_json:
-                tts_provider = self.cb_tts_provider.currentData()
-                voice_id = self.ed_custom_voice.text().strip() or self.cb_voice.currentData()
-                voice_name = self.cb_voice.currentText() if not self.ed_custom_voice.text().strip() else ""
-                domain = self.cb_domain.currentData() or None
-                topic = self.cb_topic.currentData() or None
-                quality_text = self.cb_quality.currentText() if self.cb_quality.isVisible() else None
-                base_seed = self._script_data.get("base_seed") if self._script_data else None
-
-                j = build_prompt_json(
-                    r + 1, vi, tgt, lang_code, ratio_key, style,
-                    character_bible=character_bible_basic,
-                    enhanced_bible=self._character_bible,
-                    voice_settings=voice_settings,
-                    location_context=location_ctx,
-                    tts_provider=tts_provider,
-                    voice_id=voice_id,
-                    voice_name=voice_name,
-                    domain=domain,
-                    topic=topic,
-                    quality=quality_text,
-                    dialogues=dialogues,
-                    base_seed=base_seed
-                )
-                scenes.append({
-                    "prompt": json.dumps(j, ensure_ascii=False, indent=2),
-                    "aspect": ratio,
-                    "actual_scene_num": r + 1  # Include actual scene number for consistency
-                })
-
-        model_display = self.cb_model.currentText()
-        model_key = get_model_key_from_display(model_display) if get_model_key_from_display else model_display
-
-        payload = dict(
-            scenes=scenes,
-            copies=self._t2v_get_copies(),
-            model_key=model_key,
-            title=self._title,
-            dir_videos=self._ctx.get("dir_videos", ""),
-            upscale_4k=self.cb_upscale.isChecked(),
-            auto_download=self.cb_auto_download.isChecked(),
-            quality=self.cb_quality.currentText()
-        )
-
-        if not payload["dir_videos"]:
-            if cfg:
-                st = cfg.load()
-                root = st.get("download_dir") or ""
-                if not root:
-                    return
-                sanitized_title = sanitize_project_name(self._title or "Project")
-                prj = os.path.join(root, sanitized_title)
-                os.makedirs(prj, exist_ok=True)
-                payload["dir_videos"] = os.path.join(prj, "03_Videos")
-                os.makedirs(payload["dir_videos"], exist_ok=True)
-
-        # Check if single combined video mode is enabled (same logic as main function)
-        if self.cb_stitch_videos.isChecked() and len(scenes) > 1:
-            self._append_log("[INFO] 🎬 Chế độ video đơn: Kết hợp tất cả cảnh thành 1 video...")
-            self._append_log(f"[INFO] Đang kết hợp {len(scenes)} cảnh bằng Google Labs Flow API...")
-            
-            try:
-                # Combine all scene prompts into one
-                scene_prompts = [scene["prompt"] for scene in scenes]
-                combined_prompt = combine_scene_prompts_for_single_video(scene_prompts, max_duration=30.0)
-                
-                # Replace multiple scenes with single combined scene
-                payload["scenes"] = [{
-                    "prompt": json.dumps(combined_prompt, ensure_ascii=False, indent=2),
-                    "aspect": scenes[0]["aspect"],  # Use aspect from first scene
-                    "actual_scene_num": 1
-                }]
-                
-                self._append_log(f"[INFO] ✅ Đã kết hợp {len(scenes)} cảnh thành 1 prompt duy nhất")
-                self._append_log("[INFO] Tạo 1 video thay vì nhiều video riêng lẻ")
-            except Exception as e:
-                self._append_log(f"[ERROR] Không thể kết hợp prompts: {str(e)}")
-                self._append_log("[INFO] Sẽ tạo video theo cách thông thường (nhiều cảnh riêng lẻ)")
+        payload = self._build_scenes_and_payload()
+        if payload is None:
+            return
+        # The legacy worker only takes a ready scene list, so the prompts are built here
+        payload["scenes"] = payload.pop("build_scenes")(self._append_log)
 
         # Generate audio for each scene before video generation
         self._append_log("[INFO] 🎤 Bắt đầu tạo audio cho các cảnh...")
         if self._script_data and "scenes" in self._script_data:
             scene_list = self._script_data["scenes"]
+            tts_settings = self._scene_audio_tts_settings()  # Same voice for every scene
             for r in range(min(len(scene_list), self.table.rowCount())):
                 scene_data = scene_list[r]
                 scene_idx = r + 1
                 
                 # Generate audio for this scene
-                self._generate_scene_audio(scene_idx, scene_data)
+                self._generate_scene_audio(scene_idx, scene_data, tts_settings)
         else:
             self._append_log("[WARN] Không có dữ liệu kịch bản để tạo audio")
 
@@ -2172,8 +2849,24 @@ class Text2VideoPanelV5(QWidget):
             self.progress_label.setText("Cancelling...")
             self.video_worker.cancel()
 
-    def _generate_scene_audio(self, scene_idx, scene_data):
-        """Generate audio file for a scene"""
+    def _scene_audio_tts_settings(self):
+        """(tts_provider, voice_id, lang_code) for scene audio, read from the voice widgets"""
+        tts_provider = self.cb_tts_provider.currentData() if hasattr(self, 'cb_tts_provider') else "google"
+        voice_id = self.ed_custom_voice.text().strip() if hasattr(self, 'ed_custom_voice') else ""
+        if not voice_id and hasattr(self, 'cb_voice'):
+            voice_id = self.cb_voice.currentData() or "vi-VN-Wavenet-A"
+        else:
+            voice_id = voice_id or "vi-VN-Wavenet-A"
+
+        lang_code = self.cb_out_lang.currentData() if hasattr(self, 'cb_out_lang') else "vi"
+        return tts_provider, voice_id, lang_code
+
+    def _generate_scene_audio(self, scene_idx, scene_data, tts_settings=None):
+        """Generate audio file for a scene
+
+        tts_settings: result of _scene_audio_tts_settings(); callers looping over
+        scenes read it once and pass it in.
+        """
         try:
             # Import audio generation service
             from services.audio_generator import generate_scene_audio
@@ -2182,7 +2875,7 @@ class Text2VideoPanelV5(QWidget):
             # Get project title and audio directory
             project_name = self._title or "text2video_project"
             if cfg:
-                st = cfg.load()
+                st = cfg.load_cached()
                 root = st.get("download_root") or st.get("download_dir", "")
                 if root:
                     sanitized_name = sanitize_project_name(project_name)
@@ -2224,14 +2917,9 @@ class Text2VideoPanelV5(QWidget):
                 return None
             
             # Get TTS settings from UI
-            tts_provider = self.cb_tts_provider.currentData() if hasattr(self, 'cb_tts_provider') else "google"
-            voice_id = self.ed_custom_voice.text().strip() if hasattr(self, 'ed_custom_voice') else ""
-            if not voice_id and hasattr(self, 'cb_voice'):
-                voice_id = self.cb_voice.currentData() or "vi-VN-Wavenet-A"
-            else:
-                voice_id = voice_id or "vi-VN-Wavenet-A"
-            
-            lang_code = self.cb_out_lang.currentData() if hasattr(self, 'cb_out_lang') else "vi"
+            if tts_settings is None:
+                tts_settings = self._scene_audio_tts_settings()
+            tts_provider, voice_id, lang_code = tts_settings
             
             # Build audio scene data
             audio_scene_data = {
@@ -2262,58 +2950,6 @@ class Text2VideoPanelV5(QWidget):
             self._append_log(f"[DEBUG] {traceback.format_exc()}")
             return None
 
-    def _render_card_text(self, scene:int):
-        """Render card text with plain text formatting - BUG FIX #3: Show failed count"""
-        st = self._cards_state.get(scene, {})
-        vi = st.get('vi','').strip()
-        tgt = st.get('tgt','').strip()
-
-        # Plain text title with emoji
-        lines = [f'🎬 Cảnh {scene}']
-        lines.append('━━━━━━━━━━━━━━━━━━━━')
-
-        # Prompt (max 150 chars)
-        if tgt or vi:
-            lines.append('📝 PROMPT:')
-            prompt = (tgt or vi)[:150]
-            if len(tgt or vi) > 150:
-                prompt += '...'
-            lines.append(prompt)
-
-        # Videos - BUG FIX #3: Show failed count
-        vids = st.get('videos', {})
-        if vids:
-            lines.append('')
-
-            # Count statuses
-            failed = sum(1 for info in vids.values()
-                        if info.get('status') in ('FAILED', 'ERROR', 'FAILED_START', 'DONE_NO_URL', 'DOWNLOAD_FAILED'))
-            completed = sum(1 for info in vids.values()
-                           if info.get('status') in ('DOWNLOADED', 'COMPLETED', 'UPSCALED_4K'))
-
-            # Status summary
-            if failed > 0:
-                lines.append(f'🎥 VIDEO: {completed} OK, ❌ {failed} FAILED')
-            else:
-                lines.append('🎥 VIDEO:')
-
-            for copy, info in sorted(vids.items()):
-                status = info.get('status', '?')
-                tag = f'  #{copy}: {status}'
-                if info.get('completed_at'):
-                    tag += f' — {info["completed_at"]}'
-                lines.append(tag)
-
-                if info.get('path'):
-                    lines.append(f'  📥 {os.path.basename(info["path"])}')
-
-            # BUG FIX #3: Show retry hint
-            if failed > 0:
-                lines.append('')
-                lines.append('💡 Double-click or use Storyboard view to retry')
-
-        return '\n'.join(lines)
-
     def _on_job_card(self, data: dict):
         """Update job card with video status"""
         try:
@@ -2330,41 +2966,30 @@ class Text2VideoPanelV5(QWidget):
             # Track download completion
             was_downloaded = v.get('status') == 'DOWNLOADED'
 
+            changed = False
             for k in ('status', 'url', 'path', 'thumb', 'completed_at'):
-                if data.get(k):
-                    v[k] = data.get(k)
+                nv = data.get(k)
+                if nv and v.get(k) != nv:
+                    v[k] = nv
+                    changed = True
+            # Repeated heartbeats (e.g. PROCESSING) carry nothing new; a thumb is still
+            # rechecked since its file may only exist on disk from a later ping
+            if not changed and not data.get('thumb'):
+                return
 
             # Log when video is downloaded
             if not was_downloaded and v.get('status') == 'DOWNLOADED' and v.get('path'):
                 self._append_log(f"✓ Video cảnh {scene} đã tải về: {v['path']}")
 
-            if data.get('thumb') and os.path.isfile(data['thumb']):
+            if data.get('thumb') and self._isfile_cached(data['thumb']):
                 st['thumb'] = data['thumb']
 
-            # Update SceneResultCard if available
-            if SceneResultCard and scene <= len(self.scene_cards):
-                card = self.scene_cards[scene - 1]
-                if st.get('thumb') and os.path.isfile(st['thumb']):
-                    card.set_image_path(st['thumb'])
-
-            for i in range(self.cards.count()):
-                it = self.cards.item(i)
-                role = it.data(Qt.UserRole)
-                if isinstance(role, tuple) and role == ('scene', scene):
-                    it.setText(self._render_card_text(scene))
-
-                    if st.get('thumb') and os.path.isfile(st['thumb']):
-                        pix = QPixmap(st['thumb']).scaled(
-                            self.cards.iconSize(),
-                            Qt.KeepAspectRatio,
-                            Qt.SmoothTransformation
-                        )
-                        it.setIcon(QIcon(pix))
-
-                    col = self._t2v_status_color(v.get('status'))
-                    if col:
-                        it.setBackground(col)
-                    break
+            # Card widgets are updated in batches: status pings arrive in bursts and
+            # only the latest state of each scene needs to be shown
+            self._dirty_scenes.add(scene)
+            if not self._card_flush_scheduled:
+                self._card_flush_scheduled = True
+                QTimer.singleShot(50, self._flush_card_updates)
         except KeyboardInterrupt:
             # Gracefully handle Ctrl+C interruption
             self._append_log("[INFO] Đã nhận tín hiệu dừng từ người dùng")
@@ -2373,16 +2998,39 @@ class Text2VideoPanelV5(QWidget):
             # Log other errors but don't crash the application
             self._append_log(f"[WARN] Lỗi khi cập nhật job card: {e}")
 
-    def _t2v_status_color(self, status):
-        """Get color for video status"""
-        s = (status or "").upper()
-        if s in ("QUEUED", "PROCESSING", "RENDERING", "DOWNLOADING"):
-            return QColor("#36D1BE")
-        if s in ("COMPLETED", "DOWNLOADED", "UPSCALED_4K"):
-            return QColor("#3FD175")
-        if s in ("ERROR", "FAILED"):
-            return QColor("#ED6D6A")
-        return None
+    def _isfile_cached(self, path, ttl=2.0):
+        """os.path.isfile with a positive answer reused for `ttl` seconds
+
+        Job card updates repeat the same thumbnail path many times per second; on
+        network or synced project folders each stat is slow. Misses are not cached,
+        so a thumbnail shows up as soon as its download finishes.
+        """
+        now = time.monotonic()
+        checked_at = self._file_exists_cache.get(path)
+        if checked_at is not None and now - checked_at < ttl:
+            return True
+        if os.path.isfile(path):
+            self._file_exists_cache[path] = now
+            return True
+        self._file_exists_cache.pop(path, None)
+        return False
+
+    def _flush_card_updates(self):
+        """Apply the state of every scene changed since the last flush to its card"""
+        self._card_flush_scheduled = False
+        dirty, self._dirty_scenes = self._dirty_scenes, set()
+        if not SceneResultCard:
+            return
+        for scene in sorted(dirty):
+            # Update SceneResultCard if available
+            if scene > len(self.scene_cards):
+                continue
+            thumb = self._cards_state.get(scene, {}).get('thumb')
+            if thumb:
+                try:
+                    self.scene_cards[scene - 1].set_image_path(thumb)
+                except Exception as e:
+                    self._append_log(f"[WARN] Lỗi khi cập nhật job card: {e}")
 
     def _t2v_get_copies(self):
         """Get number of video copies"""
@@ -2403,6 +3051,16 @@ class Text2VideoPanelV5(QWidget):
                 "Hãy viết kịch bản trước để tạo cấu trúc dự án."
             )
 
+    def _scene_context(self, row):
+        """(location context, dialogues) of the script scene shown in table row `row`"""
+        scene_list = (self._script_data or {}).get("scenes") or []
+        if row >= len(scene_list):
+            return None, []
+        scene = scene_list[row]
+        location_ctx = extract_location_context(scene) if extract_location_context else None
+        # Part G: Extract dialogues for voiceover
+        return location_ctx, scene.get("dialogues", [])
+
     def _open_prompt_view(self, row):
         """Open prompt viewer for row"""
         if row < 0 or row >= self.table.rowCount():
@@ -2413,15 +3071,7 @@ class Text2VideoPanelV5(QWidget):
         lang_code = self.cb_out_lang.currentData()
         voice_settings = self.get_voice_settings()
 
-        location_ctx = None
-        dialogues = []
-        if self._script_data and "scenes" in self._script_data:
-            scene_list = self._script_data["scenes"]
-            if row < len(scene_list):
-                if extract_location_context:
-                    location_ctx = extract_location_context(scene_list[row])
-                # Part G: Extract dialogues for voiceover
-                dialogues = scene_list[row].get("dialogues", [])
+        location_ctx, dialogues = self._scene_context(row)
 
         if build_prompt_json:
             # Get additional parameters for enhanced prompt JSON
@@ -2457,43 +3107,13 @@ class Text2VideoPanelV5(QWidget):
             try:
                 from ui.prompt_viewer import PromptViewer
                 dlg = PromptViewer(
-                    json.dumps(j, ensure_ascii=False, indent=2),
+                    json_dumps(j, indent=True),
                     None, self
                 )
                 dlg.exec_()
             except ImportError:
                 self._append_log("[WARN] PromptViewer not available")
 
-    def _open_card_prompt(self, it):
-        """Open prompt from card"""
-        try:
-            role = it.data(Qt.UserRole)
-            scene = None
-            if isinstance(role, tuple) and role[0] == 'scene':
-                scene = int(role[1])
-            if not scene:
-                return
-
-            st = self._cards_state.get(scene, {})
-            txt = st.get('prompt_json', '')
-
-            if not txt:
-                pr = getattr(self, '_project_root', '')
-                if pr:
-                    p = os.path.join(pr, '02_Prompts', f'scene_{scene:02d}.json')
-                    if os.path.isfile(p):
-                        txt = open(p, 'r', encoding='utf-8').read()
-
-            if txt:
-                try:
-                    from ui.prompt_viewer import PromptViewer
-                    dlg = PromptViewer(txt, None, self)
-                    dlg.exec_()
-                except ImportError:
-                    pass
-        except Exception:
-            pass
-
     def _on_generate_bible(self):
         """Generate detailed character bible"""
         if not self._script_data:
@@ -2520,7 +3140,7 @@ class Text2VideoPanelV5(QWidget):
             if isinstance(data, str):
                 try:
                     # Try to parse as JSON
-                    script_dict = json.loads(data)
+                    script_dict = json_loads(data)
                 except json.JSONDecodeError:
                     # Not JSON - cannot extract character bible from plain text
                     QMessageBox.warning(
@@ -2613,71 +3233,88 @@ class Text2VideoPanelV5(QWidget):
         """Display social media content with interactive copy buttons"""
         if not social_data:
             return
-
-        # Clear existing widgets
-        while self.social_content_layout.count():
-            item = self.social_content_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
+        if self._defer_until_tab_shown(self._social_tab, partial(self._display_social_media, social_data)):
+            return
 
         # Get versions from social_data
         versions = social_data.get("versions", [])
-        if not versions:
-            # Try old format (casual, professional, funny)
-            versions = []
-            if "casual" in social_data:
-                versions.append(("📱 VERSION 1: CASUAL/FRIENDLY", social_data["casual"]))
-            if "professional" in social_data:
-                versions.append(("💼 VERSION 2: PROFESSIONAL", social_data["professional"]))
-            if "funny" in social_data:
-                versions.append(("😂 VERSION 3: FUNNY/ENGAGING", social_data["funny"]))
-        else:
+        if versions:
             # New format with versions array
-            version_titles = [
-                "📱 VERSION 1: CASUAL/FRIENDLY",
-                "💼 VERSION 2: PROFESSIONAL",
-                "😂 VERSION 3: FUNNY/ENGAGING"
-            ]
-            versions = [(version_titles[i] if i < len(version_titles) else f"📱 VERSION {i+1}", v)
-                       for i, v in enumerate(versions)]
-
-        # Build GroupBox for each version
-        for title, version_data in versions:
-            if isinstance(version_data, dict):
-                self._build_social_version_card(title, version_data)
+            versions = [(_VERSION_TITLES[i] if i < len(_VERSION_TITLES) else f"📱 VERSION {i+1}", v)
+                        for i, v in enumerate(versions)]
+        else:
+            # Try old format (casual, professional, funny)
+            versions = [(title, social_data[key])
+                        for title, key in zip(_VERSION_TITLES, _LEGACY_VERSION_KEYS)
+                        if key in social_data]
+        if not versions:
+            return  # Nothing to show; keep the current cards instead of rebuilding
 
-        self.social_content_layout.addStretch()
+        versions = [(title, v) for title, v in versions if isinstance(v, dict)]
 
-    def _build_social_version_card(self, title: str, data: dict):
-        """Build a social media version card with copy buttons"""
+        # One relayout/repaint for the whole tab instead of one per added or refilled widget
+        self.social_content_widget.setUpdatesEnabled(False)
+        try:
+            # Regenerated content usually has the same number of versions: refill the
+            # existing cards and only rebuild the widgets when the count changes
+            if len(versions) != len(self._social_cards):
+                # Clear existing widgets
+                while self.social_content_layout.count():
+                    item = self.social_content_layout.takeAt(0)
+                    if item.widget():
+                        item.widget().deleteLater()
+                self._social_cards = [self._build_social_version_card() for _ in versions]
+                self.social_content_layout.addStretch()
+
+            for card, (title, version_data) in zip(self._social_cards, versions):
+                self._fill_social_version_card(card, title, version_data)
+        finally:
+            # Malformed model output must not leave the tab unpainted
+            self.social_content_widget.setUpdatesEnabled(True)
+
+    def _build_social_version_card(self):
+        """Build an empty social media version card with copy buttons
+
+        Returns the widgets _fill_social_version_card updates.
+        """
         # Create GroupBox with ocean blue theme
-        group = QGroupBox(title)
-        group.setFont(QFont("Segoe UI", 14, QFont.Bold))
-        group.setStyleSheet("""
-            QGroupBox {
-                background: #E1F5FE;
-                border: 2px solid #00ACC1;
-                border-radius: 8px;
-                margin-top: 16px;
-                padding: 16px;
-                font-weight: bold;
-                font-size: 14pt;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                subcontrol-position: top left;
-                padding: 6px 12px;
-                background: #00ACC1;
-                color: white;
-                border-radius: 4px;
-                left: 12px;
-                top: 8px;
-            }
-        """)
+        group = QGroupBox()
+        group.setObjectName("socialVersion")
+        group.setFont(FONT_SOCIAL_TITLE)
 
         layout = QVBoxLayout(group)
         layout.setSpacing(10)
 
+        card = {"group": group, "all_text": ""}
+
+        # Platform
+        card["platform"] = lbl = QLabel()
+        lbl.setObjectName("socialHeading")
+        lbl.setFont(FONT_SOCIAL_PLATFORM)
+        layout.addWidget(lbl)
+
+        # (key, title, text box height or None for a wrapped label, copy button text)
+        for key, heading, max_h, copy_text in (
+            ("caption", "📝 CAPTION:", 100, "📋 Copy Caption"),
+            ("hashtags", "🏷️ HASHTAGS:", 60, "📋 Copy Hashtags"),
+            ("cta", "📢 CALL TO ACTION:", None, None),
+        ):
+            frame, card[key] = self._make_readonly_block(heading, max_h, copy_text)
+            card[key + "_frame"] = frame
+            layout.addWidget(frame)
+
+        # Copy All button
+        btn_copy_all = QPushButton("📋 Copy All")
+        btn_copy_all.setObjectName("socialCopyAllBtn")
+        btn_copy_all.setMaximumWidth(150)
+        btn_copy_all.clicked.connect(partial(self._copy_social_card, card))
+        layout.addWidget(btn_copy_all)
+
+        self.social_content_layout.addWidget(group)
+        return card
+
+    def _fill_social_version_card(self, card, title: str, data: dict):
+        """Show one version's content in a card from _build_social_version_card"""
         # Extract data
         caption = data.get("caption", "") or data.get("title", "") or data.get("description", "")
         hashtags_list = data.get("hashtags", [])
@@ -2685,125 +3322,61 @@ class Text2VideoPanelV5(QWidget):
         platform = data.get("platform", "")
         cta = data.get("cta", "")
 
-        # Platform
-        if platform:
-            lbl = QLabel(f"🎯 Platform: {platform}")
-            lbl.setFont(QFont("Segoe UI", 12, QFont.Bold))
-            lbl.setStyleSheet("color: #00838F;")
-            layout.addWidget(lbl)
-
-        # Caption section
-        caption_frame = QFrame()
-        caption_frame.setStyleSheet("background: white; border-radius: 4px; padding: 8px;")
-        caption_layout = QVBoxLayout(caption_frame)
-        caption_layout.setContentsMargins(8, 8, 8, 8)
-
-        lbl = QLabel("📝 CAPTION:")
-        lbl.setFont(QFont("Segoe UI", 11, QFont.Bold))
-        lbl.setStyleSheet("color: #00838F;")
-        caption_layout.addWidget(lbl)
-
-        caption_text = QTextEdit()
-        caption_text.setPlainText(caption)
-        caption_text.setReadOnly(True)
-        caption_text.setMaximumHeight(100)
-        caption_text.setStyleSheet("border: 1px solid #ddd; border-radius: 4px; padding: 6px;")
-        caption_layout.addWidget(caption_text)
-
-        btn_copy_caption = QPushButton("📋 Copy Caption")
-        btn_copy_caption.setMaximumWidth(150)
-        btn_copy_caption.setStyleSheet("""
-            QPushButton {
-                background: #00ACC1;
-                color: white;
-                border: none;
-                border-radius: 4px;
-                padding: 6px 12px;
-                font-weight: bold;
-            }
-            QPushButton:hover { background: #00838F; }
-        """)
-        btn_copy_caption.clicked.connect(lambda: self._copy_to_clipboard(caption))
-        caption_layout.addWidget(btn_copy_caption)
-
-        layout.addWidget(caption_frame)
-
-        # Hashtags section
-        if hashtags:
-            hashtag_frame = QFrame()
-            hashtag_frame.setStyleSheet("background: white; border-radius: 4px; padding: 8px;")
-            hashtag_layout = QVBoxLayout(hashtag_frame)
-            hashtag_layout.setContentsMargins(8, 8, 8, 8)
-
-            lbl = QLabel("🏷️ HASHTAGS:")
-            lbl.setFont(QFont("Segoe UI", 11, QFont.Bold))
-            lbl.setStyleSheet("color: #00838F;")
-            hashtag_layout.addWidget(lbl)
-
-            hashtag_text = QTextEdit()
-            hashtag_text.setPlainText(hashtags)
-            hashtag_text.setReadOnly(True)
-            hashtag_text.setMaximumHeight(60)
-            hashtag_text.setStyleSheet("border: 1px solid #ddd; border-radius: 4px; padding: 6px;")
-            hashtag_layout.addWidget(hashtag_text)
-
-            btn_copy_hashtags = QPushButton("📋 Copy Hashtags")
-            btn_copy_hashtags.setMaximumWidth(150)
-            btn_copy_hashtags.setStyleSheet("""
-                QPushButton {
-                    background: #00ACC1;
-                    color: white;
-                    border: none;
-                    border-radius: 4px;
-                    padding: 6px 12px;
-                    font-weight: bold;
-                }
-                QPushButton:hover { background: #00838F; }
-            """)
-            btn_copy_hashtags.clicked.connect(lambda: self._copy_to_clipboard(hashtags))
-            hashtag_layout.addWidget(btn_copy_hashtags)
-
-            layout.addWidget(hashtag_frame)
-
-        # CTA
-        if cta:
-            cta_frame = QFrame()
-            cta_frame.setStyleSheet("background: white; border-radius: 4px; padding: 8px;")
-            cta_layout = QVBoxLayout(cta_frame)
-            cta_layout.setContentsMargins(8, 8, 8, 8)
-
-            lbl = QLabel("📢 CALL TO ACTION:")
-            lbl.setFont(QFont("Segoe UI", 11, QFont.Bold))
-            lbl.setStyleSheet("color: #00838F;")
-            cta_layout.addWidget(lbl)
+        card["group"].setTitle(title)
+        card["platform"].setText(f"🎯 Platform: {platform}")
+        card["platform"].setVisible(bool(platform))
+        # The caption block is shown even when empty, the others only with content
+        card["caption"].setPlainText(caption)
+        card["hashtags"].setPlainText(hashtags)
+        card["hashtags_frame"].setVisible(bool(hashtags))
+        card["cta"].setText(cta)
+        card["cta_frame"].setVisible(bool(cta))
+        card["all_text"] = f"{caption}\n\n{hashtags}" + (f"\n\n{cta}" if cta else "")
+
+    def _make_readonly_block(self, title, max_h=None, copy_text=None):
+        """One section of a social version card: heading, read-only text, optional copy button
+
+        max_h: height of a read-only text box; None shows the text as a wrapped label
+        copy_text: label of a button copying the box's current text; None for no button
+        Returns (frame, text widget).
+        """
+        frame = QFrame()
+        frame.setObjectName("socialSection")
+        frame_layout = QVBoxLayout(frame)
+        frame_layout.setContentsMargins(8, 8, 8, 8)
+
+        lbl = QLabel(title)
+        lbl.setObjectName("socialHeading")
+        lbl.setFont(FONT_SOCIAL_SECTION)
+        frame_layout.addWidget(lbl)
+
+        if max_h is None:
+            text = QLabel()
+            text.setObjectName("socialCta")
+            text.setWordWrap(True)
+        else:
+            text = QPlainTextEdit()
+            text.setObjectName("socialText")
+            text.setReadOnly(True)
+            text.setMaximumHeight(max_h)
+        frame_layout.addWidget(text)
 
-            cta_label = QLabel(cta)
-            cta_label.setWordWrap(True)
-            cta_label.setStyleSheet("border: 1px solid #ddd; border-radius: 4px; padding: 6px; background: #f9f9f9;")
-            cta_layout.addWidget(cta_label)
+        if copy_text:
+            btn = QPushButton(copy_text)
+            btn.setObjectName("socialCopyBtn")
+            btn.setMaximumWidth(150)
+            btn.clicked.connect(partial(self._copy_widget_text, text))
+            frame_layout.addWidget(btn)
 
-            layout.addWidget(cta_frame)
+        return frame, text
 
-        # Copy All button
-        btn_copy_all = QPushButton("📋 Copy All")
-        btn_copy_all.setMaximumWidth(150)
-        btn_copy_all.setStyleSheet("""
-            QPushButton {
-                background: #0277BD;
-                color: white;
-                border: none;
-                border-radius: 4px;
-                padding: 8px 16px;
-                font-weight: bold;
-                font-size: 13px;
-            }
-            QPushButton:hover { background: #01579B; }
-        """)
-        all_text = f"{caption}\n\n{hashtags}" + (f"\n\n{cta}" if cta else "")
-        btn_copy_all.clicked.connect(lambda: self._copy_to_clipboard(all_text))
-        layout.addWidget(btn_copy_all)
+    def _copy_social_card(self, card, checked=False):
+        """Copy All button of a social version card"""
+        self._copy_to_clipboard(card["all_text"])
 
-        self.social_content_layout.addWidget(group)
+    def _copy_widget_text(self, widget, checked=False):
+        """Copy button of a social card section: copies the text it currently shows"""
+        self._copy_to_clipboard(widget.toPlainText())
 
     def _copy_to_clipboard(self, text: str):
         """Copy text to clipboard with error handling"""
@@ -2822,35 +3395,35 @@ class Text2VideoPanelV5(QWidget):
         if not thumbnail_data:
             return
 
-        content_parts = []
-        content_parts.append("=" * 60)
-        content_parts.append("🖼️ THUMBNAIL DESIGN SPECIFICATIONS")
-        content_parts.append("=" * 60)
+        rule = "=" * 60
+        content_parts = [rule, "🖼️ THUMBNAIL DESIGN SPECIFICATIONS", rule]
 
         if "concept" in thumbnail_data:
-            content_parts.append("\n💡 CONCEPT:")
-            content_parts.append(thumbnail_data["concept"])
+            content_parts += ("\n💡 CONCEPT:", thumbnail_data["concept"])
 
         if "color_palette" in thumbnail_data:
             content_parts.append("\n\n🎨 COLOR PALETTE:")
-            for color in thumbnail_data["color_palette"]:
-                content_parts.append(
-                    f"  • {color.get('name', '')}: {color.get('hex', '')} - "
-                    f"{color.get('usage', '')}"
-                )
+            content_parts.extend(
+                f"  • {color.get('name', '')}: {color.get('hex', '')} - {color.get('usage', '')}"
+                for color in thumbnail_data["color_palette"]
+            )
 
         if "typography" in thumbnail_data:
             typo = thumbnail_data["typography"]
-            content_parts.append("\n\n✍️ TYPOGRAPHY:")
-            content_parts.append(f"  • Main Text: {typo.get('main_text', '')}")
-            content_parts.append(f"  • Font: {typo.get('font_family', '')}")
-            content_parts.append(f"  • Size: {typo.get('font_size', '')}")
+            content_parts += (
+                "\n\n✍️ TYPOGRAPHY:",
+                f"  • Main Text: {typo.get('main_text', '')}",
+                f"  • Font: {typo.get('font_family', '')}",
+                f"  • Size: {typo.get('font_size', '')}",
+            )
 
         if "layout" in thumbnail_data:
             layout = thumbnail_data["layout"]
-            content_parts.append("\n\n📐 LAYOUT:")
-            content_parts.append(f"  • Composition: {layout.get('composition', '')}")
-            content_parts.append(f"  • Focal Point: {layout.get('focal_point', '')}")
+            content_parts += (
+                "\n\n📐 LAYOUT:",
+                f"  • Composition: {layout.get('composition', '')}",
+                f"  • Focal Point: {layout.get('focal_point', '')}",
+            )
 
         self.thumbnail_display.setPlainText("\n".join(content_parts))
 
@@ -2873,7 +3446,7 @@ class Text2VideoPanelV5(QWidget):
             self.slider_rate.setValue(preset_rate)
 
             pitch_str = style_config["google_tts"]["pitch"]
-            match = re.match(r'([+-]?\d+)st', pitch_str)
+            match = _PITCH_RE.match(pitch_str)
             preset_pitch = int(match.group(1)) if match else 0
             self.slider_pitch.setValue(preset_pitch)
 
@@ -2882,22 +3455,22 @@ class Text2VideoPanelV5(QWidget):
 
     def _on_rate_changed(self, value):
         """Handle rate slider change"""
-        multiplier = value / 100.0
-        self.lbl_rate.setText(f"{multiplier:.1f}x")
+        self._slider_timer.start()
 
     def _on_pitch_changed(self, value):
         """Handle pitch slider change"""
-        if value > 0:
-            self.lbl_pitch.setText(f"+{value}st")
-        elif value < 0:
-            self.lbl_pitch.setText(f"{value}st")
-        else:
-            self.lbl_pitch.setText("0st")
+        self._slider_timer.start()
 
     def _on_expressiveness_changed(self, value):
         """Handle expressiveness slider change"""
-        decimal = value / 100.0
-        self.lbl_expressiveness.setText(f"{decimal:.1f}")
+        self._slider_timer.start()
+
+    def _update_slider_labels(self):
+        """Show the current rate, pitch and expressiveness slider values"""
+        self.lbl_rate.setText(f"{self.slider_rate.value() / 100.0:.1f}x")
+        pitch = self.slider_pitch.value()
+        self.lbl_pitch.setText(f"{pitch:+d}st" if pitch else "0st")
+        self.lbl_expressiveness.setText(f"{self.slider_expressiveness.value() / 100.0:.1f}")
 
     def _on_domain_changed(self):
         """Handle domain selection - load topics"""
@@ -2954,15 +3527,13 @@ class Text2VideoPanelV5(QWidget):
             self.cb_domain.blockSignals(True)
             self.cb_domain.clear()
             self.cb_domain.addItem("(Không chọn)", "")
-            
-            if get_all_domains:
-                for domain in get_all_domains():
-                    self.cb_domain.addItem(domain, domain)
+            self.cb_domain.set_populator(lambda cb: _add_domain_items(cb, get_all_domains))
             
             self.cb_domain.blockSignals(False)
             
             # Restore selections if possible
             if current_domain:
+                self.cb_domain.ensure_populated()
                 index = self.cb_domain.findData(current_domain)
                 if index >= 0:
                     self.cb_domain.setCurrentIndex(index)
@@ -2981,36 +3552,62 @@ class Text2VideoPanelV5(QWidget):
             self._append_log(f"[ERR] Lỗi khi reload prompts: {e}")
 
     def _load_voices_for_provider(self):
-        """BUG FIX #3: Load voices for selected provider and language"""
+        """BUG FIX #3: Load voices for selected provider and language (on the thread pool)"""
         try:
             provider = self.cb_tts_provider.currentData()
             language = self.cb_out_lang.currentData()
 
             if not provider or not get_voices_for_provider:
                 return
+            if (provider, language) == self._voices_key:
+                return  # Same list as already loaded/loading
+            self._voices_key = (provider, language)
 
             # BUG FIX #3: Add logging to confirm language-specific voice loading
             self._append_log(f"[INFO] Loading voices for provider={provider}, language={language}")
 
-            voices = get_voices_for_provider(provider, language)
+            # Newer requests supersede older ones still running
+            self._voices_request_id += 1
+            QThreadPool.globalInstance().start(
+                _LoadVoicesTask(self._voices_request_id, provider, language, self._voices_signals)
+            )
 
-            self.cb_voice.blockSignals(True)
-            self.cb_voice.clear()
+        except Exception as e:
+            self._append_log(f"[ERR] Failed to load voices: {e}")
 
+    def _apply_voices(self, request_id, provider, language, voices):
+        """Fill cb_voice with the result of _LoadVoicesTask"""
+        if request_id != self._voices_request_id:
+            return  # Provider/language changed again while this list was loading
+
+        # ElevenLabs/OpenAI offer the same voices for every language: keep the combo
+        # (and the user's selection) when the list did not change
+        voice_ids = tuple(voice.get("id") for voice in voices)
+        if voice_ids == self._voice_ids:
+            return
+        self._voice_ids = voice_ids
+
+        self.cb_voice.setUpdatesEnabled(False)
+        self.cb_voice.blockSignals(True)
+        try:
+            self.cb_voice.clear()
             for voice in voices:
                 display_name = voice.get("name", voice.get("id", "Unknown"))
                 voice_id = voice.get("id")
                 self.cb_voice.addItem(display_name, voice_id)
-
+        finally:
             self.cb_voice.blockSignals(False)
+            self.cb_voice.setUpdatesEnabled(True)
 
-            if voices:
-                self._append_log(f"[INFO] Loaded {len(voices)} voices for {language}")
-            else:
-                self._append_log(f"[WARN] No voices found for provider={provider}, language={language}")
+        if voices:
+            self._append_log(f"[INFO] Loaded {len(voices)} voices for {language}")
+        else:
+            self._append_log(f"[WARN] No voices found for provider={provider}, language={language}")
 
-        except Exception as e:
-            self._append_log(f"[ERR] Failed to load voices: {e}")
+    def _on_voices_failed(self, request_id, error):
+        if request_id == self._voices_request_id:
+            self._voices_key = None  # Let the next change try again
+            self._append_log(f"[ERR] Failed to load voices: {error}")
 
     def get_voice_settings(self):
         """Get current voice settings"""
@@ -3049,63 +3646,76 @@ class Text2VideoPanelV5(QWidget):
     def _update_folder_label(self, folder_path=None):
         """Update folder label"""
         if not folder_path and cfg:
-            st = cfg.load()
+            st = cfg.load_cached()
             folder_path = st.get("download_root") or "Chưa đặt"
 
-        if folder_path and len(folder_path) > 40:
-            folder_path = "..." + folder_path[-37:]
+        n = len(folder_path) if folder_path else 0
+        if n > 40:
+            folder_path = "…" + folder_path[n - 39:]  # Keep the tail; 40 chars in total
 
         self.lbl_download_folder.setText(f"Thư mục: {folder_path}")
 
+    def _confirm_async(self, title, text, on_yes, on_no=None, default=QMessageBox.Yes,
+                       icon=QMessageBox.Question):
+        """Ask a Yes/No question without a nested event loop (unlike QMessageBox.question)
+
+        The box is opened window-modal; on_yes or on_no runs when it closes.
+        """
+        box = QMessageBox(icon, title, text, QMessageBox.Yes | QMessageBox.No, self)
+        box.setDefaultButton(default)
+        box.setAttribute(Qt.WA_DeleteOnClose)
+
+        def _on_finished(_result):
+            if box.clickedButton() == box.button(QMessageBox.Yes):
+                on_yes()
+            elif on_no is not None:
+                on_no()
+
+        box.finished.connect(_on_finished)
+        box.open()
+
     def _clear_current_project(self):
         """Clear current project workspace"""
-        reply = QMessageBox.question(
-            self, 'Xác nhận xóa dự án',
+        self._confirm_async(
+            'Xác nhận xóa dự án',
             'Bạn có chắc muốn xóa dự án hiện tại?\n\n'
             '⚠️ Files đã tải về sẽ KHÔNG bị xóa.',
-            QMessageBox.Yes | QMessageBox.No,
-            QMessageBox.No
+            self._confirm_clear_while_running,
+            default=QMessageBox.No
         )
 
-        if reply == QMessageBox.No:
+    def _confirm_clear_while_running(self):
+        """Second confirmation of _clear_current_project when a video is being generated"""
+        # Check if video generating
+        if not self.btn_stop.isEnabled():
+            self._do_clear_project()
             return
+        self._confirm_async(
+            'Video đang tạo',
+            'Bạn có chắc muốn dừng và xóa?',
+            self._do_clear_project,
+            default=QMessageBox.No,
+            icon=QMessageBox.Warning
+        )
 
-        # Check if video generating
-        if self.btn_stop.isEnabled():
-            reply_stop = QMessageBox.warning(
-                self, 'Video đang tạo',
-                'Bạn có chắc muốn dừng và xóa?',
-                QMessageBox.Yes | QMessageBox.No,
-                QMessageBox.No
-            )
-            if reply_stop == QMessageBox.No:
-                return
+    def _do_clear_project(self):
+        """Reset the workspace once _clear_current_project is confirmed"""
+        if self.btn_stop.isEnabled() or self._active_workers:
             self.stop_processing()
 
         # Clear UI
         self.ed_project.clear()
         self.ed_idea.clear()
 
-        if hasattr(self, 'cb_domain'):
-            self.cb_domain.setCurrentIndex(0)
-        if hasattr(self, 'cb_topic'):
-            self.cb_topic.clear()
-            self.cb_topic.addItem("(Chọn lĩnh vực để load chủ đề)", "")
-            self.cb_topic.setEnabled(False)
+        self.cb_domain.setCurrentIndex(0)
+        self.cb_topic.clear()
+        self.cb_topic.addItem("(Chọn lĩnh vực để load chủ đề)", "")
+        self.cb_topic.setEnabled(False)
 
         self.view_story.clear()
-        if hasattr(self, 'view_bible'):
-            self.view_bible.clear()
-
-        if hasattr(self, 'table'):
-            self.table.setRowCount(0)
-
-        self.cards.clear()
-
-        if hasattr(self, 'social_display'):
-            self.social_display.clear()
-        if hasattr(self, 'thumbnail_display'):
-            self.thumbnail_display.clear()
+        self.view_bible.clear()
+        self.table.setRowCount(0)
+        self.thumbnail_display.clear()
 
         # Reset state
         self._ctx = {}
@@ -3113,14 +3723,15 @@ class Text2VideoPanelV5(QWidget):
         self._character_bible = None
         self._script_data = None
         self._cards_state = {}
+        self._pending_tab_updates.clear()
+        self._file_exists_cache.clear()
 
         self.btn_generate_bible.setEnabled(False)
         self.btn_clear_project.setEnabled(False)
 
         self._append_log("[INFO] ✅ Đã xóa dự án hiện tại.")
 
-        if hasattr(self, 'result_tabs'):
-            self.result_tabs.setCurrentIndex(0)
+        self.result_tabs.setCurrentIndex(0)
 
     def _switch_view(self, view_type):
         """Switch between Card and Storyboard views"""
@@ -3136,22 +3747,20 @@ class Text2VideoPanelV5(QWidget):
 
     def _refresh_storyboard(self):
         """Refresh storyboard with current scenes"""
-        self.storyboard_view.clear()
-        for scene_num in sorted(self._cards_state.keys()):
-            st = self._cards_state[scene_num]
-            prompt = st.get('tgt', st.get('vi', ''))
-            thumb = st.get('thumb', '')
-            self.storyboard_view.add_scene(scene_num, thumb, prompt, st)
-
-    def _open_card_prompt_detail(self, item):
-        """Open detail dialog on double-click"""
-        try:
-            role = item.data(Qt.UserRole)
-            if isinstance(role, tuple) and role[0] == 'scene':
-                self._show_prompt_detail(int(role[1]))
-        except (AttributeError, ValueError, IndexError) as e:
-            print(f"[Warning] Could not show prompt detail: {e}")
-            pass
+        if self._defer_until_tab_shown(self._scenes_tab, self._refresh_storyboard):
+            return
+        view = self.storyboard_view
+        with view.bulk_add():
+            view.set_project_dir(self._ctx.get("dir_videos"))
+            # Update cards in place: only scenes that are gone lose their card and only
+            # new scenes get one; unchanged cards are skipped by _rebind
+            for scene_num in [n for n in view.scene_cards if n not in self._cards_state]:
+                view.remove_scene(scene_num)
+            for scene_num in sorted(self._cards_state.keys()):
+                st = self._cards_state[scene_num]
+                prompt = st.get('tgt', st.get('vi', ''))
+                thumb = st.get('thumb', '')
+                view.update_scene(scene_num, thumb, prompt, st)
 
     def _show_prompt_detail(self, scene_num):
         """Show prompt detail dialog using PromptViewer"""
@@ -3165,15 +3774,7 @@ class Text2VideoPanelV5(QWidget):
         lang_code = self.cb_out_lang.currentData()
         voice_settings = self.get_voice_settings()
 
-        location_ctx = None
-        dialogues = []
-        if self._script_data and "scenes" in self._script_data:
-            scene_list = self._script_data["scenes"]
-            if row < len(scene_list):
-                if extract_location_context:
-                    location_ctx = extract_location_context(scene_list[row])
-                # Part G: Extract dialogues for voiceover
-                dialogues = scene_list[row].get("dialogues", [])
+        location_ctx, dialogues = self._scene_context(row)
 
         if build_prompt_json:
             # Get additional parameters for enhanced prompt JSON
@@ -3209,12 +3810,41 @@ class Text2VideoPanelV5(QWidget):
             try:
                 from ui.prompt_viewer import PromptViewer
                 dlg = PromptViewer(
-                    json.dumps(j, ensure_ascii=False, indent=2),
+                    json_dumps(j, indent=True),
                     None, self
                 )
                 dlg.exec_()
             except ImportError:
                 self._append_log("[WARN] PromptViewer not available")
+
+    def _snapshot_ui_state(self):
+        """Read the video settings widgets once into a _UIState"""
+        custom_voice = self.ed_custom_voice.text().strip()
+        ratio_key = self.cb_ratio.currentText()
+        quality = self.cb_quality.currentText()
+        model_display = self.cb_model.currentText()
+        return _UIState(
+            lang_code=self.cb_out_lang.currentData(),
+            ratio_key=ratio_key,
+            ratio=_ASPECT_MAP.get(ratio_key, "VIDEO_ASPECT_RATIO_LANDSCAPE"),
+            style=self.cb_style.currentData() or "anime_2d",  # Use data key
+            tts_provider=self.cb_tts_provider.currentData(),
+            voice_id=custom_voice or self.cb_voice.currentData(),
+            voice_name=self.cb_voice.currentText() if not custom_voice else "",
+            domain=self.cb_domain.currentData() or None,
+            topic=self.cb_topic.currentData() or None,
+            prompt_quality=quality if self.cb_quality.isVisible() else None,
+            quality=quality,
+            model_display=model_display,
+            model_key=(
+                get_model_key_from_display(model_display)
+                if get_model_key_from_display
+                else model_display
+            ),
+            upscale_4k=self.cb_upscale.isChecked(),
+            auto_download=self.cb_auto_download.isChecked(),
+        )
+
     def _retry_failed_scene(self, scene_num):
         """BUG FIX #3: Retry failed videos for a specific scene"""
         # ADD: Log function call
@@ -3231,7 +3861,7 @@ class Text2VideoPanelV5(QWidget):
 
         # Count failed videos
         failed_copies = [copy_num for copy_num, info in vids.items()
-                        if info.get('status') in ('FAILED', 'ERROR', 'FAILED_START', 'DONE_NO_URL', 'DOWNLOAD_FAILED')]
+                         if info.get('status') in _FAILED_STATUSES]
 
         # ADD: Log what was found
         self._append_log(f"[INFO] Found {len(failed_copies)} failed video(s) for scene {scene_num}")
@@ -3242,18 +3872,19 @@ class Text2VideoPanelV5(QWidget):
             return
 
         # ADD: More detailed confirmation dialog
-        reply = QMessageBox.question(
-            self, 'Xác nhận retry',
+        self._confirm_async(
+            'Xác nhận retry',
             f'Retry {len(failed_copies)} video lỗi của cảnh {scene_num}?\n\n'
             f'Failed copies: {", ".join(map(str, failed_copies))}\n\n'
             f'Prompt sẽ được gửi lại đến Google Labs Flow API.',
-            QMessageBox.Yes | QMessageBox.No,
-            QMessageBox.Yes
+            partial(self._do_retry, scene_num, failed_copies),
+            on_no=partial(self._append_log, f"[INFO] User cancelled retry for scene {scene_num}"),
         )
 
-        if reply == QMessageBox.No:
-            self._append_log(f"[INFO] User cancelled retry for scene {scene_num}")
-            return
+    def _do_retry(self, scene_num, failed_copies):
+        """Send the failed copies of a scene again, once _retry_failed_scene is confirmed"""
+        if scene_num > self.table.rowCount():
+            return  # Script was cleared or replaced while the dialog was open
 
         self._append_log("[INFO] ✓ User confirmed retry")
         self._append_log(
@@ -3271,13 +3902,10 @@ class Text2VideoPanelV5(QWidget):
         self._append_log(f"[INFO] Scene data - VI: {vi_preview}")
         self._append_log(f"[INFO] Scene data - TGT: {tgt_preview}")
 
-        lang_code = self.cb_out_lang.currentData()
-        ratio_key = self.cb_ratio.currentText()
-        ratio = _ASPECT_MAP.get(ratio_key, "VIDEO_ASPECT_RATIO_LANDSCAPE")
-        style = self.cb_style.currentData() or "anime_2d"  # Use data key
+        ui = self._snapshot_ui_state()
 
         # ADD: Log settings
-        self._append_log(f"[INFO] Settings - Lang: {lang_code}, Ratio: {ratio_key}, Style: {style}")
+        self._append_log(f"[INFO] Settings - Lang: {ui.lang_code}, Ratio: {ui.ratio_key}, Style: {ui.style}")
 
         character_bible_basic = (
             self._script_data.get("character_bible", [])
@@ -3285,31 +3913,10 @@ class Text2VideoPanelV5(QWidget):
         )
         voice_settings = self.get_voice_settings()
 
-        location_ctx = None
-        dialogues = []
-        if self._script_data and "scenes" in self._script_data:
-            scene_list = self._script_data["scenes"]
-            if row < len(scene_list):
-                if extract_location_context:
-                    location_ctx = extract_location_context(scene_list[row])
-                # Part G: Extract dialogues for voiceover
-                dialogues = scene_list[row].get("dialogues", [])
+        location_ctx, dialogues = self._scene_context(row)
 
         # Build prompt JSON for retry
         if build_prompt_json:
-            tts_provider = self.cb_tts_provider.currentData()
-            voice_id = self.ed_custom_voice.text().strip() or self.cb_voice.currentData()
-            voice_name = (
-                self.cb_voice.currentText()
-                if not self.ed_custom_voice.text().strip()
-                else ""
-            )
-            domain = self.cb_domain.currentData() or None
-            topic = self.cb_topic.currentData() or None
-            quality_text = (
-                self.cb_quality.currentText() if self.cb_quality.isVisible() else None
-            )
-
             # ADD: Get base_seed and style_seed from context for consistency
             base_seed = self._ctx.get("base_seed") if self._ctx else None
             style_seed = self._ctx.get("style_seed") if self._ctx else None
@@ -3318,55 +3925,48 @@ class Text2VideoPanelV5(QWidget):
             self._append_log(f"[INFO] Building prompt JSON for scene {scene_num}...")
 
             j = build_prompt_json(
-                scene_num, vi, tgt, lang_code, ratio_key, style,
+                scene_num, vi, tgt, ui.lang_code, ui.ratio_key, ui.style,
                 character_bible=character_bible_basic,
                 enhanced_bible=self._character_bible,
                 voice_settings=voice_settings,
                 location_context=location_ctx,
-                tts_provider=tts_provider,
-                voice_id=voice_id,
-                voice_name=voice_name,
-                domain=domain,
-                topic=topic,
-                quality=quality_text,
+                tts_provider=ui.tts_provider,
+                voice_id=ui.voice_id,
+                voice_name=ui.voice_name,
+                domain=ui.domain,
+                topic=ui.topic,
+                quality=ui.prompt_quality,
                 dialogues=dialogues,
                 base_seed=base_seed,  # Use same seed for character consistency
                 style_seed=style_seed  # PR #8: Use same seed for style consistency
             )
 
             # ADD: Log prompt JSON size
-            prompt_json_str = json.dumps(j, ensure_ascii=False, indent=2)
+            prompt_json_str = json_dumps(j, indent=True)
             self._append_log(f"[INFO] Prompt JSON size: {len(prompt_json_str)} chars")
 
             # BUG FIX: Include actual_scene_num so VideoWorker uses correct scene number
             scenes = [{
                 "prompt": prompt_json_str,
-                "aspect": ratio,
+                "aspect": ui.ratio,
                 "actual_scene_num": scene_num  # CRITICAL: Pass actual scene number for retry
             }]
         else:
             self._append_log("[ERR] build_prompt_json not available")
             return
 
-        model_display = self.cb_model.currentText()
-        model_key = (
-            get_model_key_from_display(model_display)
-            if get_model_key_from_display
-            else model_display
-        )
-
         # ADD: Log model info
-        self._append_log(f"[INFO] Using model: {model_display} (key: {model_key})")
+        self._append_log(f"[INFO] Using model: {ui.model_display} (key: {ui.model_key})")
 
         payload = dict(
             scenes=scenes,
             copies=len(failed_copies),  # Retry only failed count
-            model_key=model_key,
+            model_key=ui.model_key,
             title=self._title,
             dir_videos=self._ctx.get("dir_videos", ""),
-            upscale_4k=self.cb_upscale.isChecked(),
-            auto_download=self.cb_auto_download.isChecked(),
-            quality=self.cb_quality.currentText()
+            upscale_4k=ui.upscale_4k,
+            auto_download=ui.auto_download,
+            quality=ui.quality
         )
 
         if not payload["dir_videos"]:
@@ -3421,7 +4021,7 @@ class Text2VideoPanelV5(QWidget):
             # Get folder path - use project-specific folder, not just download root
             folder_path = ""
             if cfg:
-                state = cfg.load()
+                state = cfg.load_cached()
                 download_root = state.get("download_root", "")
                 if download_root and self._title:
                     sanitized_title = sanitize_project_name(self._title)
@@ -3441,8 +4041,8 @@ class Text2VideoPanelV5(QWidget):
                     panel_type="text2video"
                 )
                 
-                # Refresh history widget if available
-                if hasattr(self, 'history_widget') and self.history_widget:
+                # Refresh history widget if it has been opened (otherwise it loads fresh)
+                if self.history_widget is not None:
                     self.history_widget.refresh()
                 
                 self._append_log(f"[INFO] ✅ Đã lưu vào lịch sử: {video_count} video")
@@ -3514,18 +4114,19 @@ class Text2VideoPanelV5(QWidget):
             num_copies = self._t2v_get_copies()
         
         # Confirmation dialog
-        reply = QMessageBox.question(
-            self, 'Xác nhận tạo lại video',
+        self._confirm_async(
+            'Xác nhận tạo lại video',
             f'Tạo lại {num_copies} video cho cảnh {scene_num}?\n\n'
             f'Video mới sẽ được tạo với cùng phong cách và cài đặt.\n'
             f'Prompt sẽ được gửi đến Google Labs Flow API.',
-            QMessageBox.Yes | QMessageBox.No,
-            QMessageBox.Yes
+            partial(self._do_regenerate, scene_num, num_copies),
+            on_no=partial(self._append_log, f"[INFO] User cancelled regenerate for scene {scene_num}"),
         )
 
-        if reply == QMessageBox.No:
-            self._append_log(f"[INFO] User cancelled regenerate for scene {scene_num}")
-            return
+    def _do_regenerate(self, scene_num, num_copies):
+        """Generate new videos for a scene, once _regenerate_scene_video is confirmed"""
+        if scene_num > self.table.rowCount():
+            return  # Script was cleared or replaced while the dialog was open
 
         self._append_log("[INFO] ✓ User confirmed regenerate")
         self._append_log(f"[INFO] Đang tạo lại {num_copies} video cho cảnh {scene_num}...")
@@ -3542,13 +4143,10 @@ class Text2VideoPanelV5(QWidget):
         self._append_log(f"[INFO] Scene data - TGT: {tgt_preview}")
 
         # Get current settings
-        lang_code = self.cb_out_lang.currentData()
-        ratio_key = self.cb_ratio.currentText()
-        ratio = _ASPECT_MAP.get(ratio_key, "VIDEO_ASPECT_RATIO_LANDSCAPE")
-        style = self.cb_style.currentData() or "anime_2d"  # Use data key for consistency
+        ui = self._snapshot_ui_state()
 
         # Log settings
-        self._append_log(f"[INFO] Settings - Lang: {lang_code}, Ratio: {ratio_key}, Style: {style}")
+        self._append_log(f"[INFO] Settings - Lang: {ui.lang_code}, Ratio: {ui.ratio_key}, Style: {ui.style}")
 
         character_bible_basic = (
             self._script_data.get("character_bible", [])
@@ -3556,30 +4154,10 @@ class Text2VideoPanelV5(QWidget):
         )
         voice_settings = self.get_voice_settings()
 
-        location_ctx = None
-        dialogues = []
-        if self._script_data and "scenes" in self._script_data:
-            scene_list = self._script_data["scenes"]
-            if row < len(scene_list):
-                if extract_location_context:
-                    location_ctx = extract_location_context(scene_list[row])
-                dialogues = scene_list[row].get("dialogues", [])
+        location_ctx, dialogues = self._scene_context(row)
 
         # Build prompt JSON for regeneration
         if build_prompt_json:
-            tts_provider = self.cb_tts_provider.currentData()
-            voice_id = self.ed_custom_voice.text().strip() or self.cb_voice.currentData()
-            voice_name = (
-                self.cb_voice.currentText()
-                if not self.ed_custom_voice.text().strip()
-                else ""
-            )
-            domain = self.cb_domain.currentData() or None
-            topic = self.cb_topic.currentData() or None
-            quality_text = (
-                self.cb_quality.currentText() if self.cb_quality.isVisible() else None
-            )
-
             # CRITICAL: Get base_seed and style_seed from context for consistency
             # This ensures regenerated videos maintain the same character and style
             base_seed = self._ctx.get("base_seed") if self._ctx else None
@@ -3589,30 +4167,30 @@ class Text2VideoPanelV5(QWidget):
             self._append_log(f"[INFO] Using base_seed: {base_seed}, style_seed: {style_seed}")
 
             j = build_prompt_json(
-                scene_num, vi, tgt, lang_code, ratio_key, style,
+                scene_num, vi, tgt, ui.lang_code, ui.ratio_key, ui.style,
                 character_bible=character_bible_basic,
                 enhanced_bible=self._character_bible,
                 voice_settings=voice_settings,
                 location_context=location_ctx,
-                tts_provider=tts_provider,
-                voice_id=voice_id,
-                voice_name=voice_name,
-                domain=domain,
-                topic=topic,
-                quality=quality_text,
+                tts_provider=ui.tts_provider,
+                voice_id=ui.voice_id,
+                voice_name=ui.voice_name,
+                domain=ui.domain,
+                topic=ui.topic,
+                quality=ui.prompt_quality,
                 dialogues=dialogues,
                 base_seed=base_seed,  # Use same seed for character consistency
                 style_seed=style_seed  # Use same seed for style consistency
             )
 
             # Log prompt JSON size
-            prompt_json_str = json.dumps(j, ensure_ascii=False, indent=2)
+            prompt_json_str = json_dumps(j, indent=True)
             self._append_log(f"[INFO] Prompt JSON size: {len(prompt_json_str)} chars")
 
             # Include actual_scene_num so VideoWorker uses correct scene number
             scenes = [{
                 "prompt": prompt_json_str,
-                "aspect": ratio,
+                "aspect": ui.ratio,
                 "actual_scene_num": scene_num  # CRITICAL: Pass actual scene number for regenerate
             }]
         else:
@@ -3620,25 +4198,18 @@ class Text2VideoPanelV5(QWidget):
             QMessageBox.critical(self, 'Lỗi', 'Không thể tạo prompt JSON')
             return
 
-        model_display = self.cb_model.currentText()
-        model_key = (
-            get_model_key_from_display(model_display)
-            if get_model_key_from_display
-            else model_display
-        )
-
         # Log model info
-        self._append_log(f"[INFO] Using model: {model_display} (key: {model_key})")
+        self._append_log(f"[INFO] Using model: {ui.model_display} (key: {ui.model_key})")
 
         payload = dict(
             scenes=scenes,
             copies=num_copies,
-            model_key=model_key,
+            model_key=ui.model_key,
             title=self._title,
             dir_videos=self._ctx.get("dir_videos", ""),
-            upscale_4k=self.cb_upscale.isChecked(),
-            auto_download=self.cb_auto_download.isChecked(),
-            quality=self.cb_quality.currentText()
+            upscale_4k=ui.upscale_4k,
+            auto_download=ui.auto_download,
+            quality=ui.quality
         )
 
         if not payload["dir_videos"]:
@@ -41,7 +41,7 @@ try:
     from services import domain_prompts
     from services import flow_image_service
     from ui.widgets.model_selector import ModelSelectorWidget
-    from ui.widgets.scene_result_card import SceneResultCard
+    from ui.widgets.scene_result_card import SCENE_CARD_QSS, SceneResultCard
     from ui.widgets.history_widget import HistoryWidget  # History tab widget
     from ui.workers.script_worker import ScriptWorker
     from utils.image_utils import convert_to_bytes
@@ -53,6 +53,7 @@ except ImportError as e:
     HistoryWidget = None  # Fallback for missing history widget
     domain_prompts = None
     flow_image_service = None
+    SCENE_CARD_QSS = ""
 
 # V5 Styling
 FONT_H2 = QFont("Segoe UI", 15, QFont.Bold)
@@ -1158,6 +1159,7 @@ class VideoBanHangV5(QWidget):
         scroll.setWidgetResizable(True)
 
         container = QWidget()
+        container.setStyleSheet(SCENE_CARD_QSS)  # Styles every SceneResultCard added below
         self.scenes_layout = QVBoxLayout(container)
         self.scenes_layout.setContentsMargins(16, 16, 16, 16)
         self.scenes_layout.setSpacing(0)
@@ -1,6 +1,6 @@
 # package initializer added for stable imports
 
 from .model_selector import ModelSelectorWidget
-from .scene_result_card import SceneResultCard
+from .scene_result_card import SCENE_CARD_QSS, SceneResultCard
 
-__all__ = ['SceneResultCard', 'ModelSelectorWidget']
+__all__ = ['SceneResultCard', 'SCENE_CARD_QSS', 'ModelSelectorWidget']
@@ -3,9 +3,10 @@
 SceneResultCard Widget - Compact card with 50% image size
 """
 import json
+import os
 
 from PyQt5.QtCore import Qt, pyqtSignal
-from PyQt5.QtGui import QFont, QPixmap
+from PyQt5.QtGui import QFont, QPixmap, QPixmapCache
 from PyQt5.QtWidgets import (
     QApplication,
     QDialog,
@@ -19,6 +20,39 @@ from PyQt5.QtWidgets import (
 )
 
 
+# Dialogue lines shown on a card
+MAX_DIALOGUE_LINES = 3
+
+# Card styles, set once on the widget that holds the cards (one parse for all N cards)
+# rather than per card. "SceneResultCard QFrame" keeps the card style cascading to its
+# labels (QLabel is a QFrame) as the old per-card "QFrame { ... }" sheet did.
+SCENE_CARD_QSS = """
+    SceneResultCard, SceneResultCard QFrame {
+        background: #FFFFFF;
+        border: none;
+        border-radius: 8px;
+        margin: 4px 0px;
+    }
+    SceneResultCard[alternate="true"], SceneResultCard[alternate="true"] QFrame {
+        background: #E3F2FD;
+    }
+    SceneResultCard QPushButton#sceneCardBtn {
+        background: transparent;
+        border: 1px solid #BDBDBD;
+        border-radius: 4px;
+        padding: 4px 10px;
+        color: #616161;
+        font-size: 10px;
+        min-height: 24px;
+    }
+    SceneResultCard QPushButton#sceneCardBtn:hover {
+        background: #F5F5F5;
+        border-color: #1976D2;
+        color: #1976D2;
+    }
+"""
+
+
 class SceneResultCard(QFrame):
     """
     Compact scene result card with:
@@ -26,6 +60,8 @@ class SceneResultCard(QFrame):
     - Alternating backgrounds (#FFFFFF / #E3F2FD)
     - Title, description, speech text
     - Action buttons: Prompt, Recreate Image, Generate Video, Regenerate Video
+
+    Styling comes from SCENE_CARD_QSS, which the card's container must set.
     """
 
     prompt_requested = pyqtSignal(int)  # scene index
@@ -37,19 +73,14 @@ class SceneResultCard(QFrame):
         super().__init__(parent)
         self.scene_index = scene_index
         self.scene_data = scene_data
-        self.alternating_color = alternating_color
-
-        # Set alternating background - Issue 2: Remove explicit border for flat design
-        # Use alternating backgrounds but with flat design (no explicit border)
-        bg_color = "#E3F2FD" if alternating_color else "#FFFFFF"
-        self.setStyleSheet(f"""
-            QFrame {{
-                background: {bg_color};
-                border: none;
-                border-radius: 8px;
-                margin: 4px 0px;
-            }}
-        """)
+        self.alternating_color = bool(alternating_color)
+
+        # Alternating background (#E3F2FD / #FFFFFF), flat design without border -
+        # selected by SCENE_CARD_QSS through this property
+        self.setProperty("alternate", bool(alternating_color))
+
+        # (path, mtime) of the image shown by set_image_path, to skip reloading it
+        self._image_key = None
 
         self._build_ui()
 
@@ -79,10 +110,75 @@ class SceneResultCard(QFrame):
         content_layout.setSpacing(4)
 
         # Title (blue, bold) - Font size set to 16px per requirement
-        lbl_title = QLabel(f"Cảnh {self.scene_index}")
-        lbl_title.setFont(QFont("Segoe UI", 16, QFont.Bold))
-        lbl_title.setStyleSheet("color: #1976D2;")
-        content_layout.addWidget(lbl_title)
+        self.lbl_title = QLabel()
+        self.lbl_title.setFont(QFont("Segoe UI", 16, QFont.Bold))
+        self.lbl_title.setStyleSheet("color: #1976D2;")
+        content_layout.addWidget(self.lbl_title)
+
+        # Add label for "Scene Description"
+        lbl_desc_header = QLabel("📝 Mô tả cảnh:")
+        lbl_desc_header.setFont(QFont("Segoe UI", 12, QFont.Bold))
+        lbl_desc_header.setStyleSheet("color: #616161; border: none;")
+        content_layout.addWidget(lbl_desc_header)
+
+        self.lbl_desc = QLabel()
+        self.lbl_desc.setWordWrap(True)
+        self.lbl_desc.setFont(QFont("Segoe UI", 13))
+        self.lbl_desc.setStyleSheet("color: #424242; border: none;")  # Issue 5c: Remove border
+        content_layout.addWidget(self.lbl_desc)
+
+        # Dialogue / legacy speech section: header plus up to 3 lines, hidden when unused
+        self.lbl_dialogue_header = QLabel("🎤 Lời thoại:")
+        self.lbl_dialogue_header.setFont(QFont("Segoe UI", 12, QFont.Bold))
+        self.lbl_dialogue_header.setStyleSheet("color: #616161; border: none;")
+        content_layout.addWidget(self.lbl_dialogue_header)
+
+        self._dialogue_labels = []
+        for _ in range(MAX_DIALOGUE_LINES):
+            lbl_dialogue = QLabel()
+            lbl_dialogue.setWordWrap(True)
+            lbl_dialogue.setFont(QFont("Segoe UI", 12))
+            lbl_dialogue.setStyleSheet("color: #616161; border: none; margin-left: 10px;")
+            content_layout.addWidget(lbl_dialogue)
+            self._dialogue_labels.append(lbl_dialogue)
+
+        # Action buttons
+        buttons_layout = QHBoxLayout()
+        buttons_layout.setSpacing(4)
+
+        # Issue 5c: Button style without unnecessary borders (QPushButton#sceneCardBtn)
+        btn_prompt = QPushButton("📝 Prompt")
+        btn_prompt.setObjectName("sceneCardBtn")
+        btn_prompt.clicked.connect(lambda: self._show_prompt_dialog())
+        buttons_layout.addWidget(btn_prompt)
+
+        btn_recreate = QPushButton("🔄 Tạo lại ảnh")
+        btn_recreate.setObjectName("sceneCardBtn")
+        btn_recreate.clicked.connect(lambda: self.recreate_requested.emit(self.scene_index))
+        buttons_layout.addWidget(btn_recreate)
+
+        btn_video = QPushButton("🎬 Tạo Video")
+        btn_video.setObjectName("sceneCardBtn")
+        btn_video.clicked.connect(lambda: self.generate_video_requested.emit(self.scene_index))
+        buttons_layout.addWidget(btn_video)
+
+        # Requirement #1: Add regenerate video button
+        btn_regen_video = QPushButton("🔁 Tạo lại video")
+        btn_regen_video.setObjectName("sceneCardBtn")
+        btn_regen_video.clicked.connect(lambda: self.regenerate_video_requested.emit(self.scene_index))
+        buttons_layout.addWidget(btn_regen_video)
+
+        buttons_layout.addStretch()
+        content_layout.addLayout(buttons_layout)
+        content_layout.addStretch()
+
+        main_layout.addLayout(content_layout, 1)
+
+        self._apply_scene_data()
+
+    def _apply_scene_data(self):
+        """Fill the title, description and dialogue labels from scene_data"""
+        self.lbl_title.setText(f"Cảnh {self.scene_index}")
 
         # Description - Display scene description separately from dialogue
         # Priority order:
@@ -100,30 +196,16 @@ class SceneResultCard(QFrame):
         # This allows full scene descriptions to be visible while preventing UI overflow
         if desc_text and len(desc_text) > 500:
             desc_text = desc_text[:500] + "..."
-        
-        # Add label for "Scene Description"
-        lbl_desc_header = QLabel("📝 Mô tả cảnh:")
-        lbl_desc_header.setFont(QFont("Segoe UI", 12, QFont.Bold))
-        lbl_desc_header.setStyleSheet("color: #616161; border: none;")
-        content_layout.addWidget(lbl_desc_header)
-        
-        lbl_desc = QLabel(desc_text or "Không có mô tả")
-        lbl_desc.setWordWrap(True)
-        lbl_desc.setFont(QFont("Segoe UI", 13))
-        lbl_desc.setStyleSheet("color: #424242; border: none;")  # Issue 5c: Remove border
-        content_layout.addWidget(lbl_desc)
+        self.lbl_desc.setText(desc_text or "Không có mô tả")
 
+        lines = []
+        show_header = False
         # Dialogues - Display each dialogue with speaker name (NEW: clearer formatting)
         dialogues = self.scene_data.get('dialogues', [])
         if dialogues:
-            # Add label for "Dialogue"
-            lbl_dialogue_header = QLabel("🎤 Lời thoại:")
-            lbl_dialogue_header.setFont(QFont("Segoe UI", 12, QFont.Bold))
-            lbl_dialogue_header.setStyleSheet("color: #616161; border: none;")
-            content_layout.addWidget(lbl_dialogue_header)
-            
+            show_header = True
             # Display each dialogue
-            for dialogue in dialogues[:3]:  # Show up to 3 dialogues
+            for dialogue in dialogues[:MAX_DIALOGUE_LINES]:  # Show up to 3 dialogues
                 if isinstance(dialogue, dict):
                     speaker = dialogue.get('speaker', '')
                     text_vi = dialogue.get('text_vi', '')
@@ -142,12 +224,7 @@ class SceneResultCard(QFrame):
                         display_text = f'<b>{speaker}:</b> "{dialogue_text}"'
                         if emotion:
                             display_text += f' <i>({emotion})</i>'
-                        
-                        lbl_dialogue = QLabel(display_text)
-                        lbl_dialogue.setWordWrap(True)
-                        lbl_dialogue.setFont(QFont("Segoe UI", 12))
-                        lbl_dialogue.setStyleSheet("color: #616161; border: none; margin-left: 10px;")
-                        content_layout.addWidget(lbl_dialogue)
+                        lines.append(display_text)
         
         # Fallback: Legacy speech text (for backward compatibility)
         elif self.scene_data.get('speech') or self.scene_data.get('voice_over'):
@@ -155,66 +232,37 @@ class SceneResultCard(QFrame):
             if speech_text:
                 if len(speech_text) > 150:
                     speech_text = speech_text[:150] + "..."
-                
-                lbl_speech_header = QLabel("🎤 Lời thoại:")
-                lbl_speech_header.setFont(QFont("Segoe UI", 12, QFont.Bold))
-                lbl_speech_header.setStyleSheet("color: #616161; border: none;")
-                content_layout.addWidget(lbl_speech_header)
-                
-                lbl_speech = QLabel(speech_text)
-                lbl_speech.setWordWrap(True)
-                lbl_speech.setFont(QFont("Segoe UI", 12))
-                lbl_speech.setStyleSheet("color: #616161; border: none; margin-left: 10px;")
-                content_layout.addWidget(lbl_speech)
-
-        # Action buttons
-        buttons_layout = QHBoxLayout()
-        buttons_layout.setSpacing(4)
-
-        # Issue 5c: Button style without unnecessary borders
-        btn_style = """
-            QPushButton {
-                background: transparent;
-                border: 1px solid #BDBDBD;
-                border-radius: 4px;
-                padding: 4px 10px;
-                color: #616161;
-                font-size: 10px;
-                min-height: 24px;
-            }
-            QPushButton:hover {
-                background: #F5F5F5;
-                border-color: #1976D2;
-                color: #1976D2;
-            }
-        """
-
-        btn_prompt = QPushButton("📝 Prompt")
-        btn_prompt.setStyleSheet(btn_style)
-        btn_prompt.clicked.connect(lambda: self._show_prompt_dialog())
-        buttons_layout.addWidget(btn_prompt)
-
-        btn_recreate = QPushButton("🔄 Tạo lại ảnh")
-        btn_recreate.setStyleSheet(btn_style)
-        btn_recreate.clicked.connect(lambda: self.recreate_requested.emit(self.scene_index))
-        buttons_layout.addWidget(btn_recreate)
-
-        btn_video = QPushButton("🎬 Tạo Video")
-        btn_video.setStyleSheet(btn_style)
-        btn_video.clicked.connect(lambda: self.generate_video_requested.emit(self.scene_index))
-        buttons_layout.addWidget(btn_video)
-
-        # Requirement #1: Add regenerate video button
-        btn_regen_video = QPushButton("🔁 Tạo lại video")
-        btn_regen_video.setStyleSheet(btn_style)
-        btn_regen_video.clicked.connect(lambda: self.regenerate_video_requested.emit(self.scene_index))
-        buttons_layout.addWidget(btn_regen_video)
-
-        buttons_layout.addStretch()
-        content_layout.addLayout(buttons_layout)
-        content_layout.addStretch()
-
-        main_layout.addLayout(content_layout, 1)
+                show_header = True
+                lines.append(speech_text)
+
+        self.lbl_dialogue_header.setVisible(show_header)
+        for idx, lbl in enumerate(self._dialogue_labels):
+            if idx < len(lines):
+                lbl.setText(lines[idx])
+                lbl.show()
+            else:
+                lbl.clear()
+                lbl.hide()
+
+    def update_scene_data(self, scene_index, scene_data, alternating_color=False):
+        """Rebind this card to another scene (refreshes labels only, no widget rebuild)"""
+        self.scene_index = scene_index
+        self.scene_data = scene_data
+        if bool(alternating_color) != self.alternating_color:
+            self.alternating_color = bool(alternating_color)
+            # Re-polish so SCENE_CARD_QSS picks up the new background
+            self.setProperty("alternate", self.alternating_color)
+            self.style().unpolish(self)
+            self.style().polish(self)
+            for child in self.findChildren(QFrame):
+                child.style().unpolish(child)
+                child.style().polish(child)
+        self._apply_scene_data()
+
+        # The previous scene's image does not belong to this one
+        self._image_key = None
+        self.img_preview.clear()
+        self.img_preview.setText("Chưa tạo")
 
     def _show_prompt_dialog(self):
         """Show prompt dialog with JSON format"""
@@ -296,14 +344,36 @@ class SceneResultCard(QFrame):
         """Set image from bytes - Issue 1: Updated to 320x200px"""
         pixmap = QPixmap()
         pixmap.loadFromData(image_bytes)
+        self._image_key = None
         self.img_preview.setPixmap(pixmap.scaled(320, 200, Qt.KeepAspectRatio, Qt.SmoothTransformation))
 
     def set_image_pixmap(self, pixmap):
         """Set image from pixmap - Issue 1: Updated to 320x200px"""
+        self._image_key = None
         self.img_preview.setPixmap(pixmap.scaled(320, 200, Qt.KeepAspectRatio, Qt.SmoothTransformation))
 
     def set_image_path(self, path):
-        """Set image from file path - Issue 1: Updated to 320x200px"""
-        pixmap = QPixmap(path)
-        if not pixmap.isNull():
-            self.img_preview.setPixmap(pixmap.scaled(320, 200, Qt.KeepAspectRatio, Qt.SmoothTransformation))
+        """Set image from file path - Issue 1: Updated to 320x200px
+
+        Called on every status update for the scene; the decoded and scaled pixmap is
+        kept in QPixmapCache keyed by path + mtime, and nothing is redone when the
+        same unchanged file is already shown.
+        """
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return
+        image_key = (path, mtime)
+        if image_key == self._image_key:
+            return
+
+        cache_key = f"scene_card|{path}|{mtime}|320x200"
+        scaled = QPixmapCache.find(cache_key)
+        if scaled is None or scaled.isNull():
+            pixmap = QPixmap(path)
+            if pixmap.isNull():
+                return
+            scaled = pixmap.scaled(320, 200, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+            QPixmapCache.insert(cache_key, scaled)
+        self.img_preview.setPixmap(scaled)
+        self._image_key = image_key
@@ -45,6 +45,8 @@ class VideoGenerationWorker(QThread):
         Args:
             payload: Dictionary containing:
                 - scenes: List of scene dictionaries with 'prompt' and 'aspect'
+                - build_scenes: Optional callable(log) returning `scenes`; used instead of
+                  `scenes` so prompt building runs on this thread, not the UI thread
                 - copies: Number of video copies per scene
                 - model_key: Video model to use
                 - title: Project title
@@ -147,6 +149,10 @@ class VideoGenerationWorker(QThread):
         import threading
 
         p = self.payload
+        build_scenes = p.pop("build_scenes", None)
+        if build_scenes is not None:
+            self.log.emit("[INFO] Building scene prompts...")
+            p["scenes"] = build_scenes(self.log.emit)
         st = cfg.load()
 
         # Ensure config is valid
@@ -122,6 +122,27 @@ def load() -> dict:
     return cfg
 
 
+# Last load() result for load_cached(), with the config file mtime it was read at
+_load_cache = {"mtime": None, "cfg": None}
+
+
+def load_cached() -> dict:
+    """
+    load(), re-reading the config file only when its mtime changes.
+
+    For read-only lookups on hot paths. The returned dict is shared between
+    callers: do not modify it - use load() for a load/modify/save round trip.
+    """
+    try:
+        mtime = os.stat(CFG_PATH).st_mtime_ns
+    except OSError:
+        mtime = None
+    if _load_cache["cfg"] is None or _load_cache["mtime"] != mtime:
+        _load_cache["cfg"] = load()
+        _load_cache["mtime"] = mtime
+    return _load_cache["cfg"]
+
+
 def _parse_comma_separated_env(env_value: str) -> list:
     """
     Parse comma-separated environment variable into list of non-empty strings.
@@ -199,6 +220,7 @@ def save(cfg: dict) -> dict:
 
     try:
         _atomic_write_json(CFG_PATH, cfg)
+        _load_cache["cfg"] = None  # Saves within the mtime resolution must not be missed
         logger.info("Config saved successfully")
     except Exception as e:
         logger.error(f"Error saving config: {e}")
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+JSON helpers that use orjson when it is installed and fall back to the stdlib
+"""
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # Optional dependency
+    orjson = None
+
+
+def json_dumps(obj: Any, indent: bool = False) -> str:
+    """
+    Serialize obj to a JSON string, keeping non-ASCII characters as-is.
+
+    Args:
+        obj: Object to serialize
+        indent: Pretty-print with 2-space indentation (same layout as json.dumps(indent=2))
+
+    Returns:
+        str: JSON text
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, option=option).decode("utf-8")
+        except TypeError:
+            pass  # Types orjson does not handle (e.g. tuple keys) - let json decide
+    if indent:
+        return json.dumps(obj, ensure_ascii=False, indent=2)
+    return json.dumps(obj, ensure_ascii=False)
+
+
+def json_dumpb(obj: Any, indent: bool = False) -> bytes:
+    """
+    Serialize obj to UTF-8 encoded JSON bytes, ready to write to a file opened in "wb".
+
+    With orjson this skips the bytes -> str -> bytes round trip of json_dumps.
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, option=option)
+        except TypeError:
+            pass
+    return json_dumps(obj, indent=indent).encode("utf-8")
+
+
+def json_loads(data):
+    """
+    Parse JSON text (str or bytes).
+
+    Raises json.JSONDecodeError on invalid input with either backend
+    (orjson.JSONDecodeError subclasses it).
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -1,10 +1,11 @@
 # -*- coding: utf-8 -*-
 """
 Performance Optimization Utilities
-Provides caching, connection pooling, and request batching
+Provides caching, connection pooling, request batching and rate limiting
 """
 
 import time
+import threading
 import hashlib
 import pickle
 import os
@@ -319,6 +320,43 @@ def batch_requests(
     return results
 
 
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter
+
+    Tokens refill continuously at `rate` per second up to `capacity`; callers
+    block in acquire() only when the bucket is empty.
+    """
+
+    def __init__(self, rate: float = 2.0, capacity: int = 4):
+        """
+        Initialize bucket (starts full)
+        
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum burst size
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._last = time.monotonic()
+        self._cond = threading.Condition()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def acquire(self, tokens: int = 1):
+        """Block until `tokens` tokens are available, then consume them"""
+        with self._cond:
+            self._refill()
+            while self._tokens < tokens:
+                self._cond.wait((tokens - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= tokens
+
+
 # Example usage
 if __name__ == '__main__':
     # Test session with connection pooling